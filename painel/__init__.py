@@ -0,0 +1 @@
+"""Módulos de apoio do dashboard Supermarket Sales (6.streamlit.py)."""
@@ -0,0 +1,137 @@
+"""Modo aproximado: respostas estimadas a partir de uma amostra estratificada.
+
+Para explorar históricos muito grandes não é preciso a resposta exata de
+perguntas como "qual dia da semana vende mais". A amostra guarda até
+`POR_ESTRATO` linhas de cada estrato filial x linha de produto x mês, então
+o tamanho dela (e o custo de cada consulta) não cresce com o histórico.
+
+Cada consulta é estimada com os pesos da amostragem estratificada (cada
+linha da amostra vale N_h / n_h linhas do seu estrato) e vem com a margem
+de um intervalo de confiança de 95%:
+
+* totais (`sum`, `count`, `linhas`): estimador de Horvitz-Thompson por
+  estrato, com a correção de população finita;
+* médias: estimador de razão (total / contagem), com a variância
+  linearizada;
+* desvio padrão: estimativa pontual, sem intervalo.
+
+Quando um estrato inteiro cabe na amostra a margem dele é zero, então em
+DataSets pequenos o modo aproximado devolve o resultado exato.
+"""
+
+import numpy as np
+import pandas as pd
+
+from painel.cubo import _normalizar, filtrar
+from painel.densidade import amostra_por_grupo
+
+ESTRATOS = ['Branch', 'Product line', 'Mes']
+POR_ESTRATO = 200
+Z_95 = 1.959964
+MARGEM = 'IC 95% (±)'
+_ESTRATO = '_estrato'
+
+
+class Estimativa(float):
+    """Número estimado que leva junto a margem do intervalo de 95%."""
+
+    def __new__(cls, valor, margem):
+        estimativa = super().__new__(cls, valor)
+        estimativa.margem = margem
+        return estimativa
+
+
+class MotorAmostra:
+    """Motor de consultas (mesma interface de painel.motores) sobre a amostra."""
+
+    def __init__(self, df1, por_estrato=POR_ESTRATO, semente=0):
+        # dropna=False: linhas sem data formam o próprio estrato
+        estratos = df1.groupby(ESTRATOS, observed=True, dropna=False).ngroup().to_numpy()
+        self.linhas = len(df1)
+        self.populacao = np.bincount(estratos)
+        self.amostra = amostra_por_grupo(df1.assign(**{_ESTRATO: estratos}), _ESTRATO, por_estrato, semente)
+        self.tamanho = np.bincount(self.amostra[_ESTRATO].to_numpy(), minlength=len(self.populacao))
+
+    def _por_estrato(self, grupos, colunas):
+        """Soma `colunas` por (grupo, estrato) e junta N_h e n_h de cada estrato."""
+        somas = colunas.groupby(grupos, observed=True).sum().reset_index()
+        estrato = somas[_ESTRATO].to_numpy()
+        somas['N'] = self.populacao[estrato]
+        somas['n'] = self.tamanho[estrato]
+        return somas
+
+    @staticmethod
+    def _variancia(somas, soma, soma_quadrados):
+        """Variância do total estimado de cada linha de `somas` (um grupo num estrato)."""
+        n, N = somas['n'], somas['N']
+        s2 = (soma_quadrados - soma ** 2 / n) / (n - 1).where(n > 1)
+        return (N ** 2 * (1 - n / N) * s2 / n).fillna(0.0).clip(lower=0.0)
+
+    def agregar(self, dimensoes, medida, estatistica='sum', filtros=None):
+        dims = _normalizar(dimensoes)
+        amostra = self.amostra
+        # Filtros e chaves ausentes restringem o domínio, mas as linhas fora
+        # dele continuam contando como zero no n_h do estrato
+        dentro = pd.Series(False, index=amostra.index)
+        dentro[filtrar(amostra, filtros).index] = True
+        for d in dims:
+            dentro &= amostra[d].notna()
+
+        presente = amostra[medida].notna() & dentro
+        if estatistica == 'linhas':
+            x = dentro.astype('float64')
+        elif estatistica == 'count':
+            x = presente.astype('float64')
+        else:
+            x = amostra[medida].astype('float64').where(presente, 0.0)
+
+        colunas = pd.DataFrame({'x': x, 'x2': x ** 2, 'c': presente.astype('float64')})
+        linhas = amostra[dentro.to_numpy()]
+        chaves = [linhas[d] for d in dims] + [linhas[_ESTRATO]]
+        somas = self._por_estrato(chaves, colunas[dentro.to_numpy()])
+        peso = somas['N'] / somas['n']
+        somas['total'] = peso * somas['x']
+        somas['contagem'] = peso * somas['c']
+        somas['total_quadrados'] = peso * somas['x2']
+
+        def agrupar(tabela):
+            return tabela.groupby(dims, observed=True) if dims else tabela.groupby(np.zeros(len(tabela)))
+
+        if estatistica in ('sum', 'count', 'linhas'):
+            somas['var'] = self._variancia(somas, somas['x'], somas['x2'])
+            grupos = agrupar(somas)
+            estimado = grupos['total'].sum()
+            margem = Z_95 * np.sqrt(grupos['var'].sum())
+            if estatistica != 'sum' or pd.api.types.is_integer_dtype(amostra[medida]):
+                estimado = np.rint(estimado).astype('int64')
+        elif estatistica == 'mean':
+            grupos = agrupar(somas)
+            contagem = grupos['contagem'].sum()
+            estimado = grupos['total'].sum() / contagem
+            if dims:
+                somas = somas.merge(estimado.rename('r').reset_index(), on=dims)
+            else:
+                somas['r'] = estimado.iloc[0] if len(estimado) else np.nan
+            # z = x - R c é o resíduo da razão; a variância do total de z
+            # dividida pela contagem ao quadrado é a variância da média
+            soma_z = somas['x'] - somas['r'] * somas['c']
+            soma_z2 = somas['x2'] - 2 * somas['r'] * somas['x'] + somas['r'] ** 2 * somas['c']
+            somas['var'] = self._variancia(somas, soma_z, soma_z2)
+            margem = Z_95 * np.sqrt(agrupar(somas)['var'].sum()) / contagem
+        elif estatistica == 'std':
+            grupos = agrupar(somas)
+            contagem = grupos['contagem'].sum()
+            total = grupos['total'].sum()
+            variancia = (grupos['total_quadrados'].sum() - total ** 2 / contagem) / (contagem - 1).where(contagem > 1)
+            estimado = np.sqrt(variancia.clip(lower=0.0))
+            margem = pd.Series(np.nan, index=estimado.index)
+        else:
+            raise ValueError(f'Estatística não suportada: {estatistica}')
+
+        if not dims:
+            if not len(estimado):
+                return Estimativa(np.nan, np.nan)
+            return Estimativa(estimado.iloc[0], margem.iloc[0])
+        resultado = estimado.rename(medida).to_frame()
+        resultado[MARGEM] = margem
+        return resultado.reset_index()
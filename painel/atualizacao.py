@@ -0,0 +1,146 @@
+"""Atualização dos dados em segundo plano, com troca atômica de versão.
+
+Trocar o arquivo de vendas fazia o primeiro rerun seguinte recarregar o
+arquivo e remontar os agregados antes de desenhar qualquer coisa. Aqui uma
+thread vigia o arquivo de origem (pela mesma chave de tamanho e mtime de
+painel.dados) e, quando ele muda, monta a nova versão inteira fora do
+caminho das requisições: DataFrame mapeado, cubo e índice dos filtros.
+
+Só depois de pronta a nova `Versao` é publicada, numa única atribuição. Cada
+rerun pega a versão atual uma vez, no início, e usa só ela: um rerun em
+andamento nunca mistura duas versões e nenhum rerun espera pela recarga. Se
+a recarga falhar, a versão anterior continua no ar e o erro fica em `erro`.
+
+Um arquivo ainda sendo copiado muda de tamanho entre as verificações, então
+a recarga só começa quando a chave se repete em duas verificações seguidas.
+
+Com um estado incremental (painel.incremental, PAINEL_ESTADO no app) o
+arquivo SQLite é vigiado do mesmo jeito: cada anexação grava um cubo novo e
+vira uma versão nova, cujas perguntas saem desse cubo. Quando só o estado
+mudou, o DataFrame, o cubo e o índice do arquivo de vendas são reaproveitados.
+"""
+
+import hashlib
+import threading
+import time
+from typing import NamedTuple
+
+from painel.cubo import construir_cubo
+from painel.dados import caminho_cache, carregar_compartilhado, chave_arquivo
+
+INTERVALO = 2.0
+
+
+class Versao(NamedTuple):
+    numero: int
+    chave: str
+    df1: object
+    cubo: object
+    indice: object
+    # Parquet tratado desta versão, lido pelo motor DuckDB
+    parquet: object
+    carregada_em: float
+    # Chaves do arquivo de vendas e do estado incremental, vigiadas pelo Atualizador
+    fontes: tuple = ()
+    # Cubo do estado incremental e quantas vendas ele agregou; None sem estado
+    estado: object = None
+    linhas_estado: int = 0
+
+
+def chave_fontes(caminho, estado=None):
+    """Chaves de tamanho e mtime do arquivo de vendas e do estado (None sem estado)."""
+    return chave_arquivo(caminho), None if estado is None else chave_arquivo(estado)
+
+
+def montar_versao(caminho, numero, manter=(), estado=None, anterior=None):
+    """Carrega `caminho` (e o cubo de `estado`) e monta tudo o que as páginas precisam de uma versão.
+
+    Se o arquivo de vendas é o mesmo de `anterior`, só o estado é relido.
+    """
+    from painel.filtros import IndiceFiltros
+
+    fontes = chave_fontes(caminho, estado)
+    if anterior is not None and anterior.fontes[:1] == fontes[:1]:
+        df1, cubo, indice = anterior.df1, anterior.cubo, anterior.indice
+    else:
+        df1 = carregar_compartilhado(caminho, manter=manter)
+        cubo, indice = construir_cubo(df1), IndiceFiltros(df1)
+
+    cubo_estado, linhas_estado = None, 0
+    chave = fontes[0]
+    if estado is not None:
+        from painel.incremental import ler_estado
+
+        cubo_estado, linhas_estado = ler_estado(estado)
+        chave = hashlib.sha256('|'.join(fontes).encode('utf-8')).hexdigest()[:16]
+    return Versao(numero, chave, df1, cubo, indice, caminho_cache(caminho), time.time(),
+                  fontes, cubo_estado, linhas_estado)
+
+
+def descrever_idade(segundos):
+    if segundos < 60:
+        return f'{segundos:.0f} s'
+    if segundos < 3600:
+        return f'{segundos / 60:.0f} min'
+    return f'{segundos / 3600:.1f} h'
+
+
+class Atualizador:
+    """Mantém a versão atual dos dados de `caminho` e a troca quando o arquivo muda.
+
+    Com `estado` (arquivo SQLite de painel.incremental) a versão também é
+    trocada quando o estado recebe uma anexação. A primeira versão é montada
+    no construtor, porque sem ela não há o que mostrar; as seguintes são
+    montadas pela thread de vigilância.
+    """
+
+    def __init__(self, caminho, estado=None, intervalo=INTERVALO):
+        self.caminho = caminho
+        self.estado = estado
+        self.intervalo = intervalo
+        self.atual = montar_versao(caminho, 1, estado=estado)
+        self.atualizando = False
+        self.erro = None
+        self._falhou = None
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._vigiar, name='painel-atualizacao', daemon=True)
+        self._thread.start()
+
+    def _vigiar(self):
+        vista = self.atual.fontes
+        while not self._parar.wait(self.intervalo):
+            try:
+                fontes = chave_fontes(self.caminho, self.estado)
+            except OSError:
+                # Arquivo sendo trocado (apagado e recriado): tenta de novo depois
+                continue
+            estavel = fontes == vista
+            vista = fontes
+            if estavel and fontes not in (self.atual.fontes, self._falhou):
+                self.recarregar(fontes)
+
+    def recarregar(self, fontes=None):
+        """Monta a versão seguinte e troca; em caso de erro mantém a atual.
+
+        Chaves `fontes` que falharam não são tentadas de novo até um dos
+        arquivos mudar outra vez.
+        """
+        atual = self.atual
+        self.atualizando = True
+        try:
+            # Os arquivos da versão atual ficam em disco até a próxima troca,
+            # para os reruns que ainda usam essa versão (ex.: motor DuckDB)
+            manter = (atual.parquet, atual.parquet.with_suffix('.arrow'))
+            nova = montar_versao(self.caminho, atual.numero + 1, manter, self.estado, atual)
+        except Exception as erro:
+            self._falhou = fontes
+            self.erro = f'{type(erro).__name__}: {erro}'
+        else:
+            self.atual = nova
+            self.erro = self._falhou = None
+        finally:
+            self.atualizando = False
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
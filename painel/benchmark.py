@@ -0,0 +1,149 @@
+"""Suíte de benchmark do dashboard sobre dados sintéticos.
+
+Para cada tamanho pedido, gera um Parquet sintético (painel.sintetico) e
+cronometra separadamente cada etapa do caminho de uma página:
+
+* `leitura`: leitura do arquivo bruto;
+* `preparo`: datas, colunas de tempo e esquema compacto (painel.dados.preparar);
+* `cubo`: montagem do cubo de agregação;
+* `ingestao_blocos`: o mesmo cubo pelo caminho em blocos (painel.ingestao),
+  o único que roda acima de `--limite-memoria` linhas;
+* `pagina:<nome>`: as agregações de cada página a partir do cubo;
+* `duckdb:<nome>`: as mesmas agregações em SQL no DuckDB sobre o Parquet
+  tratado (só quando o duckdb está instalado);
+* `grafico:<nome>:<n>`: a renderização de cada gráfico (PNG para o
+  matplotlib, JSON para o plotly).
+
+Os tempos podem ser gravados como referência e comparados depois; uma etapa
+que ficar mais lenta do que a tolerância é marcada como regressão e o
+comando termina com código 1.
+
+    python -m painel.benchmark --tamanhos 1000 100000 1000000 --salvar referencia.json
+    python -m painel.benchmark --tamanhos 1000 100000 1000000 --comparar referencia.json
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from painel.cubo import construir_cubo
+from painel.dados import ler_origem, preparar
+from painel.graficos import renderizar_desenho
+from painel.ingestao import ingerir
+from painel.paginas import PAGINAS_PERGUNTAS
+from painel.sintetico import gravar
+
+LIMITE_MEMORIA = 10_000_000
+TOLERANCIA = 0.20
+
+
+def cronometrar(funcao, repeticoes=1):
+    """Executa `funcao` e devolve (menor tempo em segundos, último resultado)."""
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def medir_tamanho(linhas, pasta, repeticoes=1, limite_memoria=LIMITE_MEMORIA,
+                  graficos=True, **opcoes):
+    """Tempos de cada etapa para `linhas` linhas sintéticas."""
+    caminho = Path(pasta) / f'sintetico_{linhas}.parquet'
+    if not caminho.exists():
+        gravar(caminho, linhas, **opcoes)
+
+    tempos = {}
+    tempos['ingestao_blocos'], (cubo, _) = cronometrar(lambda: ingerir(caminho), repeticoes)
+
+    df1 = None
+    if linhas <= limite_memoria:
+        tempos['leitura'], bruto = cronometrar(lambda: ler_origem(caminho), repeticoes)
+        tempos['preparo'], df1 = cronometrar(lambda: preparar(bruto), repeticoes)
+        del bruto
+        tempos['cubo'], cubo = cronometrar(lambda: construir_cubo(df1), repeticoes)
+
+    motor = None
+    if df1 is not None and importlib.util.find_spec('duckdb'):
+        from painel.motores import MotorDuckDB
+
+        tratado = Path(pasta) / f'tratado_{linhas}.parquet'
+        df1.to_parquet(tratado, index=False)
+        motor = MotorDuckDB(tratado)
+
+    for nome, modulo in PAGINAS_PERGUNTAS.items():
+        pagina = importlib.import_module(modulo)
+        tempos[f'pagina:{nome}'], resultados = cronometrar(lambda: pagina.calcular(cubo), repeticoes)
+        if motor is not None:
+            tempos[f'duckdb:{nome}'], _ = cronometrar(lambda: pagina.calcular(motor), repeticoes)
+        if not graficos or df1 is None:
+            # Sem o DataFrame em memória só dá para medir as agregações
+            continue
+        for numero, desenhar in pagina.graficos(df1, resultados).items():
+            tempos[f'grafico:{nome}:{numero}'], _ = cronometrar(lambda: renderizar_desenho(desenhar), repeticoes)
+    return tempos
+
+
+def comparar(atual, referencia, tolerancia=TOLERANCIA):
+    """Lista de (tamanho, etapa, antes, depois) que pioraram além da tolerância."""
+    regressoes = []
+    for tamanho, etapas in atual.items():
+        for etapa, segundos in etapas.items():
+            antes = referencia.get(tamanho, {}).get(etapa)
+            if antes and segundos > antes * (1 + tolerancia):
+                regressoes.append((tamanho, etapa, antes, segundos))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do dashboard com dados sintéticos.')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--limite-memoria', type=int, default=LIMITE_MEMORIA,
+                        help='acima deste número de linhas só o caminho em blocos é medido')
+    parser.add_argument('--sem-graficos', action='store_true', help='não mede a renderização dos gráficos')
+    parser.add_argument('--filiais', type=int, default=3)
+    parser.add_argument('--produtos', type=int, default=6)
+    parser.add_argument('--pasta', help='onde guardar os arquivos sintéticos (padrão: pasta temporária)')
+    parser.add_argument('--salvar', help='grava os tempos neste JSON')
+    parser.add_argument('--comparar', help='JSON de referência para detectar regressões')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        pasta = args.pasta or temporaria
+        Path(pasta).mkdir(parents=True, exist_ok=True)
+        resultados = {}
+        for linhas in args.tamanhos:
+            tempos = medir_tamanho(
+                linhas, pasta, args.repeticoes, args.limite_memoria, not args.sem_graficos,
+                filiais=args.filiais, linhas_produto=args.produtos,
+            )
+            resultados[str(linhas)] = tempos
+            print(f'--- {linhas:,} linhas')
+            for etapa, segundos in tempos.items():
+                print(f'{etapa:<32} {segundos * 1000:10.1f} ms')
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo)
+        regressoes = comparar(resultados, referencia, args.tolerancia)
+        for tamanho, etapa, antes, depois in regressoes:
+            print(f'REGRESSÃO {tamanho} {etapa}: {antes * 1000:.1f} ms -> {depois * 1000:.1f} ms')
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+"""Teste de carga: várias sessões simultâneas trocando de página no dashboard.
+
+O teste sobe o app de verdade (`streamlit run 6.streamlit.py`, numa porta
+livre) e abre uma conexão WebSocket por sessão simulada, falando o mesmo
+protocolo do navegador: cada troca de página é um `rerun_script` com o novo
+valor do menu da barra lateral, cronometrado até o `script_finished`. Assim
+as sessões são sessões do servidor, cada uma na sua thread e dividindo os
+`st.cache_resource` do processo, exatamente como com usuários reais. As
+sessões começam juntas e cada uma percorre as páginas (começando de uma
+página diferente das outras) por `--voltas` voltas.
+
+Para cada nível de concorrência o relatório mostra, por página:
+
+* a latência do rerun (p50, p95 e p99), do envio até o fim do rerun;
+* o tempo de CPU médio do rerun, que o próprio app exporta
+  (`painel_rerun_cpu_segundos`, via PAINEL_PROMETHEUS_ARQUIVO);
+* o RSS máximo do servidor logo depois dos reruns da página;
+
+e, para o nível inteiro, a vazão e o uso de CPU do servidor (100% é um
+núcleo inteiro). Antes do primeiro nível uma sessão abre cada página uma
+vez, para que imports e caches frios não entrem nas medições. As variáveis
+PAINEL_MOTOR e PAINEL_PACOTE passam para o servidor, então cada fonte de
+dados pode ser medida. O log do servidor fica em `--log`.
+
+    python -m painel.carga --sessoes 1 4 16 --voltas 3 --salvar carga.json
+    python -m painel.carga --sessoes 1 4 16 --voltas 3 --comparar carga.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+from painel.metricas import memoria_processo
+from painel.paginas import PAGINAS as MODULOS_PAGINAS
+
+APP = Path(__file__).resolve().parent.parent / '6.streamlit.py'
+PAGINAS = list(MODULOS_PAGINAS)
+ROTULO_NAVEGACAO = 'Selecione a Página'
+TEMPO_LIMITE = 300
+TEMPO_INICIO = 60
+PERCENTIS = [50, 95, 99]
+_CPU_PROMETHEUS = re.compile(r'^painel_rerun_cpu_segundos_(sum|count)\{pagina="(.*)"\} (\S+)$')
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Servidor:
+    """`streamlit run` do app numa porta livre, encerrado na saída do `with`."""
+
+    def __init__(self, app=APP, log=None):
+        self.app = Path(app)
+        self.pasta = tempfile.TemporaryDirectory(prefix='painel-carga-')
+        self.log = Path(log) if log else Path(self.pasta.name) / 'servidor.log'
+        self.prometheus = Path(self.pasta.name) / 'painel.prom'
+        self.porta = _porta_livre()
+        self.processo = None
+
+    @property
+    def url(self):
+        return f'ws://127.0.0.1:{self.porta}/_stcore/stream'
+
+    @property
+    def pid(self):
+        return self.processo.pid
+
+    def __enter__(self):
+        comando = [
+            sys.executable, '-m', 'streamlit', 'run', str(self.app),
+            '--server.headless', 'true', '--server.address', '127.0.0.1', '--server.port', str(self.porta),
+            '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false',
+        ]
+        ambiente = dict(os.environ, PAINEL_PROMETHEUS_ARQUIVO=str(self.prometheus))
+        with open(self.log, 'wb') as log:
+            self.processo = subprocess.Popen(comando, cwd=self.app.parent, env=ambiente,
+                                             stdout=log, stderr=subprocess.STDOUT)
+        try:
+            self._esperar()
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _esperar(self):
+        saude = f'http://127.0.0.1:{self.porta}/_stcore/health'
+        limite = time.monotonic() + TEMPO_INICIO
+        while time.monotonic() < limite:
+            if self.processo.poll() is not None:
+                raise RuntimeError(f'O servidor terminou ao iniciar; veja {self.log}')
+            try:
+                with urllib.request.urlopen(saude, timeout=1) as resposta:
+                    if resposta.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f'O servidor não respondeu em {TEMPO_INICIO} s; veja {self.log}')
+
+    def __exit__(self, *erro):
+        self.processo.terminate()
+        try:
+            self.processo.wait(10)
+        except subprocess.TimeoutExpired:
+            self.processo.kill()
+            self.processo.wait()
+        self.pasta.cleanup()
+
+    def cpu(self):
+        """Tempo de CPU (usuário + sistema) do servidor até agora, em segundos."""
+        with open(f'/proc/{self.pid}/stat', encoding='ascii') as arquivo:
+            # O nome do processo pode ter espaços; os campos contam depois do ')'
+            campos = arquivo.read().rsplit(')', 1)[1].split()
+        return (int(campos[11]) + int(campos[12])) / os.sysconf('SC_CLK_TCK')
+
+    def rss(self):
+        memoria = memoria_processo(self.pid)
+        return None if memoria is None else sum(memoria.values())
+
+    def cpu_por_pagina(self):
+        """{página: (soma, contagem)} acumulados de CPU dos reruns, lidos do textfile do app."""
+        totais = {}
+        try:
+            linhas = self.prometheus.read_text(encoding='utf-8').splitlines()
+        except FileNotFoundError:
+            return totais
+        for linha in linhas:
+            if casamento := _CPU_PROMETHEUS.match(linha):
+                campo, pagina, valor = casamento.groups()
+                soma, contagem = totais.get(pagina, (0.0, 0))
+                totais[pagina] = (soma + float(valor), contagem) if campo == 'sum' else (soma, contagem + int(valor))
+        return totais
+
+
+class Sessao:
+    """Uma conexão WebSocket com o servidor, como uma aba do navegador."""
+
+    def __init__(self, servidor, tempo_limite=TEMPO_LIMITE):
+        self.servidor = servidor
+        self.tempo_limite = tempo_limite
+        self.conexao = None
+        self.navegacao = None
+
+    async def abrir(self):
+        """Conecta e faz o primeiro rerun (página inicial)."""
+        # websockets já vem com o Streamlit; importado aqui para o módulo
+        # poder ser importado sem ele
+        import websockets
+
+        self.conexao = await websockets.connect(self.servidor.url, subprotocols=['streamlit'], max_size=None)
+        await self._rerun()
+        if self.navegacao is None:
+            raise RuntimeError(f'O menu "{ROTULO_NAVEGACAO}" não apareceu no primeiro rerun')
+        return self
+
+    async def fechar(self):
+        if self.conexao is not None:
+            await self.conexao.close()
+
+    async def _rerun(self, pagina=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ''
+        if pagina is not None:
+            widget = mensagem.rerun_script.widget_states.widgets.add()
+            widget.id = self.navegacao
+            widget.string_value = pagina
+        await self.conexao.send(mensagem.SerializeToString())
+
+        erros = []
+        while True:
+            resposta = ForwardMsg()
+            resposta.ParseFromString(await asyncio.wait_for(self.conexao.recv(), self.tempo_limite))
+            tipo = resposta.WhichOneof('type')
+            if tipo == 'delta' and resposta.delta.WhichOneof('type') == 'new_element':
+                elemento = resposta.delta.new_element
+                if elemento.WhichOneof('type') == 'radio' and elemento.radio.label == ROTULO_NAVEGACAO:
+                    self.navegacao = elemento.radio.id
+                elif elemento.WhichOneof('type') == 'exception':
+                    erros.append(f'{elemento.exception.type}: {elemento.exception.message}')
+            elif tipo == 'script_finished':
+                if erros or resposta.script_finished != resposta.FINISHED_SUCCESSFULLY:
+                    raise RuntimeError(f'{pagina or "início"}: {"; ".join(erros) or resposta.script_finished}')
+                return
+
+    async def trocar_pagina(self, pagina):
+        """Escolhe `pagina` no menu, espera o rerun terminar e devolve a medição dele."""
+        inicio = time.perf_counter()
+        await self._rerun(pagina)
+        return {'pagina': pagina, 'segundos': time.perf_counter() - inicio, 'rss_bytes': self.servidor.rss()}
+
+
+async def _percorrer(sessao, numero, voltas):
+    deslocamento = numero % len(PAGINAS)
+    ordem = PAGINAS[deslocamento:] + PAGINAS[:deslocamento]
+    return [await sessao.trocar_pagina(pagina) for _ in range(voltas) for pagina in ordem]
+
+
+async def aquecer(servidor):
+    """Abre cada página uma vez, fora das medições."""
+    sessao = await Sessao(servidor).abrir()
+    try:
+        for pagina in PAGINAS:
+            await sessao.trocar_pagina(pagina)
+    finally:
+        await sessao.fechar()
+
+
+def resumir(medicoes, segundos, cpu_segundos, cpu_paginas):
+    """Percentis de latência, CPU e RSS por página de um nível de concorrência.
+
+    `cpu_paginas` é {página: (soma, contagem)} da CPU dos reruns no nível.
+    """
+    paginas = {}
+    for pagina in PAGINAS:
+        daquela = [medicao for medicao in medicoes if medicao['pagina'] == pagina]
+        if not daquela:
+            continue
+        percentis = np.percentile([medicao['segundos'] for medicao in daquela], PERCENTIS)
+        soma, contagem = cpu_paginas.get(pagina, (0.0, 0))
+        rss = [medicao['rss_bytes'] for medicao in daquela if medicao['rss_bytes'] is not None]
+        paginas[pagina] = {
+            'reruns': len(daquela),
+            **{f'p{percentil}': float(valor) for percentil, valor in zip(PERCENTIS, percentis)},
+            'cpu_rerun': soma / contagem if contagem else None,
+            'rss_maximo': max(rss) if rss else None,
+        }
+    rss = [medicao['rss_bytes'] for medicao in medicoes if medicao['rss_bytes'] is not None]
+    return {
+        'reruns': len(medicoes),
+        'segundos': segundos,
+        'vazao': len(medicoes) / segundos if segundos else None,
+        'cpu_percentual': 100 * cpu_segundos / segundos if segundos else None,
+        'rss_maximo': max(rss) if rss else None,
+        'paginas': paginas,
+    }
+
+
+async def _medir_nivel(servidor, sessoes, voltas, tempo_limite):
+    abertas = []
+    try:
+        # Todas as sessões abrem antes de o cronômetro começar
+        for sessao in await asyncio.gather(*(Sessao(servidor, tempo_limite).abrir() for _ in range(sessoes))):
+            abertas.append(sessao)
+        cpu_antes, paginas_antes = servidor.cpu(), servidor.cpu_por_pagina()
+        inicio = time.perf_counter()
+        medicoes = await asyncio.gather(*(_percorrer(sessao, numero, voltas) for numero, sessao in enumerate(abertas)))
+        segundos = time.perf_counter() - inicio
+        cpu = servidor.cpu() - cpu_antes
+        paginas_depois = servidor.cpu_por_pagina()
+    finally:
+        await asyncio.gather(*(sessao.fechar() for sessao in abertas))
+
+    cpu_paginas = {}
+    for pagina, (soma, contagem) in paginas_depois.items():
+        soma_antes, contagem_antes = paginas_antes.get(pagina, (0.0, 0))
+        cpu_paginas[pagina] = (soma - soma_antes, contagem - contagem_antes)
+    return resumir([medicao for lista in medicoes for medicao in lista], segundos, cpu, cpu_paginas)
+
+
+def medir_nivel(servidor, sessoes, voltas=2, tempo_limite=TEMPO_LIMITE):
+    """Roda `sessoes` sessões simultâneas por `voltas` voltas e resume as medições."""
+    return asyncio.run(_medir_nivel(servidor, sessoes, voltas, tempo_limite))
+
+
+def _mib(valor):
+    return '      -' if valor is None else f'{valor / 2**20:7.0f}'
+
+
+def imprimir(sessoes, resumo, referencia):
+    """Tabela de um nível; com `referencia` (o mesmo nível gravado antes) mostra a variação do p95."""
+    print(f'--- {sessoes} sessões: {resumo["reruns"]} reruns em {resumo["segundos"]:.1f} s '
+          f'({resumo["vazao"]:.2f} reruns/s), CPU {resumo["cpu_percentual"]:.0f}%, '
+          f'RSS máx. {_mib(resumo["rss_maximo"]).strip()} MiB')
+    print(f'{"página":<20} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"CPU ms":>9} {"RSS MiB":>8}')
+    anteriores = referencia.get('paginas', {})
+    for pagina, valores in resumo['paginas'].items():
+        cpu = '        -' if valores['cpu_rerun'] is None else f'{valores["cpu_rerun"] * 1000:9.1f}'
+        linha = (f'{pagina:<20} {valores["p50"] * 1000:9.1f} {valores["p95"] * 1000:9.1f} '
+                 f'{valores["p99"] * 1000:9.1f} {cpu} {_mib(valores["rss_maximo"]):>8}')
+        if pagina in anteriores:
+            linha += f'  (p95 {(valores["p95"] / anteriores[pagina]["p95"] - 1) * 100:+.1f}% vs referência)'
+        print(linha)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Teste de carga com várias sessões simultâneas do dashboard.')
+    parser.add_argument('--sessoes', type=int, nargs='+', default=[1, 4, 16],
+                        help='níveis de concorrência, ex.: 1 4 16 64')
+    parser.add_argument('--voltas', type=int, default=2, help='voltas por todas as páginas em cada sessão')
+    parser.add_argument('--sem-aquecimento', action='store_true', help='mede também os reruns com cache frio')
+    parser.add_argument('--salvar', help='grava o resumo de cada nível neste JSON')
+    parser.add_argument('--comparar', help='JSON de referência (gravado com --salvar)')
+    parser.add_argument('--log', help='arquivo para o log do servidor (padrão: pasta temporária)')
+    args = parser.parse_args(argv)
+
+    referencia = {}
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo)
+
+    resultados = {}
+    with Servidor(log=args.log) as servidor:
+        if not args.sem_aquecimento:
+            asyncio.run(aquecer(servidor))
+        for sessoes in args.sessoes:
+            resultados[str(sessoes)] = medir_nivel(servidor, sessoes, args.voltas)
+            imprimir(sessoes, resultados[str(sessoes)], referencia.get(str(sessoes), {}))
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
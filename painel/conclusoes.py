@@ -0,0 +1,77 @@
+"""Textos das conclusões das páginas, montados a partir do resultado mostrado.
+
+As conclusões eram frases fixas, escritas para o DataSet completo. Com os
+filtros da barra lateral a mesma frase podia contradizer o gráfico logo
+acima dela, então cada página monta o texto a partir do `resultado` da
+pergunta, com as funções daqui.
+
+No modo aproximado cada valor vem com o intervalo de 95% ao lado, então
+"o maior" só é afirmado sem ressalva quando o intervalo do primeiro não
+encosta no de nenhum outro (`ressalva`).
+"""
+
+import pandas as pd
+
+from painel.amostragem import MARGEM, Estimativa
+
+
+def ordenar(resultado, valor):
+    """Linhas de `resultado` do maior para o menor `valor` (ausentes no fim)."""
+    return resultado.sort_values(valor, ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+
+
+def maior(resultado, valor):
+    """Linha de `resultado` com o maior `valor` (a primeira, em caso de empate)."""
+    return ordenar(resultado, valor).iloc[0]
+
+
+def enumerar(itens):
+    """'a', 'a e b', 'a, b e c'."""
+    itens = [str(item) for item in itens]
+    if len(itens) <= 1:
+        return ''.join(itens)
+    return f'{", ".join(itens[:-1])} e {itens[-1]}'
+
+
+def empatados(resultado, valor):
+    """Linhas cujo intervalo de 95% se sobrepõe ao da de maior `valor`; vazio sem intervalos."""
+    linhas = ordenar(resultado, valor)
+    if MARGEM not in linhas.columns or len(linhas) < 2:
+        return linhas.iloc[0:0]
+    # Sem margem (desvio padrão, estrato inteiro na amostra) o valor conta como exato
+    margem = linhas[MARGEM].fillna(0.0)
+    sobrepostos = linhas[valor] + margem >= linhas.loc[0, valor] - margem.iloc[0]
+    return linhas[sobrepostos.to_numpy()].iloc[1:]
+
+
+def ressalva(resultado, dimensao, valor):
+    """Frase final para quando a amostra não distingue o primeiro lugar dos seguintes."""
+    outros = empatados(resultado, valor)
+    if outros.empty:
+        return ''
+    primeiro = maior(resultado, valor)[dimensao]
+    return (f' Pelos intervalos de 95% da amostra, porém, {primeiro} não se distingue de '
+            f'{enumerar(outros[dimensao])}.')
+
+
+def quantidade(linha, valor):
+    """Texto de uma contagem ou soma de unidades de `linha`.
+
+    No modo aproximado o valor é uma estimativa em ponto flutuante: sai
+    arredondado e marcado como aproximado, com a margem de 95%. Margem zero
+    (todos os estratos inteiros na amostra) é um valor exato.
+    """
+    if MARGEM not in linha.index or linha[MARGEM] == 0:
+        return f'{linha[valor]:,.0f}'
+    texto = f'aproximadamente {linha[valor]:,.0f}'
+    if pd.notna(linha[MARGEM]):
+        texto += f' (± {linha[MARGEM]:,.0f}, IC 95%)'
+    return texto
+
+
+def aproximado(valor, casas=4):
+    """Texto de um número; uma `Estimativa` sai com o intervalo de 95%."""
+    if not isinstance(valor, Estimativa):
+        return f'{valor}'
+    return (f'aproximadamente {valor:.{casas}f} (entre {valor - valor.margem:.{casas}f} '
+            f'e {valor + valor.margem:.{casas}f}, IC 95%)')
@@ -0,0 +1,58 @@
+"""Descrição declarativa das perguntas de negócio de cada página.
+
+Cada pergunta é um agrupamento simples (dimensões, medida, estatística) com
+ordenação e renomeação opcionais. Descrever as perguntas assim, em vez de
+escrever o groupby direto na página, permite executá-las sobre o cubo,
+medir cada uma separadamente e reaproveitá-las fora do Streamlit.
+"""
+
+from typing import NamedTuple
+
+import pandas as pd
+
+from painel.cubo import consultar, contar, filtrar
+
+
+class Consulta(NamedTuple):
+    dimensoes: object
+    medida: str
+    # 'sum', 'count', 'mean', 'std' ou 'linhas' (número de notas por grupo)
+    estatistica: str
+    ordenar_por: str = None
+    crescente: bool = False
+    renomear: dict = None
+
+
+def executar(consulta, fonte, filtros=None):
+    """Resultado da consulta no mesmo formato que as páginas exibem.
+
+    `fonte` é o cubo (DataFrame de painel.cubo) ou um motor de
+    painel.motores; `filtros` mapeia dimensão -> valores aceitos.
+    """
+    if not isinstance(fonte, pd.DataFrame):
+        resultado = fonte.agregar(consulta.dimensoes, consulta.medida, consulta.estatistica, filtros)
+    elif consulta.estatistica == 'linhas':
+        resultado = contar(filtrar(fonte, filtros), consulta.dimensoes, consulta.medida)
+    else:
+        resultado = consultar(filtrar(fonte, filtros), consulta.dimensoes, consulta.medida, consulta.estatistica)
+    if not consulta.dimensoes:
+        # Agregado geral: um único número
+        return resultado
+
+    if consulta.renomear:
+        resultado = resultado.rename(columns=consulta.renomear)
+    if consulta.ordenar_por:
+        resultado = resultado.sort_values(consulta.ordenar_por, ascending=consulta.crescente).reset_index(drop=True)
+    return resultado
+
+
+def calcular_perguntas(pagina, perguntas, fonte, medidor=None):
+    """Executa todas as perguntas de uma página, medindo cada uma se houver medidor."""
+    resultados = {}
+    for numero, consulta in perguntas.items():
+        if medidor is None:
+            resultados[numero] = executar(consulta, fonte)
+            continue
+        with medidor.secao(f'{pagina}/{numero}', 'agregacao'):
+            resultados[numero] = executar(consulta, fonte)
+    return resultados
@@ -0,0 +1,333 @@
+"""Correlações da página Satisfação em uma passada, com intervalos de confiança.
+
+* `Covariancias` acumula, por grupo, a contagem, as médias e os co-momentos
+  (somas dos produtos dos desvios) das colunas numéricas. Cada bloco novo é
+  reduzido de forma vetorizada e juntado ao que já existe pela fórmula de
+  Chan, a mesma de `combinar_cubos`, então o acumulador pode ser atualizado
+  bloco a bloco (painel.ingestao) ou combinado com o de outro processo sem
+  reler as linhas. Um acumulador por filial x linha de produto também dá os
+  de cada filial, de cada linha e o geral (`reduzir`).
+* Spearman é a correlação de Pearson dos postos, calculada pelo mesmo
+  acumulador depois de ordenar cada grupo.
+* O intervalo de Pearson é um bootstrap percentil de Poisson: os pesos de
+  todas as réplicas são gerados em lotes e cada célula filial x linha de
+  produto vira um produto de matrizes sobre as somas suficientes (n, Σx, Σy,
+  Σx², Σy², Σxy). Os grupos de todos os níveis saem somando as células, com
+  um único sorteio. Acima de `MAXIMO_BOOTSTRAP` linhas ele reamostra uma
+  amostra de m linhas e reescala os desvios por sqrt(m / n) (bootstrap
+  "m de n"), o que mantém o custo fixo. O intervalo de Spearman usa a transformação de Fisher com o
+  erro padrão de Bonett e Wright, que não precisa reordenar a cada réplica.
+
+Linhas com valor ausente em alguma das colunas ficam de fora.
+"""
+
+import numpy as np
+import pandas as pd
+
+from painel.amostragem import Z_95
+
+COLUNAS = ['Unit price', 'Quantity', 'Total', 'gross income', 'Rating']
+DIMENSOES = ['Branch', 'Product line']
+ROTULOS = {(): 'Geral', ('Branch',): 'Filial', ('Product line',): 'Linha de produto'}
+REPLICAS = 1000
+MAXIMO_BOOTSTRAP = 20_000
+ELEMENTOS_LOTE = 1_000_000
+
+
+def _agrupar(tabela, dimensoes):
+    """Código do grupo de cada linha e a chave (tupla) de cada código."""
+    agrupado = tabela.groupby(dimensoes, observed=True)
+    chaves = [chave if isinstance(chave, tuple) else (chave,) for chave in agrupado.size().index]
+    return agrupado.ngroup().to_numpy(), chaves
+
+
+class Covariancias:
+    """Contagem, médias e co-momentos de `colunas` por grupo de `dimensoes`."""
+
+    def __init__(self, colunas=COLUNAS, dimensoes=()):
+        self.colunas = list(colunas)
+        self.dimensoes = list(dimensoes)
+        k = len(self.colunas)
+        self.chaves = []
+        self._posicoes = {}
+        self.n = np.zeros(0)
+        self.media = np.zeros((0, k))
+        self.comomento = np.zeros((0, k, k))
+
+    def _garantir(self, chaves):
+        """Posição de cada chave, criando grupos vazios para as novas."""
+        novas = [chave for chave in dict.fromkeys(chaves) if chave not in self._posicoes]
+        if novas:
+            for chave in novas:
+                self._posicoes[chave] = len(self.chaves)
+                self.chaves.append(chave)
+            k = len(self.colunas)
+            self.n = np.concatenate([self.n, np.zeros(len(novas))])
+            self.media = np.concatenate([self.media, np.zeros((len(novas), k))])
+            self.comomento = np.concatenate([self.comomento, np.zeros((len(novas), k, k))])
+        return np.array([self._posicoes[chave] for chave in chaves], dtype='int64')
+
+    def _juntar(self, posicoes, n, media, comomento):
+        """Soma parciais (um por posição, sem posições repetidas) pela fórmula de Chan."""
+        anterior = self.n[posicoes]
+        total = anterior + n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            peso_novo = np.where(total > 0, n / total, 0.0)
+        delta = media - self.media[posicoes]
+        cruzado = (anterior * peso_novo)[:, None, None] * delta[:, :, None] * delta[:, None, :]
+        self.comomento[posicoes] += comomento + cruzado
+        self.media[posicoes] += delta * peso_novo[:, None]
+        self.n[posicoes] = total
+
+    def atualizar(self, bloco):
+        """Acrescenta as linhas de `bloco` (um DataFrame) em uma passada vetorizada."""
+        valores = bloco[self.colunas].to_numpy('float64', na_value=np.nan)
+        completas = ~np.isnan(valores).any(axis=1)
+        if self.dimensoes:
+            completas &= bloco[self.dimensoes].notna().all(axis=1).to_numpy()
+            codigos, chaves = _agrupar(bloco.loc[completas, self.dimensoes], self.dimensoes)
+        else:
+            codigos, chaves = np.zeros(completas.sum(), dtype='int64'), [()]
+        valores = valores[completas]
+        if not len(valores):
+            return self
+
+        grupos = len(chaves)
+        n = np.bincount(codigos, minlength=grupos).astype('float64')
+        media = np.stack([np.bincount(codigos, coluna, grupos) for coluna in valores.T], axis=1) / n[:, None]
+        desvios = valores - media[codigos]
+        k = len(self.colunas)
+        comomento = np.empty((grupos, k, k))
+        for i in range(k):
+            for j in range(i, k):
+                comomento[:, i, j] = comomento[:, j, i] = np.bincount(codigos, desvios[:, i] * desvios[:, j], grupos)
+        self._juntar(self._garantir(chaves), n, media, comomento)
+        return self
+
+    def combinar(self, outro):
+        """Junta o acumulador `outro` (mesmas colunas e dimensões) a este."""
+        self._juntar(self._garantir(outro.chaves), outro.n, outro.media, outro.comomento)
+        return self
+
+    def reduzir(self, dimensoes=()):
+        """Novo acumulador agrupado só por `dimensoes`, um subconjunto das atuais."""
+        novo = Covariancias(self.colunas, dimensoes)
+        indices = [self.dimensoes.index(dimensao) for dimensao in dimensoes]
+        for posicao, chave in enumerate(self.chaves):
+            chave_nova = tuple(chave[i] for i in indices)
+            fatia = slice(posicao, posicao + 1)
+            novo._juntar(novo._garantir([chave_nova]), self.n[fatia], self.media[fatia], self.comomento[fatia])
+        return novo
+
+    def correlacoes(self):
+        """Matrizes de correlação de Pearson de todos os grupos, forma (grupos, k, k)."""
+        desvio = np.sqrt(np.diagonal(self.comomento, axis1=1, axis2=2))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.comomento / (desvio[:, :, None] * desvio[:, None, :])
+
+    def matriz(self, chave=()):
+        """Matriz de correlação do grupo `chave` como DataFrame."""
+        posicao = self._posicoes[chave]
+        return pd.DataFrame(self.correlacoes()[posicao], index=self.colunas, columns=self.colunas)
+
+    def pearson(self, x, y):
+        """Dicionário chave do grupo -> correlação entre as colunas `x` e `y`."""
+        i, j = self.colunas.index(x), self.colunas.index(y)
+        return dict(zip(self.chaves, self.correlacoes()[:, i, j]))
+
+
+def spearman(df1, x, y, dimensoes=()):
+    """Dicionário chave do grupo -> correlação de Spearman entre `x` e `y`."""
+    dimensoes = list(dimensoes)
+    pares = df1[dimensoes + [x, y]].dropna()
+    if dimensoes:
+        postos = pares.groupby(dimensoes, observed=True)[[x, y]].rank()
+    else:
+        postos = pares[[x, y]].rank()
+    acumulador = Covariancias([x, y], dimensoes).atualizar(postos.join(pares[dimensoes]))
+    return acumulador.pearson(x, y)
+
+
+def _somas(x, y):
+    """Estatísticas suficientes de Pearson por linha: 1, x, y, x², y², xy."""
+    return np.stack([np.ones_like(x), x, y, x * x, y * y, x * y], axis=-1)
+
+
+def _pearson_somas(somas):
+    """Pearson a partir das somas de `_somas` (última dimensão)."""
+    n, sx, sy, sxx, syy, sxy = np.moveaxis(somas, -1, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sxy - sx * sy / n) / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+
+
+def bootstrap_celulas(x, y, celulas, quantidade, replicas=REPLICAS, semente=0, maximo=MAXIMO_BOOTSTRAP):
+    """Somas de `_somas` por réplica e célula, para o bootstrap de Poisson.
+
+    Cada réplica dá a cada linha um peso Poisson(1), o que equivale a
+    reamostrar cada célula com reposição e deixa as células independentes.
+    Os pesos são gerados em lotes de réplicas e cada célula vira um único
+    produto de matrizes (pesos x somas), então qualquer grupo de células sai
+    somando as somas delas. Acima de `maximo` linhas só uma amostra de
+    `maximo` linhas é reamostrada.
+
+    Retorna `(replicadas, observadas, linhas)`: somas das réplicas
+    (réplicas x células x 6), somas da amostra sem pesos (células x 6) e o
+    número de linhas de cada célula na amostra.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    celulas = np.asarray(celulas)
+    gerador = np.random.default_rng(semente)
+    if len(x) > maximo:
+        escolhidas = np.sort(gerador.choice(len(x), maximo, replace=False))
+        x, y, celulas = x[escolhidas], y[escolhidas], celulas[escolhidas]
+    # Centrar evita o cancelamento entre somas grandes; Pearson não muda
+    if len(x):
+        x, y = x - x.mean(), y - y.mean()
+    ordem = np.argsort(celulas, kind='stable')
+    somas = _somas(x[ordem], y[ordem])
+    linhas = np.bincount(celulas, minlength=quantidade)
+    limites = np.concatenate([[0], np.cumsum(linhas)])
+
+    m = len(x)
+    lote = max(1, ELEMENTOS_LOTE // max(m, 1))
+    replicadas = np.empty((replicas, quantidade, 6))
+    for inicio in range(0, replicas, lote):
+        fim = min(inicio + lote, replicas)
+        pesos = gerador.poisson(1.0, size=(fim - inicio, m)).astype('float64')
+        for celula in range(quantidade):
+            a, b = limites[celula], limites[celula + 1]
+            replicadas[inicio:fim, celula] = pesos[:, a:b] @ somas[a:b]
+    observadas = np.stack([somas[limites[c]:limites[c + 1]].sum(axis=0) for c in range(quantidade)])
+    return replicadas, observadas, linhas
+
+
+def intervalo_bootstrap(replicadas, observadas, linhas, total, centro):
+    """Intervalo percentil de 95% de Pearson de um grupo de células.
+
+    `replicadas`, `observadas` e `linhas` são os de `bootstrap_celulas` já
+    somados nas células do grupo; `total` é o número de linhas do grupo no
+    DataFrame inteiro e `centro` a correlação exata dele. Os desvios das
+    réplicas em torno da correlação da amostra são reescalados por
+    sqrt(linhas / total), o que só muda algo quando houve amostragem.
+    """
+    if linhas < 3:
+        return np.nan, np.nan
+    desvios = (_pearson_somas(replicadas) - _pearson_somas(observadas)) * np.sqrt(linhas / total)
+    if np.isnan(desvios).all():
+        return np.nan, np.nan
+    inferior, superior = np.nanpercentile(desvios, [2.5, 97.5])
+    return float(np.clip(centro + inferior, -1, 1)), float(np.clip(centro + superior, -1, 1))
+
+
+def bootstrap_pearson(x, y, replicas=REPLICAS, semente=0, maximo=MAXIMO_BOOTSTRAP):
+    """Intervalo percentil de 95% da correlação de Pearson entre os vetores `x` e `y`."""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    replicadas, observadas, linhas = bootstrap_celulas(
+        x, y, np.zeros(len(x), dtype='int64'), 1, replicas, semente, maximo)
+    centro = _pearson_somas(_somas(x - x.mean(), y - y.mean()).sum(axis=0)) if len(x) else np.nan
+    return intervalo_bootstrap(replicadas[:, 0], observadas[0], linhas[0], len(x), centro)
+
+
+def intervalo_spearman(rho, n):
+    """Intervalo de 95% de Spearman: Fisher z com o erro padrão de Bonett e Wright."""
+    if n <= 3 or not np.isfinite(rho) or abs(rho) >= 1:
+        return np.nan, np.nan
+    erro = np.sqrt((1 + rho ** 2 / 2) / (n - 3))
+    z = np.arctanh(rho)
+    return float(np.tanh(z - Z_95 * erro)), float(np.tanh(z + Z_95 * erro))
+
+
+class Correlacoes:
+    """Tudo o que a página Satisfação mostra sobre correlações de um DataFrame."""
+
+    def __init__(self, df1, x='Total', y='Rating', colunas=COLUNAS, dimensoes=DIMENSOES, replicas=REPLICAS):
+        self.x, self.y = x, y
+        dimensoes = list(dimensoes)
+        # As mesmas linhas para Pearson, o bootstrap e Spearman: uma lacuna em
+        # outra coluna tira a linha das matrizes, então também tira do
+        # intervalo, senão a estimativa e o intervalo viriam de linhas diferentes
+        completas = df1[dimensoes + list(colunas)].dropna()
+        self.por_celula = Covariancias(colunas, dimensoes).atualizar(completas)
+        self.niveis = {tuple(nivel): self.por_celula.reduzir(nivel) for nivel in [(), *([d] for d in dimensoes)]}
+
+        # Um bootstrap só, por célula filial x linha de produto; os grupos de
+        # cada nível somam as células que os compõem
+        pares = completas[dimensoes + [x, y]]
+        celulas, chaves_celulas = _agrupar(pares, dimensoes)
+        replicadas, observadas, amostradas = bootstrap_celulas(
+            pares[x], pares[y], celulas, len(chaves_celulas), replicas)
+
+        linhas = []
+        for nivel, acumulador in self.niveis.items():
+            pearson = acumulador.pearson(x, y)
+            rho = spearman(pares, x, y, nivel)
+            indices = [dimensoes.index(dimensao) for dimensao in nivel]
+            for posicao, chave in enumerate(acumulador.chaves):
+                dentro = np.array([tuple(c[i] for i in indices) == chave for c in chaves_celulas])
+                n = int(acumulador.n[posicao])
+                pearson_ic = intervalo_bootstrap(
+                    replicadas[:, dentro].sum(axis=1), observadas[dentro].sum(axis=0),
+                    amostradas[dentro].sum(), n, pearson[chave],
+                )
+                spearman_ic = intervalo_spearman(rho[chave], n)
+                linhas.append({
+                    'Nível': ROTULOS.get(nivel, ' x '.join(nivel)),
+                    'Grupo': ' / '.join(map(str, chave)) or 'Todas as vendas',
+                    'Vendas': n,
+                    'Pearson': pearson[chave],
+                    'Pearson IC 95% (inf.)': pearson_ic[0],
+                    'Pearson IC 95% (sup.)': pearson_ic[1],
+                    'Spearman': rho[chave],
+                    'Spearman IC 95% (inf.)': spearman_ic[0],
+                    'Spearman IC 95% (sup.)': spearman_ic[1],
+                })
+        self.tabela = pd.DataFrame(linhas)
+
+    def geral(self):
+        return self.tabela.iloc[0]
+
+    def grupos(self):
+        """(rótulo, nível, chave) de cada matriz de correlação disponível."""
+        return [
+            (ROTULOS[()] if not nivel else f'{ROTULOS.get(nivel, nivel)}: {" / ".join(map(str, chave))}', nivel, chave)
+            for nivel, acumulador in self.niveis.items() for chave in acumulador.chaves
+        ]
+
+    def matriz(self, nivel=(), chave=()):
+        return self.niveis[tuple(nivel)].matriz(chave)
+
+    def para_pacote(self):
+        """Matrizes de todos os grupos em forma de JSON, para o relatório estático."""
+        itens = []
+        for rotulo, nivel, chave in self.grupos():
+            matriz = self.matriz(nivel, chave)
+            itens.append({
+                'rotulo': rotulo,
+                'nivel': list(nivel),
+                'chave': [str(valor) for valor in chave],
+                'colunas': list(matriz.columns),
+                'valores': [[None if np.isnan(valor) else float(valor) for valor in linha] for linha in matriz.to_numpy()],
+            })
+        return itens
+
+
+class CorrelacoesProntas:
+    """Mesma interface de `Correlacoes`, lida de um pacote de painel.relatorio."""
+
+    def __init__(self, tabela, matrizes):
+        self.tabela = tabela
+        self._matrizes = {}
+        for item in matrizes:
+            matriz = pd.DataFrame(item['valores'], index=item['colunas'], columns=item['colunas'], dtype='float64')
+            self._matrizes[(tuple(item['nivel']), tuple(item['chave']))] = (item['rotulo'], matriz)
+
+    def geral(self):
+        return self.tabela.iloc[0]
+
+    def grupos(self):
+        return [(rotulo, nivel, chave) for (nivel, chave), (rotulo, _) in self._matrizes.items()]
+
+    def matriz(self, nivel=(), chave=()):
+        return self._matrizes[(tuple(nivel), tuple(chave))][1]
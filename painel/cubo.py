@@ -0,0 +1,154 @@
+"""Cubo de agregação pré-calculado para as páginas do dashboard.
+
+Todas as perguntas de negócio são agrupamentos simples sobre as mesmas
+dimensões. Em vez de cada página rodar o seu próprio groupby sobre todas as
+linhas, o DataFrame é varrido uma única vez no carregamento e agrupado pela
+combinação de todas as dimensões. Cada célula guarda contagem, soma e M2
+(soma dos quadrados dos desvios) de cada medida, o que permite recompor
+soma, contagem, média e desvio padrão de qualquer agrupamento mais grosso
+sem voltar aos dados originais.
+
+O tamanho do cubo depende só da cardinalidade das dimensões, não do número
+de linhas, então o custo de abrir uma página deixa de crescer com o DataSet.
+"""
+
+import numpy as np
+import pandas as pd
+
+from painel.dados import aplicar_esquema
+
+DIMENSOES = [
+    'Branch', 'City', 'Product line', 'Payment', 'Gender',
+    'Customer type', 'Dia_Semana', 'Mes', 'Hour',
+]
+MEDIDAS = ['Total', 'gross income', 'Tax 5%', 'Quantity', 'Rating']
+LINHAS = 'linhas'
+
+
+def construir_cubo(df1):
+    """Agrupa o DataFrame por todas as dimensões em uma única passada."""
+    base = df1[DIMENSOES].copy()
+    # As medidas podem vir em tipos estreitos (int8, float32); as somas do cubo
+    # são acumuladas em 64 bits para não perder precisão em históricos grandes
+    for medida in MEDIDAS:
+        tipo = 'int64' if pd.api.types.is_integer_dtype(df1[medida]) else 'float64'
+        base[medida] = df1[medida].astype(tipo)
+
+    agregacoes = {LINHAS: ('Total', 'size')}
+    for medida in MEDIDAS:
+        agregacoes[f'{medida}|n'] = (medida, 'count')
+        agregacoes[f'{medida}|soma'] = (medida, 'sum')
+        agregacoes[f'{medida}|var'] = (medida, 'var')
+
+    # dropna=False mantém as linhas com data inválida: elas continuam valendo
+    # para os agrupamentos que não usam Dia_Semana/Mes, como no groupby original
+    cubo = base.groupby(DIMENSOES, dropna=False, observed=True).agg(**agregacoes).reset_index()
+
+    for medida in MEDIDAS:
+        n = cubo[f'{medida}|n']
+        cubo[f'{medida}|m2'] = (cubo.pop(f'{medida}|var') * (n - 1)).fillna(0.0)
+    return cubo
+
+
+def _normalizar(dimensoes):
+    if dimensoes is None:
+        return []
+    if isinstance(dimensoes, str):
+        return [dimensoes]
+    return list(dimensoes)
+
+
+def filtrar(tabela, filtros):
+    """Linhas de `tabela` (DataFrame ou cubo) cujos valores estão em `filtros`.
+
+    `filtros` mapeia coluna -> valores aceitos, ex.: {'Branch': ['A', 'B']}.
+    No cubo só faz sentido filtrar pelas DIMENSOES.
+    """
+    if not filtros:
+        return tabela
+    mascara = np.ones(len(tabela), dtype=bool)
+    for coluna, valores in filtros.items():
+        mascara &= tabela[coluna].isin(list(valores)).to_numpy()
+    return tabela[mascara]
+
+
+def consultar(cubo, dimensoes, medida, estatistica='sum'):
+    """Recompõe `df1.groupby(dimensoes)[medida].<estatistica>()` a partir do cubo.
+
+    `estatistica` pode ser 'sum', 'count', 'mean' ou 'std' (ddof=1, como no
+    pandas). O resultado já vem com `reset_index()`, no mesmo formato que as
+    páginas usavam.
+    """
+    dims = _normalizar(dimensoes)
+    n_col, soma_col, m2_col = f'{medida}|n', f'{medida}|soma', f'{medida}|m2'
+
+    if not dims:
+        # Agregado geral: um grupo só com todas as células
+        chave = pd.Series(0, index=cubo.index)
+        grupos = cubo.groupby(chave)
+    else:
+        grupos = cubo.groupby(dims, observed=True)
+
+    if estatistica == 'sum':
+        valores = grupos[soma_col].sum()
+    elif estatistica == 'count':
+        valores = grupos[n_col].sum()
+    elif estatistica == 'mean':
+        valores = grupos[soma_col].sum() / grupos[n_col].sum()
+    elif estatistica == 'std':
+        # Combinação de M2 por grupos (Chan et al.): soma dos M2 das células
+        # mais o desvio de cada média de célula em relação à média do grupo
+        n = cubo[n_col]
+        media_celula = cubo[soma_col] / n.where(n > 0)
+        media_grupo = grupos[soma_col].transform('sum') / grupos[n_col].transform('sum')
+        entre = (n * (media_celula - media_grupo) ** 2).fillna(0.0)
+        m2 = (cubo[m2_col] + entre).groupby([cubo[d] for d in dims] or chave, observed=True).sum()
+        total = grupos[n_col].sum()
+        valores = np.sqrt(m2 / (total - 1).where(total > 1))
+    else:
+        raise ValueError(f'Estatística não suportada: {estatistica}')
+
+    resultado = valores.rename(medida)
+    if not dims:
+        return resultado.iloc[0]
+    return resultado.reset_index()
+
+
+def contar(cubo, dimensoes, nome='Invoice ID'):
+    """Número de linhas por grupo, equivalente a `groupby(...)['Invoice ID'].count()`."""
+    dims = _normalizar(dimensoes)
+    return cubo.groupby(dims, observed=True)[LINHAS].sum().rename(nome).reset_index()
+
+
+def combinar_cubos(*cubos, disjuntos=False):
+    """Junta cubos parciais (de blocos ou partições diferentes) em um só.
+
+    Contagens e somas são somadas; os M2 são combinados pela fórmula de Chan,
+    então o desvio padrão final é o mesmo que seria obtido com todas as
+    linhas de uma vez. Com `disjuntos=True` (parciais que nunca repetem uma
+    célula, como partições por uma dimensão) os cubos só são empilhados.
+    """
+    cubos = [c for c in cubos if c is not None and len(c)]
+    if not cubos:
+        return None
+    if len(cubos) == 1:
+        return cubos[0].reset_index(drop=True)
+    if disjuntos:
+        # Cada parcial infere as próprias categorias; o esquema as reunifica
+        return aplicar_esquema(pd.concat(cubos, ignore_index=True))
+
+    todos = pd.concat(cubos, ignore_index=True)
+    grupos = todos.groupby(DIMENSOES, dropna=False, observed=True, sort=False)
+
+    ajustado = todos[[LINHAS]].copy()
+    for medida in MEDIDAS:
+        n_col, soma_col, m2_col = f'{medida}|n', f'{medida}|soma', f'{medida}|m2'
+        n = todos[n_col]
+        media_celula = todos[soma_col] / n.where(n > 0)
+        media_grupo = grupos[soma_col].transform('sum') / grupos[n_col].transform('sum')
+        ajustado[n_col] = n
+        ajustado[soma_col] = todos[soma_col]
+        ajustado[m2_col] = todos[m2_col] + (n * (media_celula - media_grupo) ** 2).fillna(0.0)
+
+    chaves = [todos[d] for d in DIMENSOES]
+    return ajustado.groupby(chaves, dropna=False, observed=True).sum().reset_index()
@@ -0,0 +1,261 @@
+"""Carregamento do DataSet com cache colunar (Parquet).
+
+A leitura do Excel pelo openpyxl é lenta e cresce com o tamanho do arquivo.
+Por isso o workbook é convertido uma única vez para Parquet e as próximas
+leituras usam essa cópia colunar. O nome do cache leva uma chave derivada do
+caminho, do tamanho e do mtime do arquivo original: se o xlsx for trocado,
+um novo cache é gerado automaticamente.
+
+O app e os processos auxiliares não leem o Parquet: a partir dele é
+publicada, uma vez por versão, uma cópia Arrow IPC sem compressão
+(`.arrow`, ao lado do Parquet). Esse arquivo é aberto com mmap e o DataFrame
+aponta direto para as páginas mapeadas, sem cópia e somente leitura. Como
+as páginas vêm do cache de arquivos do sistema operacional, todas as sessões
+e todos os processos que abrem a mesma versão dividem a mesma memória física.
+"""
+
+import glob
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_PADRAO = 'supermarket_sales.xlsx'
+PASTA_CACHE = Path('.cache')
+
+# Incrementar sempre que o tratamento ou o esquema mudar, para invalidar os
+# caches Parquet gravados com o formato antigo
+VERSAO_ESQUEMA = 4
+
+DIAS_SEMANA = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MESES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+]
+
+# Esquema compacto do DataFrame tratado. Dimensões de baixa cardinalidade
+# viram categóricas e dia/mês viram categóricas ordenadas, o que já deixa os
+# agrupamentos na ordem do calendário. Valores monetários e Rating continuam
+# em float64 porque são somados e mostrados com todas as casas; a margem
+# bruta é praticamente constante e cabe em float32. Os inteiros são só o
+# menor tipo aceito: `aplicar_esquema` sobe para um tipo maior quando os
+# valores não cabem.
+ESQUEMA = {
+    'Branch': 'category',
+    'City': 'category',
+    'Customer type': 'category',
+    'Gender': 'category',
+    'Product line': 'category',
+    'Payment': 'category',
+    'Quantity': 'int8',
+    'gross margin percentage': 'float32',
+    'Dia_Semana': pd.CategoricalDtype(DIAS_SEMANA, ordered=True),
+    'Mes': pd.CategoricalDtype(MESES, ordered=True),
+    # Inteiros anuláveis: uma data ou hora inválida vira <NA> em vez de quebrar
+    'Hour': 'Int8',
+    'Semana': 'Int8',
+    'Dia': 'Int8',
+}
+
+
+def chave_arquivo(caminho):
+    """Retorna uma chave curta que muda sempre que o arquivo de origem muda."""
+    info = os.stat(caminho)
+    bruto = f'{os.path.abspath(caminho)}|{info.st_size}|{info.st_mtime_ns}|{VERSAO_ESQUEMA}'
+    return hashlib.sha256(bruto.encode('utf-8')).hexdigest()[:16]
+
+
+def prefixo_cache(caminho):
+    """Início do nome dos caches de `caminho`, igual em todas as versões do arquivo.
+
+    Leva um hash do caminho resolvido além do nome: dois arquivos com o mesmo
+    nome em pastas diferentes (uma loja por pasta) têm caches separados.
+    """
+    origem = Path(caminho).resolve()
+    return f'{origem.stem}-{hashlib.sha256(str(origem).encode("utf-8")).hexdigest()[:8]}'
+
+
+def caminho_cache(caminho, pasta_cache=PASTA_CACHE):
+    return Path(pasta_cache) / f'{prefixo_cache(caminho)}-{chave_arquivo(caminho)}.parquet'
+
+
+def caminho_mapa(caminho, pasta_cache=PASTA_CACHE):
+    return caminho_cache(caminho, pasta_cache).with_suffix('.arrow')
+
+
+def _temporario(destino):
+    """Arquivo temporário vazio, com nome único, na pasta de `destino`.
+
+    O nome não pode depender só do pid: as sessões do Streamlit são threads
+    do mesmo processo e podem gravar o mesmo cache ao mesmo tempo.
+    """
+    descritor, nome = tempfile.mkstemp(dir=Path(destino).parent, prefix=f'{Path(destino).name}.', suffix='.tmp')
+    os.close(descritor)
+    return Path(nome)
+
+
+def ler_origem(caminho):
+    """Lê o arquivo original (xlsx, csv ou parquet) sem nenhum tratamento."""
+    sufixo = Path(caminho).suffix.lower()
+    if sufixo in ('.xlsx', '.xls'):
+        return pd.read_excel(caminho)
+    if sufixo == '.csv':
+        return pd.read_csv(caminho)
+    if sufixo == '.parquet':
+        return pd.read_parquet(caminho)
+    raise ValueError(f'Formato de arquivo não suportado: {caminho}')
+
+
+def _inteiro_que_cabe(serie, tipo):
+    """`tipo`, ou o primeiro inteiro maior que ele, que guarda todos os valores de `serie`.
+
+    O astype para um inteiro menor não avisa quando o valor não cabe (200
+    vira -56 em int8), então a faixa é conferida antes.
+    """
+    minimo, maximo = serie.min(), serie.max()
+    if pd.isna(minimo):
+        return tipo
+    anulavel = str(tipo)[0] == 'I'
+    bits = np.iinfo(str(tipo).lower()).bits
+    while bits < 64:
+        limites = np.iinfo(f'int{bits}')
+        if limites.min <= minimo and maximo <= limites.max:
+            break
+        bits *= 2
+    return f'{"Int" if anulavel else "int"}{bits}'
+
+
+def aplicar_esquema(df1):
+    """Converte as colunas presentes em `df1` para os tipos de ESQUEMA."""
+    tipos = {}
+    for coluna, tipo in ESQUEMA.items():
+        if coluna not in df1.columns:
+            continue
+        if isinstance(tipo, str) and tipo.lower().startswith('int'):
+            tipo = _inteiro_que_cabe(df1[coluna], tipo)
+        tipos[coluna] = tipo
+    return df1.astype(tipos)
+
+
+def _categorica(codigos, nomes):
+    """Monta a categórica ordenada direto dos códigos (-1 para valor ausente)."""
+    return pd.Categorical.from_codes(codigos, dtype=pd.CategoricalDtype(nomes, ordered=True))
+
+
+def derivar_tempo(df1):
+    """Acrescenta as colunas de tempo usadas pelas páginas, calculadas uma única vez.
+
+    Dia da semana, mês, semana ISO e dia do mês saem dos campos do datetime64
+    (aritmética sobre os inteiros, sem formatar texto linha a linha) e a hora
+    sai de `Time` convertido para timedelta. As páginas só leem essas colunas.
+    """
+    datas = df1['Date']
+    ausente = datas.isna().to_numpy()
+
+    # 1970-01-01 foi uma quinta-feira; somando 3 a segunda-feira vira o dia 0
+    dias_desde_epoca = datas.to_numpy().astype('datetime64[D]').astype('int64')
+    dia_semana = (dias_desde_epoca + 3) % 7
+    dia_semana[ausente] = -1
+    df1['Dia_Semana'] = _categorica(dia_semana, DIAS_SEMANA)
+
+    mes = datas.dt.month.fillna(0).astype('int64').to_numpy() - 1
+    df1['Mes'] = _categorica(mes, MESES)
+    df1['Semana'] = datas.dt.isocalendar().week
+    df1['Dia'] = datas.dt.day
+
+    # str(datetime.time) e o texto do CSV têm o mesmo formato HH:MM:SS
+    horario = pd.to_timedelta(df1['Time'].astype(str), errors='coerce')
+    # Divisão inteira do timedelta: bem mais barato que .dt.components
+    df1['Hour'] = horario // pd.Timedelta(hours=1)
+    return df1
+
+
+def preparar(df):
+    """Trata o df bruto: datas em datetime64, colunas de tempo e esquema compacto."""
+    df1 = df.copy()
+    df1['Date'] = pd.to_datetime(df1['Date'], errors='coerce')
+    return aplicar_esquema(derivar_tempo(df1))
+
+
+def carregar_dados(caminho=ARQUIVO_PADRAO, pasta_cache=PASTA_CACHE, manter=()):
+    """Retorna o DataFrame tratado, usando o cache Parquet quando ele existe.
+
+    Na primeira chamada (ou quando o arquivo de origem mudou) o xlsx é lido,
+    tratado e gravado em Parquet. Nas seguintes só o Parquet é lido. Os
+    caches de outras versões do mesmo arquivo são apagados, menos os que
+    estão em `manter`.
+    """
+    destino = caminho_cache(caminho, pasta_cache)
+    if destino.exists():
+        return pd.read_parquet(destino)
+
+    df1 = preparar(ler_origem(caminho))
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    # Remove caches antigos do mesmo arquivo para não acumular lixo em disco.
+    # O prefixo é do caminho, então os caches de outro arquivo com o mesmo
+    # nome ficam intactos.
+    # Um .arrow antigo ainda mapeado por outro processo continua válido até
+    # ser fechado: o unlink só tira o nome do diretório.
+    manter = {Path(arquivo) for arquivo in manter}
+    for sufixo in ('parquet', 'arrow'):
+        for antigo in destino.parent.glob(f'{glob.escape(prefixo_cache(caminho))}-*.{sufixo}'):
+            if antigo not in manter:
+                antigo.unlink(missing_ok=True)
+    # Grava em arquivo temporário e renomeia, assim uma leitura concorrente
+    # nunca encontra um Parquet pela metade
+    temporario = _temporario(destino)
+    try:
+        df1.to_parquet(temporario, index=False)
+        os.replace(temporario, destino)
+    finally:
+        temporario.unlink(missing_ok=True)
+    return df1
+
+
+def publicar_mapa(df1, destino):
+    """Grava `df1` em Arrow IPC sem compressão, pronto para ser mapeado.
+
+    Um único lote com todas as linhas: cada coluna vira um buffer contínuo,
+    que o pandas consegue usar sem copiar.
+    """
+    import pyarrow as pa
+
+    tabela = pa.Table.from_pandas(df1, preserve_index=False)
+    temporario = _temporario(destino)
+    try:
+        with pa.OSFile(str(temporario), 'wb') as arquivo:
+            with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+                escritor.write_table(tabela, max_chunksize=max(len(tabela), 1))
+        os.replace(temporario, destino)
+    finally:
+        temporario.unlink(missing_ok=True)
+
+
+def abrir_mapa(destino):
+    """DataFrame somente leitura sobre o arquivo Arrow mapeado em memória.
+
+    Colunas numéricas sem nulos, datas e textos apontam para o mapeamento;
+    só os inteiros anuláveis (máscara separada) e os códigos das categóricas
+    são copiados para a memória do processo. O mapeamento fica vivo enquanto
+    o DataFrame existir.
+    """
+    import pyarrow as pa
+
+    tabela = pa.ipc.open_file(pa.memory_map(str(destino), 'r')).read_all()
+    return tabela.to_pandas(split_blocks=True)
+
+
+def carregar_compartilhado(caminho=ARQUIVO_PADRAO, pasta_cache=PASTA_CACHE, manter=()):
+    """Como `carregar_dados`, mas devolve o DataFrame mapeado do `.arrow`.
+
+    O primeiro processo a abrir uma versão publica o arquivo; os demais só
+    mapeiam o que já está em disco.
+    """
+    destino = caminho_mapa(caminho, pasta_cache)
+    if not destino.exists():
+        publicar_mapa(carregar_dados(caminho, pasta_cache, manter), destino)
+    return abrir_mapa(destino)
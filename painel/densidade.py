@@ -0,0 +1,137 @@
+"""Redução de densidade para os gráficos que desenhavam todas as linhas.
+
+O violin plot de Clientes (pergunta 5) e o scatter de Satisfação (pergunta 2)
+mandavam cada linha do DataSet para o navegador ou para o matplotlib. Aqui
+os dados são resumidos no servidor antes de chegar ao gráfico:
+
+* violino: KDE calculada sobre um histograma fino (custo linear em uma única
+  passada, depois só o tamanho da grade), quartis para a caixa e uma amostra
+  limitada de pontos por grupo;
+* dispersão: até LIMITE_PONTOS linhas o scatter continua exato; acima disso
+  vira um histograma 2D com número fixo de células.
+
+Em todos os casos o tamanho do que é desenhado não depende do número de linhas.
+"""
+
+import numpy as np
+import pandas as pd
+
+PONTOS_GRADE = 128
+CAIXAS_KDE = 1024
+PONTOS_POR_GRUPO = 300
+LIMITE_PONTOS = 5000
+CAIXAS_2D = (40, 30)
+
+
+def amostra_por_grupo(df, grupo, por_grupo=PONTOS_POR_GRUPO, semente=0):
+    """Amostra aleatória de até `por_grupo` linhas de cada grupo.
+
+    Cada linha recebe uma prioridade aleatória e ficam as menores de cada
+    grupo, o que equivale a um reservatório por grupo e pode ser combinado
+    entre blocos (basta manter de novo as menores prioridades).
+    """
+    prioridade = np.random.default_rng(semente).random(len(df))
+    ordem = np.argsort(prioridade, kind='stable')
+    embaralhado = df.iloc[ordem]
+    return embaralhado[embaralhado.groupby(grupo, observed=True).cumcount() < por_grupo]
+
+
+def _kde_binada(valores, grade):
+    """KDE gaussiana aproximada: histograma fino suavizado por convolução."""
+    n = len(valores)
+    desvio = valores.std(ddof=1) if n > 1 else 0.0
+    if n < 2 or desvio == 0:
+        return np.zeros_like(grade)
+    # Regra de Silverman para a largura de banda
+    banda = 1.06 * desvio * n ** (-1 / 5)
+    contagem, bordas = np.histogram(valores, bins=CAIXAS_KDE, range=(grade[0], grade[-1]))
+    largura_caixa = bordas[1] - bordas[0]
+    meia_janela = int(np.ceil(4 * banda / largura_caixa))
+    deslocamentos = np.arange(-meia_janela, meia_janela + 1) * largura_caixa
+    nucleo = np.exp(-0.5 * (deslocamentos / banda) ** 2)
+    densidade = np.convolve(contagem, nucleo, mode='same')
+    densidade /= densidade.sum() * largura_caixa
+    centros = (bordas[:-1] + bordas[1:]) / 2
+    return np.interp(grade, centros, densidade)
+
+
+def resumo_violino(df, grupo, valor, pontos_grade=PONTOS_GRADE):
+    """Resumo por grupo para desenhar violinos: grade, densidade e quartis.
+
+    Retorna um DataFrame com uma linha por grupo e as colunas `grade`,
+    `densidade` (arrays), `q1`, `mediana`, `q3`, `minimo`, `maximo`, `media` e `n`.
+    """
+    minimo_geral = df[valor].min()
+    maximo_geral = df[valor].max()
+    margem = (maximo_geral - minimo_geral) * 0.05
+    grade = np.linspace(minimo_geral - margem, maximo_geral + margem, pontos_grade)
+
+    linhas = []
+    for nome, valores in df.groupby(grupo, observed=True)[valor]:
+        valores = valores.dropna().to_numpy(dtype='float64')
+        q1, mediana, q3 = np.quantile(valores, [0.25, 0.5, 0.75])
+        linhas.append({
+            grupo: nome,
+            'grade': grade,
+            'densidade': _kde_binada(valores, grade),
+            'q1': q1,
+            'mediana': mediana,
+            'q3': q3,
+            'minimo': valores.min(),
+            'maximo': valores.max(),
+            'media': valores.mean(),
+            'n': len(valores),
+        })
+    return pd.DataFrame(linhas)
+
+
+def figura_violino(resumo, amostra, grupo, valor, titulo):
+    """Monta o violin plot no Plotly a partir do resumo e da amostra de pontos."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    cores = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for posicao, linha in resumo.reset_index(drop=True).iterrows():
+        nome = str(linha[grupo])
+        cor = cores[posicao % len(cores)]
+        pico = linha['densidade'].max()
+        largura = 0.4 * linha['densidade'] / pico if pico > 0 else linha['densidade']
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([posicao - largura, (posicao + largura)[::-1]]),
+            y=np.concatenate([linha['grade'], linha['grade'][::-1]]),
+            fill='toself', mode='lines', line=dict(color=cor, width=1),
+            opacity=0.5, name=nome, legendgroup=nome, hoverinfo='skip',
+        ))
+        fig.add_trace(go.Box(
+            x=[posicao], q1=[linha['q1']], median=[linha['mediana']], q3=[linha['q3']],
+            lowerfence=[linha['minimo']], upperfence=[linha['maximo']], mean=[linha['media']],
+            width=0.08, marker_color=cor, line_color=cor, showlegend=False,
+            legendgroup=nome, name=nome,
+        ))
+        pontos = amostra.loc[amostra[grupo] == linha[grupo], valor].to_numpy()
+        deslocamento = np.random.default_rng(posicao).uniform(-0.25, 0.25, len(pontos))
+        fig.add_trace(go.Scatter(
+            x=posicao + deslocamento, y=pontos, mode='markers',
+            marker=dict(color=cor, size=4, opacity=0.5), showlegend=False,
+            legendgroup=nome, name=nome,
+        ))
+
+    fig.update_layout(
+        title=titulo,
+        xaxis=dict(
+            title=grupo, tickmode='array',
+            tickvals=list(range(len(resumo))), ticktext=[str(n) for n in resumo[grupo]],
+        ),
+        yaxis_title=valor,
+        legend_title=grupo,
+    )
+    return fig
+
+
+def histograma_2d(x, y, caixas=CAIXAS_2D):
+    """Contagens de um histograma 2D e as bordas de cada eixo."""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    validos = ~(np.isnan(x) | np.isnan(y))
+    return np.histogram2d(x[validos], y[validos], bins=caixas)
@@ -0,0 +1,130 @@
+"""Filtros globais da barra lateral (período, filial, cidade, tipo de cliente e pagamento).
+
+Aplicar os filtros com uma máscara booleana sobre o DataFrame inteiro a
+cada rerun custa uma varredura completa por filtro. Aqui os índices são
+montados uma vez por versão dos dados:
+
+* para cada valor de cada dimensão filtrável, um bitmap (bits empacotados
+  com `np.packbits`, 1 bit por linha) das linhas que têm aquele valor;
+* as posições das linhas ordenadas por data, para que um período vire um
+  intervalo achado por busca binária.
+
+Combinar filtros é um OU entre os bitmaps dos valores escolhidos de cada
+dimensão e um E entre as dimensões, feitos sobre bytes (8 linhas por
+operação). Só as linhas selecionadas são copiadas e agregadas depois.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DIMENSOES_FILTRO = ['Branch', 'City', 'Customer type', 'Payment']
+ROTULOS = {
+    'Branch': 'Filial',
+    'City': 'Cidade',
+    'Customer type': 'Tipo de cliente',
+    'Payment': 'Pagamento',
+}
+
+
+class Filtros(NamedTuple):
+    # Período fechado [inicio, fim]; None nos dois é o período inteiro
+    inicio: object = None
+    fim: object = None
+    # Tupla de (dimensão, tupla de valores), hashável para servir de chave de cache
+    dimensoes: tuple = ()
+
+    @property
+    def ativo(self):
+        return self.inicio is not None or self.fim is not None or any(valores for _, valores in self.dimensoes)
+
+    def chave(self, chave_dados):
+        """Chave da visão filtrada, usada no lugar de `chave_dados` nos caches das páginas."""
+        if not self.ativo:
+            return chave_dados
+        return f'{chave_dados}-{hashlib.sha256(repr(tuple(self)).encode("utf-8")).hexdigest()[:12]}'
+
+
+class IndiceFiltros:
+    """Bitmaps por valor e índice de datas ordenado de um DataFrame tratado."""
+
+    def __init__(self, df1):
+        self.linhas = len(df1)
+        self.bitmaps = {}
+        for dimensao in DIMENSOES_FILTRO:
+            coluna = df1[dimensao].astype('category')
+            codigos = coluna.cat.codes.to_numpy()
+            self.bitmaps[dimensao] = {
+                valor: np.packbits(codigos == codigo)
+                for codigo, valor in enumerate(coluna.cat.categories)
+            }
+
+        datas = df1['Date'].to_numpy()
+        validas = np.flatnonzero(~np.isnat(datas))
+        self.ordem_datas = validas[np.argsort(datas[validas], kind='stable')]
+        self.datas_ordenadas = datas[self.ordem_datas]
+
+    def valores(self, dimensao):
+        return list(self.bitmaps[dimensao])
+
+    def periodo(self):
+        """(primeira, última) data do DataSet, ou (None, None) sem datas válidas."""
+        if not len(self.datas_ordenadas):
+            return None, None
+        return pd.Timestamp(self.datas_ordenadas[0]).date(), pd.Timestamp(self.datas_ordenadas[-1]).date()
+
+    def _bitmap_periodo(self, inicio, fim):
+        # O fim é inclusivo: tudo antes da meia-noite do dia seguinte
+        a = 0 if inicio is None else np.searchsorted(self.datas_ordenadas, np.datetime64(pd.Timestamp(inicio)), 'left')
+        b = len(self.datas_ordenadas) if fim is None else np.searchsorted(
+            self.datas_ordenadas, np.datetime64(pd.Timestamp(fim) + pd.Timedelta(days=1)), 'left')
+        mascara = np.zeros(self.linhas, dtype=bool)
+        mascara[self.ordem_datas[a:b]] = True
+        return np.packbits(mascara)
+
+    def selecionar(self, filtros):
+        """Posições (crescentes) das linhas que passam em todos os filtros.
+
+        Retorna None quando nenhum filtro está ativo, para o chamador usar o
+        DataFrame inteiro sem cópia.
+        """
+        if not filtros.ativo:
+            return None
+        bits = None
+        if filtros.inicio is not None or filtros.fim is not None:
+            bits = self._bitmap_periodo(filtros.inicio, filtros.fim)
+        for dimensao, valores in filtros.dimensoes:
+            if not valores:
+                continue
+            vazio = np.zeros((self.linhas + 7) // 8, dtype=np.uint8)
+            uniao = np.bitwise_or.reduce([self.bitmaps[dimensao].get(v, vazio) for v in valores])
+            bits = uniao if bits is None else bits & uniao
+        return np.flatnonzero(np.unpackbits(bits, count=self.linhas))
+
+
+def mostrar_filtros(indice):
+    """Desenha os filtros na barra lateral e devolve os `Filtros` escolhidos."""
+    st.sidebar.markdown('### Filtros')
+    primeira, ultima = indice.periodo()
+    inicio = fim = None
+    if primeira is not None:
+        periodo = st.sidebar.date_input(
+            'Período', value=(primeira, ultima), min_value=primeira, max_value=ultima, key='filtro_periodo',
+        )
+        # Durante a escolha do intervalo o widget devolve só a primeira data
+        if isinstance(periodo, (tuple, list)) and len(periodo) == 2:
+            inicio, fim = periodo
+        # O período inteiro equivale a não filtrar (e mantém as linhas sem data)
+        if (inicio, fim) == (primeira, ultima):
+            inicio = fim = None
+
+    dimensoes = []
+    for dimensao in DIMENSOES_FILTRO:
+        escolhidos = st.sidebar.multiselect(
+            ROTULOS[dimensao], indice.valores(dimensao), key=f'filtro_{dimensao}', placeholder='Todos',
+        )
+        dimensoes.append((dimensao, tuple(escolhidos)))
+    return Filtros(inicio, fim, tuple(dimensoes))
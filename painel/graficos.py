@@ -0,0 +1,88 @@
+"""Cache de gráficos matplotlib já renderizados.
+
+Cada `plt.subplots` cria uma Figure nova a cada rerun e a rasterização é a
+parte mais cara da página. Aqui o gráfico é desenhado só quando a chave
+(página, pergunta, versão dos dados, tema) ainda não está no cache; o
+resultado é guardado como bytes PNG/SVG e a Figure é fechada logo em
+seguida, então nenhuma figura fica aberta entre reruns.
+
+Os desenhos das páginas usam a interface de estado do pyplot (figura atual,
+`plt.xticks`, `plt.tight_layout`) e o tema é aplicado nos `rcParams`; os
+dois são globais do processo. Por isso todo desenho e toda renderização
+passam pela mesma trava (`_TRAVA_DESENHO`), senão duas sessões desenhando
+ao mesmo tempo podiam trocar de tema ou desenhar uma na figura da outra.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+TEMA = 'dark_background'
+MAXIMO_FIGURAS = 64
+
+_TRAVA_DESENHO = threading.Lock()
+
+
+def renderizar(fig, formato='png', dpi=150):
+    """Salva a figura em bytes e fecha a Figure, mesmo se o savefig falhar."""
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight',
+                    facecolor=fig.get_facecolor())
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def renderizar_desenho(desenhar, tema=TEMA):
+    """Chama `desenhar()` no tema do app e devolve PNG (matplotlib) ou JSON (plotly)."""
+    with _TRAVA_DESENHO, plt.style.context(tema):
+        figura = desenhar()
+        if hasattr(figura, 'savefig'):
+            return renderizar(figura)
+    return figura.to_json()
+
+
+class CacheFiguras:
+    """Cache LRU de imagens renderizadas, seguro para várias sessões ao mesmo tempo."""
+
+    def __init__(self, maximo=MAXIMO_FIGURAS):
+        self.maximo = maximo
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, pagina, pergunta, chave_dados, desenhar, tema=TEMA, formato='png'):
+        """Retorna os bytes da imagem, chamando `desenhar()` só quando ela não está em cache.
+
+        `desenhar` deve criar e devolver a Figure; ela é renderizada e fechada aqui.
+        """
+        chave = (pagina, pergunta, chave_dados, tema, formato)
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+
+        # Fora da trava do cache, para não bloquear as sessões que só leem
+        # imagens prontas; a do pyplot serializa só quem está desenhando
+        with _TRAVA_DESENHO, plt.style.context(tema):
+            imagem = renderizar(desenhar(), formato)
+
+        with self._trava:
+            self.falhas += 1
+            self._itens[chave] = imagem
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maximo:
+                self._itens.popitem(last=False)
+        return imagem
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
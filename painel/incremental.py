@@ -0,0 +1,146 @@
+"""Modo incremental: anexa lotes novos de vendas sem recalcular o histórico.
+
+O estado persistido fica em um único arquivo SQLite com duas tabelas:
+
+* `notas`: os `Invoice ID` já agregados (chave primária), usados para
+  descartar notas repetidas;
+* `cubo`: o cubo de agregação acumulado (ver painel.cubo), gravado como
+  Parquet em um blob.
+
+Cada lote vira um cubo parcial que é combinado ao acumulado com
+`combinar_cubos`, inclusive o M2 usado no desvio padrão por hora. As duas
+tabelas são atualizadas na mesma transação, então uma falha no meio do
+caminho nunca deixa notas registradas sem a agregação correspondente. O custo
+de cada atualização depende do tamanho do lote, não do histórico.
+
+O app lê o cubo do estado com PAINEL_ESTADO=<arquivo> (ver
+painel.atualizacao): as perguntas de negócio passam a incluir os lotes
+anexados sem que o xlsx seja regravado, e cada anexação vira uma versão
+nova dos dados no app.
+
+Uso pela linha de comando:
+
+    python -m painel.incremental estado.sqlite vendas_2019-04-01.csv
+"""
+
+import argparse
+import io
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from painel.cubo import combinar_cubos, construir_cubo
+from painel.dados import preparar
+from painel.ingestao import TAMANHO_BLOCO, ler_em_blocos
+
+
+class EstadoIncremental:
+    """Cubo acumulado mais o conjunto de notas já vistas, persistidos em SQLite."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho)
+        self._conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS notas (id TEXT PRIMARY KEY) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS cubo (
+                versao INTEGER PRIMARY KEY CHECK (versao = 1),
+                conteudo BLOB NOT NULL,
+                linhas INTEGER NOT NULL
+            );
+        ''')
+
+    def fechar(self):
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+    @property
+    def cubo(self):
+        """Cubo acumulado até agora (None se nada foi anexado)."""
+        linha = self._conexao.execute('SELECT conteudo FROM cubo').fetchone()
+        if linha is None:
+            return None
+        return pd.read_parquet(io.BytesIO(linha[0]))
+
+    @property
+    def linhas(self):
+        linha = self._conexao.execute('SELECT linhas FROM cubo').fetchone()
+        return 0 if linha is None else linha[0]
+
+    def _notas_novas(self, ids):
+        """Filtra de `ids` as notas que ainda não estão no estado."""
+        self._conexao.execute('CREATE TEMP TABLE IF NOT EXISTS lote (id TEXT PRIMARY KEY)')
+        self._conexao.execute('DELETE FROM lote')
+        self._conexao.executemany('INSERT OR IGNORE INTO lote VALUES (?)', ((i,) for i in ids))
+        novas = self._conexao.execute(
+            'SELECT id FROM lote WHERE id NOT IN (SELECT id FROM notas)'
+        ).fetchall()
+        return {i for (i,) in novas}
+
+    def anexar(self, lote):
+        """Agrega as linhas novas de `lote` (DataFrame bruto) ao estado.
+
+        Notas repetidas, dentro do lote ou já vistas antes, são descartadas.
+        Retorna o número de linhas efetivamente anexadas.
+        """
+        lote = lote.dropna(subset=['Invoice ID']).drop_duplicates('Invoice ID')
+        lote = lote.assign(**{'Invoice ID': lote['Invoice ID'].astype(str)})
+        with self._conexao:
+            novas = self._notas_novas(lote['Invoice ID'])
+            lote = lote[lote['Invoice ID'].isin(novas)]
+            if lote.empty:
+                return 0
+
+            cubo = combinar_cubos(self.cubo, construir_cubo(preparar(lote)))
+            buffer = io.BytesIO()
+            cubo.to_parquet(buffer, index=False)
+
+            self._conexao.executemany('INSERT INTO notas VALUES (?)', ((i,) for i in lote['Invoice ID']))
+            self._conexao.execute(
+                'INSERT OR REPLACE INTO cubo (versao, conteudo, linhas) VALUES (1, ?, ?)',
+                (buffer.getvalue(), self.linhas + len(lote)),
+            )
+        return len(lote)
+
+    def anexar_arquivo(self, caminho, tamanho_bloco=TAMANHO_BLOCO):
+        """Anexa um arquivo xlsx/csv/parquet inteiro, lido em blocos."""
+        return sum(self.anexar(bloco) for bloco in ler_em_blocos(caminho, tamanho_bloco))
+
+
+def ler_estado(caminho):
+    """`(cubo, linhas)` gravados em `caminho`, abrindo o SQLite só para leitura.
+
+    Quem só lê (o app) não cria as tabelas nem segura trava de escrita; o
+    cubo e as linhas saem da mesma linha, então são sempre da mesma anexação.
+    """
+    conexao = sqlite3.connect(f'{Path(caminho).resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        linha = conexao.execute('SELECT conteudo, linhas FROM cubo').fetchone()
+    finally:
+        conexao.close()
+    if linha is None:
+        return None, 0
+    return pd.read_parquet(io.BytesIO(linha[0])), linha[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Anexa arquivos de vendas ao estado agregado.')
+    parser.add_argument('estado', help='arquivo SQLite com o estado acumulado')
+    parser.add_argument('arquivos', nargs='+', help='arquivos .xlsx, .csv ou .parquet a anexar')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco')
+    args = parser.parse_args(argv)
+
+    with EstadoIncremental(args.estado) as estado:
+        for arquivo in args.arquivos:
+            anexadas = estado.anexar_arquivo(arquivo, args.bloco)
+            print(f'{arquivo}: {anexadas} linhas novas')
+        print(f'Total no estado: {estado.linhas} linhas')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Ingestão em blocos para arquivos de vendas maiores que a memória.
+
+Em vez de carregar o arquivo inteiro em um DataFrame, as linhas são lidas em
+blocos de tamanho fixo (openpyxl em modo read-only para xlsx, `chunksize`
+para CSV e row groups/batches para Parquet). Cada bloco é tratado e reduzido
+a um cubo parcial (ver painel.cubo), que é combinado ao acumulado. A memória
+de pico fica limitada pelo tamanho do bloco mais o tamanho do cubo, que só
+depende da cardinalidade das dimensões.
+
+Uso pela linha de comando:
+
+    python -m painel.ingestao vendas.csv --bloco 200000 --saida cubo.parquet
+"""
+
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from painel.cubo import combinar_cubos, construir_cubo
+from painel.dados import preparar
+
+TAMANHO_BLOCO = 100_000
+
+
+def _blocos_xlsx(caminho, tamanho_bloco):
+    from openpyxl import load_workbook
+
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = livro.active.iter_rows(values_only=True)
+        # next() sem padrão numa planilha vazia vira RuntimeError dentro do gerador
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        colunas = list(cabecalho)
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) >= tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=colunas)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=colunas)
+    finally:
+        livro.close()
+
+
+def _blocos_parquet(caminho, tamanho_bloco):
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(caminho)
+    for lote in arquivo.iter_batches(batch_size=tamanho_bloco):
+        yield lote.to_pandas()
+
+
+def ler_em_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera DataFrames brutos com no máximo `tamanho_bloco` linhas cada."""
+    sufixo = Path(caminho).suffix.lower()
+    if sufixo == '.xlsx':
+        yield from _blocos_xlsx(caminho, tamanho_bloco)
+    elif sufixo == '.csv':
+        yield from pd.read_csv(caminho, chunksize=tamanho_bloco)
+    elif sufixo == '.parquet':
+        yield from _blocos_parquet(caminho, tamanho_bloco)
+    else:
+        raise ValueError(f'Formato de arquivo não suportado: {caminho}')
+
+
+def agregar_blocos(blocos):
+    """Reduz uma sequência de blocos brutos a um único cubo de agregação.
+
+    Retorna `(cubo, linhas_lidas)`.
+    """
+    cubo = None
+    linhas = 0
+    for bloco in blocos:
+        linhas += len(bloco)
+        cubo = combinar_cubos(cubo, construir_cubo(preparar(bloco)))
+    return cubo, linhas
+
+
+def ingerir(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê `caminho` em blocos e devolve `(cubo, linhas_lidas)`."""
+    return agregar_blocos(ler_em_blocos(caminho, tamanho_bloco))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Agrega um arquivo de vendas em blocos.')
+    parser.add_argument('arquivo', help='arquivo .xlsx, .csv ou .parquet')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco')
+    parser.add_argument('--saida', help='grava o cubo resultante neste arquivo Parquet')
+    args = parser.parse_args(argv)
+
+    cubo, linhas = ingerir(args.arquivo, args.bloco)
+    print(f'{linhas} linhas lidas, {0 if cubo is None else len(cubo)} células no cubo')
+    if args.saida and cubo is not None:
+        cubo.to_parquet(args.saida, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Mede o tempo de inicialização a frio do dashboard, página por página.
+
+Cada medição roda em um interpretador novo, então inclui todo o custo de
+importação que um worker recém-criado paga: a base (streamlit e os módulos
+de dados) e o módulo da página com o backend de gráficos que ele usa.
+
+    python -m painel.inicializacao --repeticoes 5 --salvar inicializacao.json
+    python -m painel.inicializacao --comparar inicializacao.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from painel.paginas import PAGINAS
+
+BASE = ['streamlit', 'painel.recursos']
+
+_CODIGO = '''
+import importlib, time
+inicio = time.perf_counter()
+for modulo in {modulos!r}:
+    importlib.import_module(modulo)
+print(time.perf_counter() - inicio)
+'''
+
+
+def medir_importacao(modulos):
+    """Segundos para importar `modulos` em um processo Python novo."""
+    saida = subprocess.run(
+        [sys.executable, '-c', _CODIGO.format(modulos=list(modulos))],
+        check=True, capture_output=True, text=True,
+    )
+    return float(saida.stdout.strip().splitlines()[-1])
+
+
+def medir(repeticoes=3):
+    """Mediana do tempo de importação da base e de cada página (base + página)."""
+    resultados = {'(base)': statistics.median(medir_importacao(BASE) for _ in range(repeticoes))}
+    for nome, modulo in PAGINAS.items():
+        tempos = [medir_importacao(BASE + [modulo]) for _ in range(repeticoes)]
+        resultados[nome] = statistics.median(tempos)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mede o tempo de inicialização por página.')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--salvar', help='grava os tempos medidos neste JSON')
+    parser.add_argument('--comparar', help='JSON com tempos de referência')
+    args = parser.parse_args(argv)
+
+    resultados = medir(args.repeticoes)
+    referencia = {}
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo)
+
+    for nome, segundos in resultados.items():
+        linha = f'{nome:<20} {segundos * 1000:8.1f} ms'
+        if nome in referencia:
+            linha += f'  ({(segundos / referencia[nome] - 1) * 100:+.1f}% vs referência)'
+        print(linha)
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
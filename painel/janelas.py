@@ -0,0 +1,149 @@
+"""Índice temporal por somas acumuladas, para métricas de janelas de datas.
+
+Cada janela de datas (um período escolhido no slider, ou os últimos 7 dias
+de cada dia numa média móvel) seria um novo groupby sobre o DataFrame
+inteiro. O `IndiceTemporal` agrega as vendas uma única vez em intervalos
+contínuos de um dia (ou de uma hora) por valor de uma dimensão e guarda, para
+cada medida, as somas acumuladas da contagem, da soma e da soma dos
+quadrados. O agregado de qualquer janela [a, b) é então `P[b] - P[a]`:
+
+* total, média e desvio padrão de uma janela custam O(1) por grupo,
+  qualquer que seja o tamanho do DataSet ou da janela;
+* uma série móvel inteira é a diferença entre dois recortes dos acumulados,
+  calculada de uma vez pelo NumPy.
+
+As somas dos quadrados são acumuladas em torno da média geral de cada
+medida (a variância não muda com o deslocamento), o que evita o
+cancelamento numérico de subtrair dois acumulados grandes.
+"""
+
+import numpy as np
+import pandas as pd
+
+TODAS = 'Todas'
+GRANULARIDADES = {'D': 1, 'h': 24}
+
+
+class IndiceTemporal:
+    """Somas acumuladas por intervalo de tempo e valor de `dimensao`.
+
+    A linha `TODAS` junta todos os valores da dimensão. Linhas sem data (ou
+    sem hora, na granularidade horária) ficam de fora.
+    """
+
+    def __init__(self, df1, dimensao='Branch', medidas=('Total', 'gross income'), granularidade='D'):
+        self.dimensao = dimensao
+        self.granularidade = granularidade
+        self.por_dia = GRANULARIDADES[granularidade]
+
+        dias = df1['Date'].to_numpy().astype('datetime64[D]')
+        validas = ~np.isnat(dias)
+        if self.por_dia > 1:
+            horas = df1['Hour']
+            validas &= horas.notna().to_numpy()
+            horas = horas.fillna(0).to_numpy('int64')
+        dias_validos = dias[validas]
+        self.inicio = dias_validos.min() if len(dias_validos) else np.datetime64('1970-01-01', 'D')
+        fim = dias_validos.max() if len(dias_validos) else self.inicio - 1
+        self.intervalos = (int((fim - self.inicio).astype('int64')) + 1) * self.por_dia
+
+        posicao = (dias - self.inicio).astype('int64') * self.por_dia
+        if self.por_dia > 1:
+            posicao = posicao + horas
+        grupo = df1[dimensao].astype('category').cat.remove_unused_categories()
+        codigos = grupo.cat.codes.to_numpy()
+        validas &= codigos >= 0
+        self.grupos = list(grupo.cat.categories) + [TODAS]
+
+        # Cada linha entra no próprio grupo e no grupo TODAS
+        quantidade = len(self.grupos)
+        celula = np.concatenate([codigos[validas], np.full(validas.sum(), quantidade - 1)]) * self.intervalos
+        celula = celula + np.tile(posicao[validas], 2)
+        tamanho = quantidade * self.intervalos
+
+        def acumular(pesos=None):
+            contagem = np.bincount(celula, pesos, minlength=tamanho).reshape(quantidade, self.intervalos)
+            acumulado = np.zeros((quantidade, self.intervalos + 1))
+            np.cumsum(contagem, axis=1, out=acumulado[:, 1:])
+            return acumulado
+
+        self.contagem = acumular()
+        # Por medida, porque valores ausentes não contam na média dela
+        self.contagem_medida = {}
+        self.centro = {}
+        self.soma = {}
+        self.soma_quadrados = {}
+        for medida in medidas:
+            valores = df1[medida].to_numpy('float64', na_value=np.nan)[validas]
+            presentes = ~np.isnan(valores)
+            self.centro[medida] = float(valores[presentes].mean()) if presentes.any() else 0.0
+            desvio = np.where(presentes, valores - self.centro[medida], 0.0)
+            self.soma[medida] = acumular(np.tile(desvio, 2))
+            self.soma_quadrados[medida] = acumular(np.tile(desvio ** 2, 2))
+            self.contagem_medida[medida] = acumular(np.tile(presentes.astype('float64'), 2))
+
+    def periodo(self):
+        """(primeira, última) data coberta pelo índice."""
+        ultima = self.inicio + (self.intervalos // self.por_dia - 1)
+        return pd.Timestamp(self.inicio).date(), pd.Timestamp(ultima).date()
+
+    def rotulos(self):
+        """Instante de início de cada intervalo do índice."""
+        passo = np.timedelta64(24 // self.por_dia, 'h')
+        return pd.DatetimeIndex(self.inicio.astype('datetime64[h]') + passo * np.arange(self.intervalos))
+
+    def _posicao(self, data):
+        """Posição do primeiro intervalo de `data` (date ou Timestamp), limitada ao índice."""
+        dias = int((np.datetime64(pd.Timestamp(data).date(), 'D') - self.inicio).astype('int64'))
+        return int(np.clip(dias * self.por_dia, 0, self.intervalos))
+
+    def _estatistica(self, a, b, medida, estatistica):
+        """Estatística dos intervalos [a, b) de cada grupo; `a` e `b` podem ser vetores."""
+        if estatistica == 'linhas':
+            return self.contagem[:, b] - self.contagem[:, a]
+        n = self.contagem_medida[medida][:, b] - self.contagem_medida[medida][:, a]
+        if estatistica == 'count':
+            return n
+        soma = self.soma[medida][:, b] - self.soma[medida][:, a]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if estatistica == 'sum':
+                return soma + n * self.centro[medida]
+            if estatistica == 'mean':
+                return np.where(n > 0, soma / n + self.centro[medida], np.nan)
+            if estatistica == 'std':
+                quadrados = self.soma_quadrados[medida][:, b] - self.soma_quadrados[medida][:, a]
+                variancia = (quadrados - soma ** 2 / n) / (n - 1)
+                return np.where(n > 1, np.sqrt(np.clip(variancia, 0.0, None)), np.nan)
+        raise ValueError(f'Estatística não suportada: {estatistica}')
+
+    def janela(self, inicio, fim, medida, estatistica='sum'):
+        """Estatística de `medida` de cada grupo entre as datas `inicio` e `fim` (inclusivas)."""
+        a = self._posicao(inicio)
+        b = self._posicao(pd.Timestamp(fim) + pd.Timedelta(days=1))
+        return pd.Series(self._estatistica(a, b, medida, estatistica), index=self.grupos, name=medida)
+
+    def movel(self, medida, largura, estatistica='sum', inicio=None, fim=None, centrada=False):
+        """Série móvel: a estatística dos `largura` intervalos que terminam em cada intervalo.
+
+        Com `centrada` a janela fica em volta do intervalo, com o mesmo
+        alinhamento do `rolling(center=True)` do pandas. Retorna um DataFrame
+        com um intervalo por linha e um grupo por coluna, restrito às datas
+        entre `inicio` e `fim`. Intervalos cuja janela sai do índice ficam NaN.
+        """
+        a = 0 if inicio is None else self._posicao(inicio)
+        b = self.intervalos if fim is None else self._posicao(pd.Timestamp(fim) + pd.Timedelta(days=1))
+        fins = np.arange(a, b) + 1
+        if centrada:
+            fins = fins + (largura - 1) // 2
+        comecos = fins - largura
+        completos = (comecos >= 0) & (fins <= self.intervalos)
+        valores = self._estatistica(
+            np.clip(comecos, 0, self.intervalos), np.clip(fins, 0, self.intervalos), medida, estatistica,
+        ).astype('float64')
+        valores[:, ~completos] = np.nan
+        return pd.DataFrame(valores.T, index=self.rotulos()[a:b], columns=self.grupos)
+
+    def media_movel(self, medida, dias, inicio=None, fim=None, centrada=False):
+        """Média móvel de `dias` dias do total de `medida` por dia (ou por hora, no índice horário)."""
+        largura = dias * self.por_dia
+        return self.movel(medida, largura, 'sum', inicio, fim, centrada) / largura
@@ -0,0 +1,230 @@
+"""Instrumentação de desempenho do dashboard.
+
+Um `Medidor` é criado a cada rerun e cada parte da página (carga, agregação
+de cada pergunta, cada gráfico e cada tabela) roda dentro de
+`medidor.secao(...)`, que registra o tempo de parede. Com `detalhado=True`
+as seções podem anotar o tamanho do que foi enviado ao navegador em
+`payload_bytes`.
+
+O pico de memória por seção usa o tracemalloc, que deixa toda alocação do
+processo mais lenta e só mede o processo inteiro (as sessões são threads do
+mesmo processo). Por isso ele é ligado só com PAINEL_TRACEMALLOC=1 no
+ambiente, para o processo todo, e o `pico_bytes` de uma seção é o pico das
+alocações de todas as sessões enquanto ela rodava. O pico só é zerado
+quando nenhuma seção medida está aberta, para uma sessão não apagar o pico
+que outra está medindo.
+
+O `Historico` guarda os últimos reruns do processo, exportados como JSON,
+e os totais de tempo por página e por seção desde o início do processo,
+exportados no formato texto do Prometheus (para o textfile collector do
+node_exporter) junto com a memória residente do processo separada em
+privada e compartilhada (`memoria_processo`).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+MAXIMO_RERUNS = 500
+TRACEMALLOC = os.environ.get('PAINEL_TRACEMALLOC') == '1'
+
+# Seções com memória medida abertas agora, em todas as sessões
+_secoes_abertas = 0
+_trava_memoria = threading.Lock()
+
+
+def _abrir_secao_memoria():
+    global _secoes_abertas
+    with _trava_memoria:
+        if _secoes_abertas == 0:
+            tracemalloc.reset_peak()
+        _secoes_abertas += 1
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _fechar_secao_memoria(base):
+    global _secoes_abertas
+    with _trava_memoria:
+        _secoes_abertas -= 1
+        return max(0, tracemalloc.get_traced_memory()[1] - base)
+
+
+class Medidor:
+    """Coleta os registros de tempo, memória e payload de um rerun."""
+
+    def __init__(self, detalhado=False):
+        self.detalhado = detalhado
+        self.registros = []
+        self.memoria = detalhado and TRACEMALLOC
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def secao(self, nome, tipo):
+        """Mede o bloco `with`; o dicionário devolvido aceita `payload_bytes`."""
+        registro = {'secao': nome, 'tipo': tipo, 'segundos': None, 'pico_bytes': None, 'payload_bytes': None}
+        memoria = self.memoria and tracemalloc.is_tracing()
+        if memoria:
+            base = _abrir_secao_memoria()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro['segundos'] = time.perf_counter() - inicio
+            if memoria:
+                registro['pico_bytes'] = _fechar_secao_memoria(base)
+            self.registros.append(registro)
+
+
+def memoria_processo(pid='self'):
+    """Memória residente do processo `pid` em bytes, por tipo, ou None fora do Linux.
+
+    `privada` é a memória anônima (só deste processo); `compartilhada` são
+    as páginas de arquivos mapeados, como o .arrow de painel.dados, que
+    ficam no cache do sistema e são divididas entre os processos.
+    """
+    campos = {'RssAnon': 'privada', 'RssFile': 'compartilhada', 'RssShmem': 'compartilhada'}
+    memoria = {'privada': 0, 'compartilhada': 0}
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as arquivo:
+            for linha in arquivo:
+                campo, _, valor = linha.partition(':')
+                if campo in campos:
+                    memoria[campos[campo]] += int(valor.split()[0]) * 1024
+    except OSError:
+        return None
+    return memoria
+
+
+def _rotulos(**valores):
+    escapados = []
+    for chave, valor in valores.items():
+        texto = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escapados.append(f'{chave}="{texto}"')
+    return '{' + ','.join(escapados) + '}'
+
+
+def _acumular(totais, chave, valor):
+    soma, quantidade = totais.get(chave, (0.0, 0))
+    totais[chave] = (soma + valor, quantidade + 1)
+
+
+class Historico:
+    """Últimos reruns e totais acumulados do processo, compartilhado entre as sessões."""
+
+    def __init__(self, maximo=MAXIMO_RERUNS):
+        # Só os últimos reruns, para o painel e a exportação em JSON
+        self._reruns = deque(maxlen=maximo)
+        # Somas e contagens desde o início do processo, nunca descartadas:
+        # _sum e _count do Prometheus precisam crescer sempre para que
+        # rate() e increase() funcionem
+        self._por_pagina = {}
+        self._cpu_por_pagina = {}
+        self._por_secao = {}
+        self._ultimos = {}
+        # Reentrante: gravar_prometheus monta o texto e grava sob a mesma trava
+        self._trava = threading.RLock()
+
+    def registrar(self, pagina, segundos, medidor, cpu_segundos=None):
+        """Guarda um rerun; `cpu_segundos` é o tempo de CPU da thread do script."""
+        rerun = {
+            'pagina': pagina,
+            'instante': time.time(),
+            'segundos': segundos,
+            'cpu_segundos': cpu_segundos,
+            'secoes': list(medidor.registros),
+        }
+        with self._trava:
+            self._reruns.append(rerun)
+            _acumular(self._por_pagina, pagina, segundos)
+            if cpu_segundos is not None:
+                _acumular(self._cpu_por_pagina, pagina, cpu_segundos)
+            for registro in rerun['secoes']:
+                chave = (pagina, registro['secao'], registro['tipo'])
+                _acumular(self._por_secao, chave, registro['segundos'])
+                self._ultimos[chave] = registro
+        return rerun
+
+    def reruns(self):
+        with self._trava:
+            return list(self._reruns)
+
+    def para_json(self):
+        return json.dumps(self.reruns(), indent=2, ensure_ascii=False)
+
+    def para_prometheus(self):
+        """Resumo de todos os reruns do processo no formato de exposição do Prometheus."""
+        with self._trava:
+            por_pagina = dict(self._por_pagina)
+            cpu_por_pagina = dict(self._cpu_por_pagina)
+            por_secao = dict(self._por_secao)
+            ultimos = dict(self._ultimos)
+
+        linhas = [
+            '# HELP painel_rerun_segundos Tempo total de cada rerun por página.',
+            '# TYPE painel_rerun_segundos summary',
+        ]
+        for pagina, (soma, quantidade) in por_pagina.items():
+            linhas.append(f'painel_rerun_segundos_sum{_rotulos(pagina=pagina)} {soma:.6f}')
+            linhas.append(f'painel_rerun_segundos_count{_rotulos(pagina=pagina)} {quantidade}')
+
+        linhas += [
+            '# HELP painel_rerun_cpu_segundos Tempo de CPU da thread do script em cada rerun, por página.',
+            '# TYPE painel_rerun_cpu_segundos summary',
+        ]
+        for pagina, (soma, quantidade) in cpu_por_pagina.items():
+            linhas.append(f'painel_rerun_cpu_segundos_sum{_rotulos(pagina=pagina)} {soma:.6f}')
+            linhas.append(f'painel_rerun_cpu_segundos_count{_rotulos(pagina=pagina)} {quantidade}')
+
+        linhas += [
+            '# HELP painel_secao_segundos Tempo de cada seção (carga, agregação, gráfico, tabela).',
+            '# TYPE painel_secao_segundos summary',
+        ]
+        for (pagina, secao, tipo), (soma, quantidade) in por_secao.items():
+            rotulos = _rotulos(pagina=pagina, secao=secao, tipo=tipo)
+            linhas.append(f'painel_secao_segundos_sum{rotulos} {soma:.6f}')
+            linhas.append(f'painel_secao_segundos_count{rotulos} {quantidade}')
+
+        for campo, descricao in [
+            ('pico_bytes', 'Pico de memória alocada no processo (todas as sessões) durante a última '
+                           'execução da seção; só com PAINEL_TRACEMALLOC=1.'),
+            ('payload_bytes', 'Bytes enviados ao navegador na última execução da seção.'),
+        ]:
+            linhas += [f'# HELP painel_secao_{campo} {descricao}', f'# TYPE painel_secao_{campo} gauge']
+            for (pagina, secao, tipo), registro in ultimos.items():
+                if registro[campo] is not None:
+                    rotulos = _rotulos(pagina=pagina, secao=secao, tipo=tipo)
+                    linhas.append(f'painel_secao_{campo}{rotulos} {registro[campo]}')
+
+        memoria = memoria_processo()
+        if memoria is not None:
+            linhas += [
+                '# HELP painel_memoria_bytes Memória residente do processo (privada ou compartilhada).',
+                '# TYPE painel_memoria_bytes gauge',
+            ]
+            for tipo, valor in memoria.items():
+                linhas.append(f'painel_memoria_bytes{_rotulos(tipo=tipo)} {valor}')
+        return '\n'.join(linhas) + '\n'
+
+    def gravar_prometheus(self, caminho):
+        """Grava o textfile de forma atômica, para o coletor nunca ler pela metade.
+
+        Cada sessão é uma thread do mesmo processo, então o temporário tem
+        nome único e a montagem e a troca ficam sob a trava: um rerun nunca
+        substitui o arquivo por um retrato mais antigo que o já gravado.
+        """
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        with self._trava:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=pasta, prefix=f'{os.path.basename(caminho)}.',
+                                             suffix='.tmp', delete=False) as arquivo:
+                arquivo.write(self.para_prometheus())
+            try:
+                os.replace(arquivo.name, caminho)
+            except BaseException:
+                os.unlink(arquivo.name)
+                raise
@@ -0,0 +1,212 @@
+"""Motores de consulta para as perguntas de negócio.
+
+As páginas descrevem cada pergunta como uma `Consulta` e não sabem onde ela
+é executada. A fonte padrão é o cubo em memória (painel.cubo); este módulo
+acrescenta dois motores com a mesma interface, `agregar(dimensoes, medida,
+estatistica, filtros)`:
+
+* `MotorPandas`: groupby direto sobre o DataFrame tratado. É o caminho de
+  referência, o mesmo cálculo que as páginas faziam originalmente;
+* `MotorDuckDB`: SQL no DuckDB direto sobre o Parquet tratado. O DuckDB lê
+  o arquivo em lotes vetorizados, só as colunas citadas na consulta
+  (projeção) e usa as estatísticas dos row groups para pular o que o
+  `WHERE` descarta (filtro), sem carregar o DataSet na memória.
+
+Os três caminhos devolvem resultados no mesmo formato. Para conferir que
+eles batem pergunta a pergunta:
+
+    python -m painel.motores supermarket_sales.xlsx
+"""
+
+import argparse
+import importlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from painel.cubo import _normalizar, filtrar
+from painel.dados import ESQUEMA, aplicar_esquema
+
+# Tipos inteiros do DuckDB: a soma deles volta como inteiro, não pelo FSUM.
+# Um Quantity alargado para int32 pelo esquema vira INTEGER, que não termina
+# em "INT".
+TIPOS_INTEIROS = {
+    'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT',
+    'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT',
+}
+
+ESTATISTICAS_SQL = {
+    'count': 'COUNT({coluna})',
+    # fsum é a soma compensada (Kahan), a mesma usada pelo groupby do pandas;
+    # com AVG a média diverge na última casa e o texto das páginas muda
+    'mean': 'FSUM({coluna}) / NULLIF(COUNT({coluna}), 0)',
+    'std': 'STDDEV_SAMP({coluna})',
+    'linhas': 'COUNT(*)',
+}
+
+
+def _tipo_acumulado(tipo):
+    """Inteiros somam em int64 e o resto em float64, como no cubo."""
+    return 'int64' if pd.api.types.is_integer_dtype(tipo) else 'float64'
+
+
+def _ordenar(resultado, dims):
+    # Mesma ordem do groupby: códigos das categóricas (calendário para dia e
+    # mês) e valores numéricos crescentes
+    return resultado.sort_values(dims, kind='stable').reset_index(drop=True)
+
+
+class MotorPandas:
+    """Referência: agrega direto sobre o DataFrame tratado."""
+
+    def __init__(self, df1):
+        self.df1 = df1
+
+    def agregar(self, dimensoes, medida, estatistica='sum', filtros=None):
+        dims = _normalizar(dimensoes)
+        df1 = filtrar(self.df1, filtros)
+        valores = df1[medida]
+        if estatistica != 'linhas':
+            valores = valores.astype(_tipo_acumulado(valores.dtype))
+
+        if not dims:
+            return len(valores) if estatistica == 'linhas' else getattr(valores, estatistica)()
+
+        grupos = valores.groupby([df1[d] for d in dims], observed=True)
+        agregado = grupos.size() if estatistica == 'linhas' else grupos.agg(estatistica)
+        return agregado.rename(medida).reset_index()
+
+
+def _identificador(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+class MotorDuckDB:
+    """Executa as consultas em SQL no DuckDB sobre um arquivo Parquet.
+
+    O duckdb é uma dependência opcional e só é importado aqui. A conexão é
+    compartilhada e cada consulta usa o próprio cursor, então o motor pode
+    ser usado por várias sessões do Streamlit ao mesmo tempo.
+    """
+
+    def __init__(self, caminho):
+        import duckdb
+
+        self.caminho = str(caminho)
+        self._conexao = duckdb.connect()
+        self._origem = "read_parquet('" + self.caminho.replace("'", "''") + "')"
+        colunas = self._conexao.execute(f'DESCRIBE SELECT * FROM {self._origem}').fetchall()
+        self._inteiras = {nome for nome, tipo, *_ in colunas if tipo in TIPOS_INTEIROS}
+
+    def sql(self, dimensoes, medida, estatistica='sum', filtros=None):
+        """Texto SQL e parâmetros da consulta (útil para inspecionar com EXPLAIN)."""
+        dims = [_identificador(d) for d in _normalizar(dimensoes)]
+        coluna = _identificador(medida)
+        if estatistica == 'sum':
+            # SUM de coluna toda nula é NULL no SQL e 0 no pandas; a soma de
+            # inteiros sai como HUGEINT e precisa voltar a BIGINT
+            if medida in self._inteiras:
+                expressao = f'CAST(COALESCE(SUM({coluna}), 0) AS BIGINT)'
+            else:
+                expressao = f'COALESCE(FSUM({coluna}), 0)'
+        elif estatistica in ESTATISTICAS_SQL:
+            expressao = ESTATISTICAS_SQL[estatistica].format(coluna=coluna)
+        else:
+            raise ValueError(f'Estatística não suportada: {estatistica}')
+
+        # O groupby do pandas descarta grupos com chave ausente
+        condicoes = [f'{d} IS NOT NULL' for d in dims]
+        parametros = []
+        for nome, valores in (filtros or {}).items():
+            valores = list(valores)
+            if not valores:
+                condicoes.append('FALSE')
+                continue
+            condicoes.append(f'{_identificador(nome)} IN ({", ".join("?" * len(valores))})')
+            parametros += [v.item() if isinstance(v, np.generic) else v for v in valores]
+
+        texto = f'SELECT {", ".join(dims + [f"{expressao} AS {coluna}"])} FROM {self._origem}'
+        if condicoes:
+            texto += ' WHERE ' + ' AND '.join(condicoes)
+        if dims:
+            texto += ' GROUP BY ' + ', '.join(dims)
+        return texto, parametros
+
+    def agregar(self, dimensoes, medida, estatistica='sum', filtros=None):
+        dims = _normalizar(dimensoes)
+        texto, parametros = self.sql(dims, medida, estatistica, filtros)
+        cursor = self._conexao.cursor()
+        try:
+            if not dims:
+                valor = cursor.execute(texto, parametros).fetchone()[0]
+                return np.nan if valor is None else valor
+            resultado = cursor.execute(texto, parametros).df()
+        finally:
+            cursor.close()
+        # Texto volta como string; as dimensões recuperam as categóricas do
+        # esquema, o que também devolve a ordem de calendário a dia e mês
+        resultado = aplicar_esquema(resultado[dims]).assign(**{medida: resultado[medida]})
+        return _ordenar(resultado, dims)
+
+
+def comparar_motores(consultas, referencia, outro, filtros=None, rtol=1e-9):
+    """Lista de (nome, erro) das consultas em que os dois motores diferem."""
+    from painel.consultas import executar
+
+    diferencas = []
+    for nome, consulta in consultas.items():
+        esperado = executar(consulta, referencia, filtros)
+        obtido = executar(consulta, outro, filtros)
+        try:
+            if isinstance(esperado, pd.DataFrame):
+                pd.testing.assert_frame_equal(
+                    esperado, obtido, check_dtype=False, check_categorical=False, rtol=rtol,
+                )
+            elif not np.isclose(esperado, obtido, rtol=rtol, equal_nan=True):
+                raise AssertionError(f'{esperado!r} != {obtido!r}')
+        except AssertionError as erro:
+            diferencas.append((nome, str(erro)))
+    return diferencas
+
+
+def main(argv=None):
+    from painel.paginas import PAGINAS_PERGUNTAS
+    from painel.dados import ARQUIVO_PADRAO, caminho_cache, carregar_dados
+    from painel.cubo import construir_cubo
+
+    parser = argparse.ArgumentParser(description='Confere se os motores de consulta dão os mesmos resultados.')
+    parser.add_argument('arquivo', nargs='?', default=ARQUIVO_PADRAO)
+    parser.add_argument('--filtro', nargs=2, action='append', metavar=('COLUNA', 'VALOR'),
+                        help='restringe todas as consultas, ex.: --filtro Branch A (pode repetir)')
+    args = parser.parse_args(argv)
+
+    df1 = carregar_dados(args.arquivo)
+    motores = {
+        'cubo': construir_cubo(df1),
+        'duckdb': MotorDuckDB(caminho_cache(args.arquivo)),
+    }
+    filtros = {}
+    for coluna, valor in args.filtro or []:
+        tipo = ESQUEMA.get(coluna)
+        filtros.setdefault(coluna, []).append(int(valor) if str(tipo) == 'Int8' else valor)
+
+    consultas = {}
+    for pagina, modulo in PAGINAS_PERGUNTAS.items():
+        for numero, consulta in importlib.import_module(modulo).PERGUNTAS.items():
+            consultas[f'{pagina}/{numero}'] = consulta
+
+    referencia = MotorPandas(df1)
+    falhou = False
+    for nome, motor in motores.items():
+        diferencas = comparar_motores(consultas, referencia, motor, filtros or None)
+        print(f'{nome}: {len(consultas) - len(diferencas)}/{len(consultas)} consultas iguais à referência')
+        for consulta, erro in diferencas:
+            falhou = True
+            print(f'  {consulta}: {erro}')
+    if falhou:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
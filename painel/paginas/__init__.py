@@ -0,0 +1,19 @@
+"""Páginas do dashboard, importadas sob demanda pelo 6.streamlit.py.
+
+`PAGINAS` é o único mapa nome -> módulo: o menu do app, o relatório
+estático, o benchmark e os testes de carga e de inicialização leem daqui.
+Só os nomes dos módulos ficam aqui, então importar o mapa não importa
+nenhuma página.
+"""
+
+PAGINAS = {
+    'Página Inicial': 'painel.paginas.inicial',
+    'Vendas': 'painel.paginas.vendas',
+    'Clientes': 'painel.paginas.clientes',
+    'Satisfação': 'painel.paginas.satisfacao',
+    'Impostos e Lucros': 'painel.paginas.impostos',
+    'Temporal': 'painel.paginas.temporal',
+}
+
+# Páginas com perguntas de negócio (`PERGUNTAS`, `calcular` e `graficos`)
+PAGINAS_PERGUNTAS = {nome: modulo for nome, modulo in PAGINAS.items() if nome != 'Página Inicial'}
@@ -0,0 +1,260 @@
+"""Página Clientes: comportamento de compra por gênero, tipo, cidade e pagamento."""
+
+from functools import partial
+
+import matplotlib.pyplot as plt
+import plotly.express as px
+import streamlit as st
+
+from painel.consultas import Consulta, calcular_perguntas
+from painel.densidade import amostra_por_grupo, figura_violino, resumo_violino
+from painel.conclusoes import empatados, enumerar, maior, ordenar, quantidade, ressalva
+from painel.recursos import (
+    medidor_atual, mostrar_conclusao, mostrar_figura, mostrar_intervalo, mostrar_plotly, obter_resumo_violino,
+)
+from painel.tabela import mostrar_tabela
+
+PAGINA = 'Clientes'
+
+PERGUNTAS = {
+    1: Consulta(['Branch', 'Gender'], 'Invoice ID', 'linhas', renomear={'Invoice ID': 'Contagem de Compras'}),
+    2: Consulta('Customer type', 'Total', 'mean'),
+    3: Consulta('City', 'Total', 'mean'),
+    4: Consulta('Payment', 'Invoice ID', 'linhas', renomear={'Invoice ID': 'Quantidade de Compras'}),
+    5: Consulta('Payment', 'Total', 'mean'),
+}
+
+
+def calcular(fonte, medidor=None):
+    """Tabela de resposta de cada pergunta da página, indexada pelo número."""
+    return calcular_perguntas(PAGINA, PERGUNTAS, fonte, medidor)
+
+
+def grafico_1(resultado):
+    cores = {'Female': 'deeppink', 'Male': 'dodgerblue'}
+    fig = px.bar(
+        resultado, 
+        x='Branch',           # Eixo X: Filiais
+        y='Contagem de Compras', # Eixo Y: Quantidade de compras
+        color='Gender',       # Agrupa e colore por Gênero
+        barmode='group',      # Configura o modo como 'lado a lado'
+        title='Volume de Compras por Filial e Gênero',
+        labels={
+            'Branch': 'Filial', 
+            'Contagem de Compras': 'Número de Compras (Invoice ID)', 
+            'Gender': 'Gênero'
+        },
+        color_discrete_map=cores # Aplica as cores personalizadas
+    )
+    fig.update_layout(
+        xaxis_title='Filial',
+        yaxis_title='Contagem de Compras',
+        legend_title='Gênero',
+        font=dict(size=12),
+        hovermode='x unified'
+    )
+    return fig
+
+
+def grafico_2(resultado):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    cores = ['#66c2a5', '#fc8d62'] # Uma paleta de cores bonita
+    ax.bar(resultado['Customer type'], resultado['Total'], color=cores)
+    ax.set_title('Gasto Médio por Tipo de Cliente', fontsize=18, color='white') # Título maior e branco
+    ax.set_ylabel('Gasto Médio (R$)', fontsize=14, color='lightgray') # Eixos com fonte clara
+    ax.set_xlabel('Tipo de Cliente', fontsize=14, color='lightgray')
+    for index, value in enumerate(resultado['Total']):
+        ax.text(index, value + 2, f'R$ {value:,.2f}', ha='center', va='bottom', color='white', fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.5, color='gray') # Grade mais discreta
+    min_value = resultado['Total'].min()
+    ax.set_ylim(bottom=(min_value * 0.95))
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('lightgray')
+    ax.spines['bottom'].set_color('lightgray')
+    return fig
+
+
+def grafico_3(resultado):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(resultado['City'], resultado['Total'], color='lightgreen')
+    ax.set_title('Valor Médio de Compra por Cidade')
+    ax.set_xlabel('Cidade')
+    ax.set_ylabel('Ticket Médio (R$)')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    valor_minimo = resultado['Total'].min()
+    ax.set_ylim(bottom=(valor_minimo-10))
+    return fig
+
+
+def grafico_4(resultado):
+    fig = px.treemap(
+    resultado, 
+    path=['Payment'],  # Categoria principal (Método de Pagamento)
+    values='Quantidade de Compras', 
+    color='Quantidade de Compras', # Colore com base na quantidade (para contraste visual)
+    title='Uso de Métodos de Pagamento',
+    color_continuous_scale='Sunset' # Escolha de cores
+    )
+    return fig
+
+
+def grafico_5(resumo, amostra):
+    # O violino é desenhado a partir de um resumo (KDE + quartis) e de uma
+    # amostra de pontos por método, em vez de mandar todas as linhas ao navegador
+    return figura_violino(
+        resumo,
+        amostra,
+        'Payment',
+        'Total',
+        'Densidade de Gasto Total por Método de Pagamento (Violin Plot)'
+    )
+
+
+
+def conclusao_1(resultado):
+    coluna = 'Contagem de Compras'
+    frases = []
+    estreita = True
+    for filial, grupo in resultado.groupby('Branch', observed=True):
+        linha = maior(grupo, coluna)
+        parcela = linha[coluna] / grupo[coluna].sum()
+        frase = f'na filial {filial} compra mais o gênero {linha["Gender"]} ({parcela:.0%} das compras'
+        if not empatados(grupo, coluna).empty:
+            frase += ', dentro da margem de 95% da amostra'
+        frases.append(frase + ')')
+        # Menos de 10 pontos percentuais entre os dois gêneros
+        estreita &= parcela < 0.55
+    texto = enumerar(frases)
+    texto = texto[0].upper() + texto[1:]
+    if estreita:
+        texto += ': uma diferença estreita, indicando que ambos os gêneros são importantes em todas as filiais'
+    return texto + '.'
+
+
+def conclusao_2(resultado):
+    linhas = ordenar(resultado, 'Média de Gastos')
+    if len(linhas) == 1:
+        return (f'Na seleção atual só há clientes do tipo {linhas.loc[0, "Customer type"]}, '
+                f'com média de gastos de {linhas.loc[0, "Média de Gastos"]:.4f}.')
+    return (f'Clientes do tipo {linhas.loc[0, "Customer type"]} costumam gastar mais do que clientes '
+            f'{linhas.loc[1, "Customer type"]}, com médias respectivamente de '
+            f'{linhas.loc[0, "Média de Gastos"]:.4f} e {linhas.loc[1, "Média de Gastos"]:.4f}.'
+            + ressalva(resultado, 'Customer type', 'Média de Gastos'))
+
+
+def conclusao_3(resultado):
+    linha = maior(resultado, 'Total')
+    return (f"O Ticket Médio mais alto é na cidade de {linha['City']}, com uma média de R$ {linha['Total']:.4f}."
+            + ressalva(resultado, 'City', 'Total'))
+
+
+def conclusao_4(resultado):
+    linha = maior(resultado, 'Quantidade de Compras')
+    return (f'O método de Pagamento mais utilizado é {linha["Payment"]}, pois foi utilizado '
+            f'{quantidade(linha, "Quantidade de Compras")} vezes. Isso é visível no Treemap, onde o {linha["Payment"]} '
+            'corresponde à maior área do gráfico.' + ressalva(resultado, 'Payment', 'Quantidade de Compras'))
+
+
+def conclusao_5(resultado):
+    linhas = ordenar(resultado, 'Total')
+    demais = [f'{linha["Payment"]}: R\\$ {linha["Total"]:.2f}' for _, linha in linhas.iloc[1:].iterrows()]
+    texto = (f'Clientes que usam {linhas.loc[0, "Payment"]} gastam mais em média, '
+             f'R\\$ {linhas.loc[0, "Total"]:.2f} por compra')
+    if demais:
+        texto += f' ({enumerar(demais)})'
+    return (texto + '.' + ressalva(resultado, 'Payment', 'Total')
+            + ' No Violin Plot dá para comparar também a mediana e a dispersão de cada método.')
+
+
+def desenhar_5(df1, chave_dados=None):
+    """Violino da pergunta 5, o mesmo no app e no relatório estático.
+
+    Com `chave_dados` (no app) o resumo sai do cache dividido entre as sessões;
+    sem ela (no relatório, fora do Streamlit) é calculado direto das linhas.
+    """
+    if chave_dados is None:
+        resumo = resumo_violino(df1, 'Payment', 'Total'), amostra_por_grupo(df1[['Payment', 'Total']], 'Payment')
+    else:
+        resumo = obter_resumo_violino(df1, chave_dados, 'Payment', 'Total')
+    return grafico_5(*resumo)
+
+
+def graficos(df1, resultados, chave_dados=None):
+    """Funções sem argumentos que desenham o gráfico de cada pergunta."""
+    return {
+        1: partial(grafico_1, resultados[1]),
+        2: partial(grafico_2, resultados[2]),
+        3: partial(grafico_3, resultados[3]),
+        4: partial(grafico_4, resultados[4]),
+        5: partial(desenhar_5, df1, chave_dados),
+    }
+
+
+def mostrar(df1, fonte, chave_dados):
+    resultados = calcular(fonte, medidor_atual())
+    desenhos = graficos(df1, resultados, chave_dados)
+
+    st.title('👤 Métricas sobre Comportamento do Cliente')
+    st.markdown('''##### Para uma melhor noção a respeito dos dados, confira o DataSet completo abaixo:''')
+    mostrar_tabela(df1, 'clientes', chave_dados)
+    st.markdown('##### Vamos Responder a Perguntas de Negócios relacionados ao comportamento do cliente:')
+    st.markdown('''
+1. Qual gênero (Gender) mais compra em cada filial?
+2. Clientes de qual tipo (`Customer Type`: Member / Normal) gastam mais em média?
+3. Há diferença no valor médio de compra entre clientes de diferentes cidades?
+4. Qual método de pagamento é mais usado?
+5. Clientes que usam cartões ou dinheiro gastam mais em média?
+''')
+    
+    st.markdown('##### Respostas:')
+    
+    # 1. Gênero que mais compra em cada filial (Plotly)
+    st.markdown('1. Qual gênero (Gender) mais compra em cada filial?')
+    resultado = resultados[1]
+    mostrar_plotly(PAGINA, 1, desenhos[1])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_1)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+    
+    # 2. Gasto médio por tipo de cliente
+    st.markdown('2. Clientes de qual tipo (`Customer Type`: Member / Normal) gastam mais em média?')
+    resultado = resultados[2]
+    mostrar_figura(chave_dados, PAGINA, 2, desenhos[2])
+
+    resultado = resultado.rename(columns={'Total': 'Média de Gastos'})
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_2)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+    
+    # 3. Diferença no valor médio de compra entre cidades
+    st.markdown('3. Há diferença no valor médio de compra entre clientes de diferentes cidades?')
+    resultado = resultados[3]
+    mostrar_figura(chave_dados, PAGINA, 3, desenhos[3])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_3)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    st.markdown('4. Qual método de pagamento é mais usado?')
+    resultado = resultados[4]
+
+    # 2. Exibição interativa no Streamlit
+    mostrar_plotly(PAGINA, 4, desenhos[4])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_4)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+    
+    st.markdown('5. Clientes que usam cartões ou dinheiro gastam mais em média?')
+    resultado = resultados[5]
+    # O resumo só é calculado quando a figura não vem pronta do relatório estático
+    mostrar_plotly(PAGINA, 5, desenhos[5])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_5)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
@@ -0,0 +1,150 @@
+"""Página Impostos e Lucros: imposto recolhido, lucro bruto e ticket médio."""
+
+from functools import partial
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from painel.consultas import Consulta, calcular_perguntas
+from painel.conclusoes import enumerar, maior, ordenar, ressalva
+from painel.recursos import medidor_atual, mostrar_conclusao, mostrar_figura, mostrar_intervalo
+from painel.tabela import mostrar_tabela
+
+PAGINA = 'Impostos e Lucros'
+
+PERGUNTAS = {
+    1: Consulta('City', 'Tax 5%', 'sum', ordenar_por='Tax 5%'),
+    2: Consulta('Product line', 'gross income', 'sum', ordenar_por='gross income'),
+    3: Consulta('City', 'Total', 'mean', ordenar_por='Total', crescente=True),
+}
+
+
+def calcular(fonte, medidor=None):
+    """Tabela de resposta de cada pergunta da página, indexada pelo número."""
+    return calcular_perguntas(PAGINA, PERGUNTAS, fonte, medidor)
+
+
+def grafico_1(resultado):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    # Dados
+    cidades = resultado['City']
+    impostos = resultado['Tax 5%']
+    # 2. Desenho do Gráfico
+    # Desenha as hastes (linhas horizontais) com cores padrão
+    ax.hlines(y=cidades, xmin=0, xmax=impostos, color='skyblue')
+    # Desenha os pontos (o 'picolé') com cores padrão
+    ax.scatter(impostos, cidades, color='blue', s=100) 
+    # 3. Rótulos e Título (Formato padrão)
+    ax.set_title('Total de Imposto Recolhido por Cidade (R$)')
+    ax.set_xlabel('Total de Imposto (R$)')
+    ax.set_ylabel('Cidade')
+    # Grade padrão (apenas no eixo X)
+    ax.grid(axis='x', linestyle='--', alpha=0.6) 
+    # Adição de Rótulos de Dados básicos (para ter alguma leitura)
+    for index, value in enumerate(impostos.values):
+        # Adiciona o valor no final do "picolé"
+        ax.text(value, index, f' R$ {value:,.0f}', ha='left', va='center', fontsize=9)
+    # Ajuste do Eixo X (para acomodar os rótulos de dados)
+    ax.set_xlim(right=impostos.max() * 1.15) 
+    return fig
+
+
+def grafico_2(resultado):
+    # 1. Criação da Figura
+    fig, ax = plt.subplots(figsize=(8, 6))
+    # Dados
+    categorias = resultado['Product line']
+    lucro = resultado['gross income']
+    # 2. Desenho do Gráfico (Barra Horizontal)
+    ax.barh(categorias, lucro, color='teal') 
+    # 3. Rótulos e Título
+    ax.set_title('Lucro Bruto Total por Categoria de Produto', fontsize=14)
+    ax.set_xlabel('Lucro Bruto (R$)')
+    ax.set_ylabel('Categoria de Produto')
+    # Grade padrão no eixo X
+    ax.grid(axis='x', linestyle='--', alpha=0.6) 
+    # Adição de Rótulos de Dados básicos (opcional, mas recomendado para ranking)
+    for index, value in enumerate(lucro.values):
+        # Coloca o rótulo no final da barra
+        ax.text(value, index, f' R$ {value:,.0f}', ha='left', va='center', fontsize=9)
+    # Ajuste do Eixo X
+    ax.set_xlim(right=lucro.max() * 1.1) 
+    return fig
+
+
+def grafico_3(resultado):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(resultado['City'], resultado['Total'], color='lightseagreen')
+    ax.set_title('Ticket Médio por Cidade', fontsize=16)
+    ax.set_xlabel('Ticket Médio', fontsize=12)
+    ax.set_ylabel('Cidade', fontsize=12)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    # Ajustar layout para evitar cortes
+    plt.tight_layout()
+    return fig
+
+
+def conclusao_1(resultado):
+    linha = maior(resultado, 'Tax 5%')
+    return f'A cidade {linha["City"]} foi a cidade com mais imposto recolhido, com R\\${linha["Tax 5%"]:,.2f} em impostos.' + ressalva(resultado, 'City', 'Tax 5%')
+
+
+def conclusao_2(resultado):
+    linha = maior(resultado, 'gross income')
+    return f'O produto com maior lucro bruto foi {linha["Product line"]}, com R\\${linha["gross income"]:,.2f}.' + ressalva(resultado, 'Product line', 'gross income')
+
+
+def conclusao_3(resultado):
+    linhas = ordenar(resultado, 'Total')
+    primeira = f'O ticket médio da cidade de {linhas.loc[0, "City"]} foi de {linhas.loc[0, "Total"]:.0f}'
+    demais = [f'em {linha["City"]} foi {linha["Total"]:.0f}' for _, linha in linhas.iloc[1:].iterrows()]
+    return enumerar([primeira, *demais]) + '.' + ressalva(resultado, 'City', 'Total')
+
+
+def graficos(df1, resultados):
+    """Funções sem argumentos que desenham o gráfico de cada pergunta."""
+    return {
+        1: partial(grafico_1, resultados[1]),
+        2: partial(grafico_2, resultados[2]),
+        3: partial(grafico_3, resultados[3]),
+    }
+
+
+def mostrar(df1, fonte, chave_dados):
+    resultados = calcular(fonte, medidor_atual())
+    desenhos = graficos(df1, resultados)
+
+    st.title('💸 Impostos e Lucros')
+    st.markdown('''##### Para uma melhor noção a respeito dos dados, confira o DataSet completo abaixo:''')
+    mostrar_tabela(df1, 'impostos', chave_dados)
+    st.markdown('##### Vamos Responder a Perguntas de Negócios relacionados a impostos e lucros:')
+    st.markdown('''
+1. Qual é o total de imposto (`Tax 5%`) recolhido por cidade?
+2. Qual categoria de produto gera mais lucro bruto (`gross income`)?
+3. Qual foi o ticket médio (valor médio de compra) por cidade?
+''')
+    
+    st.markdown('---')
+    st.markdown("1. Qual é o total de imposto (`Tax 5%`) recolhido por cidade?")
+    resultado = resultados[1]
+    st.write(resultado)
+    mostrar_figura(chave_dados, PAGINA, 1, desenhos[1])
+    mostrar_conclusao(resultado, conclusao_1)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+
+    st.markdown('2. Qual categoria de produto gera mais lucro bruto (`gross income`)?')
+    resultado = resultados[2]
+    mostrar_figura(chave_dados, PAGINA, 2, desenhos[2])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_2)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    st.markdown('Qual foi o ticket médio (valor médio de compra) por cidade?')
+    resultado = resultados[3]
+    mostrar_figura(chave_dados, PAGINA, 3, desenhos[3])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_3)
+    mostrar_intervalo(resultado)
@@ -0,0 +1,24 @@
+"""Página Inicial: apresentação do projeto e amostra do DataSet."""
+
+import streamlit as st
+
+
+def mostrar(df1, fonte, chave_dados):
+    st.title("🏠 Página Inicial | Supermarket Sales Dashboard")
+
+    st.markdown('''
+    Seja muito bem-vindo(a)!
+
+    Me chamo Gabriel Cáceres Pena, tenho 20 anos e atualmente curso Engenharia da Computação na UNIVESP.
+
+    Para exercitar meus conhecimentos em análise de dados, desenvolvi este projeto chamado Supermarket Sales, no qual realizo uma exploração completa de um conjunto de dados de vendas de supermercado, disponível no DataSet Supermarket Sales no Kaggle.
+
+    O objetivo é analisar informações sobre vendas, clientes, satisfação, impostos, lucros e tendências ao longo do tempo, transformando dados brutos em insights úteis e visualmente intuitivos.
+
+    Aqui, você poderá interagir com dashboards dinâmicos, visualizar gráficos e entender como as decisões baseadas em dados podem ajudar a melhorar o desempenho e a estratégia de um negócio.
+
+    Aproveite a navegação e boa análise!🤗
+    ''')
+    st.markdown("---")
+    st.subheader("Amostra do DataSet")
+    st.dataframe(df1.head(10), use_container_width=True)
@@ -0,0 +1,159 @@
+"""Página Satisfação: distribuição e médias de avaliação (Rating)."""
+
+from functools import partial
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from painel.consultas import Consulta, calcular_perguntas
+from painel.densidade import LIMITE_PONTOS, histograma_2d
+from painel.conclusoes import aproximado, maior, ressalva
+from painel.recursos import (
+    medidor_atual, mostrar_conclusao, mostrar_figura, mostrar_intervalo, obter_correlacoes, pacote_atual,
+)
+from painel.tabela import mostrar_tabela
+
+PAGINA = 'Satisfação'
+
+# A pergunta 2 é respondida só pelo gráfico, a partir das linhas
+PERGUNTAS = {
+    1: Consulta(None, 'Rating', 'mean'),
+    3: Consulta('Product line', 'Rating', 'mean', ordenar_por='Rating'),
+}
+
+
+def calcular(fonte, medidor=None):
+    """Tabela de resposta de cada pergunta da página, indexada pelo número."""
+    return calcular_perguntas(PAGINA, PERGUNTAS, fonte, medidor)
+
+
+def grafico_1(df1):
+    fig, ax = plt.subplots()
+    ax.hist(df1['Rating'], bins=10, color='plum', edgecolor='black')
+    ax.set_title('Distribuição das Avaliações')
+    ax.set_xlabel('Avaliação')
+    ax.set_ylabel('Frequência')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    return fig
+
+
+def grafico_2(df1):
+    fig, ax = plt.subplots()
+    if len(df1) <= LIMITE_PONTOS:
+        ax.scatter(df1['Total'], df1['Rating'], alpha=0.6, color='teal')
+    else:
+        # Com muitas linhas o scatter vira um histograma 2D de tamanho fixo
+        contagem, bordas_x, bordas_y = histograma_2d(df1['Total'], df1['Rating'])
+        malha = ax.pcolormesh(bordas_x, bordas_y, contagem.T, cmap='viridis')
+        fig.colorbar(malha, ax=ax, label='Número de compras')
+    ax.set_title('Correlação entre Total Gasto e Avaliação')
+    ax.set_xlabel('Total Gasto')
+    ax.set_ylabel('Avaliação')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    return fig
+
+
+def grafico_3(resultado):
+    fig, ax = plt.subplots()
+    ax.plot(resultado['Product line'], resultado['Rating'], marker='o', color='red')
+    ax.set_title('Média de rating por Produto')
+    ax.set_xlabel('Produto')
+    ax.set_ylabel('Rating')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.xticks(rotation=45, ha='right')
+    return fig
+
+
+def grafico_matriz(matriz, titulo):
+    fig, ax = plt.subplots(figsize=(7, 6))
+    imagem = ax.imshow(matriz.to_numpy(), cmap='coolwarm', vmin=-1, vmax=1)
+    ax.set_xticks(range(len(matriz.columns)), matriz.columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(matriz.index)), matriz.index)
+    for i in range(len(matriz.index)):
+        for j in range(len(matriz.columns)):
+            ax.text(j, i, f'{matriz.iat[i, j]:.2f}', ha='center', va='center', color='black', fontsize=9)
+    ax.set_title(f'Correlação de Pearson — {titulo}')
+    fig.colorbar(imagem, ax=ax)
+    plt.tight_layout()
+    return fig
+
+
+def conclusao_correlacao(linha):
+    """Texto da resposta da pergunta 2 a partir da linha geral da tabela de correlações."""
+    r, inferior, superior = linha['Pearson'], linha['Pearson IC 95% (inf.)'], linha['Pearson IC 95% (sup.)']
+    medidas = (f'r de Pearson = {r:.3f} (IC 95% de {inferior:.3f} a {superior:.3f}) '
+               f'e ρ de Spearman = {linha["Spearman"]:.3f}')
+    if not inferior > 0 and not superior < 0:
+        return f'Não há evidência de correlação entre Total e Rating: {medidas}. Clientes que gastam mais não avaliam melhor.'
+    direcao = 'positiva' if r > 0 else 'negativa'
+    forca = 'fraca' if abs(r) < 0.3 else 'moderada' if abs(r) < 0.7 else 'forte'
+    return f'Há correlação {direcao} {forca} entre Total e Rating: {medidas}.'
+
+
+def conclusao_1(resultado):
+    return f'A média geral de rating é {aproximado(resultado)}'
+
+
+def conclusao_3(resultado):
+    linha = maior(resultado, 'Rating')
+    return (f'O produto com maior média de avaliação é {linha["Product line"]}, com média {linha["Rating"]:.2f}.'
+            + ressalva(resultado, 'Product line', 'Rating'))
+
+
+def graficos(df1, resultados):
+    """Funções sem argumentos que desenham o gráfico de cada pergunta."""
+    return {
+        1: partial(grafico_1, df1),
+        2: partial(grafico_2, df1),
+        3: partial(grafico_3, resultados[3]),
+    }
+
+
+def mostrar(df1, fonte, chave_dados):
+    resultados = calcular(fonte, medidor_atual())
+    desenhos = graficos(df1, resultados)
+
+    st.title('⭐ Métricas sobre satisfação do cliente')
+    st.markdown('''##### Para uma melhor noção a respeito dos dados, confira o DataSet completo abaixo:''')
+    mostrar_tabela(df1, 'satisfacao', chave_dados)
+    st.markdown('##### Vamos Responder a Perguntas de Negócios relacionados a satisfação do cliente:')
+    st.markdown('''
+1. Qual é a média geral de avaliação (`Rating`)?
+2. Existe correlação entre `Rating` e `Total` (clientes que gastam mais avaliam melhor)?
+3. Qual linha de produto tem a maior média de avaliação?
+''')
+    
+    st.markdown('---')
+    st.markdown('1. Qual é a média geral de avaliação (`Rating`)?')
+    resultado = resultados[1]
+    mostrar_figura(chave_dados, PAGINA, 1, desenhos[1])
+    mostrar_conclusao(resultado, conclusao_1)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    st.markdown('2. Existe correlação entre Rating e Total (clientes que gastam mais avaliam melhor)?')
+    mostrar_figura(chave_dados, PAGINA, 2, desenhos[2])
+    with medidor_atual().secao(f'{PAGINA}/2', 'agregacao'):
+        # Com o relatório estático as correlações já vêm calculadas
+        pacote = pacote_atual()
+        correlacoes = pacote and pacote.correlacoes()
+        if correlacoes is None:
+            correlacoes = obter_correlacoes(df1, chave_dados)
+    st.info(conclusao_correlacao(correlacoes.geral()))
+    st.markdown('Correlação entre Total e Rating no geral, por filial e por linha de produto '
+                '(Pearson com intervalo bootstrap; Spearman pelos postos):')
+    st.dataframe(correlacoes.tabela, hide_index=True, use_container_width=True)
+    grupos = {rotulo: (nivel, chave) for rotulo, nivel, chave in correlacoes.grupos()}
+    escolhido = st.selectbox('Matriz de correlação de', list(grupos), key='satisfacao_matriz')
+    mostrar_figura(
+        chave_dados, PAGINA, f'matriz/{escolhido}',
+        partial(grafico_matriz, correlacoes.matriz(*grupos[escolhido]), escolhido),
+    )
+    st.markdown('---')
+
+    st.markdown('3. Qual linha de produto tem a maior média de avaliação?')
+    resultado = resultados[3]
+    mostrar_figura(chave_dados, PAGINA, 3, desenhos[3])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_3)
+    mostrar_intervalo(resultado)
@@ -0,0 +1,266 @@
+"""Página Temporal: variações das vendas por mês, hora e dia da semana."""
+
+from functools import partial
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+from painel.consultas import Consulta, calcular_perguntas
+from painel.janelas import TODAS
+from painel.conclusoes import maior, ordenar, quantidade, ressalva
+from painel.recursos import medidor_atual, mostrar_conclusao, mostrar_figura, mostrar_intervalo, obter_indice_temporal
+from painel.tabela import mostrar_tabela
+
+PAGINA = 'Temporal'
+
+PERGUNTAS = {
+    1: Consulta('Mes', 'gross income', 'mean', ordenar_por='gross income'),
+    2: Consulta('Hour', 'Total', 'std', ordenar_por='Hour', crescente=True,
+                renomear={'Total': 'Desvio_Padrao_Total'}),
+    3: Consulta('Dia_Semana', 'Invoice ID', 'linhas', ordenar_por='Invoice ID'),
+}
+
+GRANULARIDADES = {'Diária': 'D', 'Horária': 'h'}
+MEDIAS_MOVEIS = [7, 30]
+
+
+def calcular(fonte, medidor=None):
+    """Tabela de resposta de cada pergunta da página, indexada pelo número."""
+    return calcular_perguntas(PAGINA, PERGUNTAS, fonte, medidor)
+
+
+def grafico_1(resultado):
+    # Mes é categórica ordenada: ordenar por ela volta à ordem do calendário
+    mensal = resultado.sort_values('Mes')
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # 1. Plotar o gráfico de linha
+    # O Eixo X é o nome do mês (Nome_Mes) e o Eixo Y é a média de vendas brutas
+    ax.plot(
+        mensal['Mes'],
+        mensal['gross income'],
+        marker='o',             # Adiciona círculos nos pontos de dados
+        color='#0077B6',        # Cor da linha (azul escuro)
+        linestyle='-',          # Tipo de linha (sólida)
+        linewidth=2
+    )
+
+    # 2. Configurações do Título e Eixos
+    ax.set_title('Média de Vendas Brutas (Gross Income) por Mês', fontsize=16, weight='bold')
+    ax.set_xlabel('Mês', fontsize=12)
+    ax.set_ylabel('Média de Vendas Brutas ($)', fontsize=12)
+
+    # 3. Adicionar uma linha de grade no Eixo Y para facilitar a leitura dos valores
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+    # 4. Rotacionar os rótulos do Eixo X se necessário (para evitar sobreposição)
+    plt.xticks(rotation=0) # Mantenho a 0 pois os nomes curtos não se sobrepõem
+
+    # 5. Adicionar anotações de texto no ponto mais alto (pico) para destaque (Opcional)
+    pico = resultado.loc[resultado['gross income'].idxmax()]
+    ax.annotate(
+        f'Pico: ${pico["gross income"]:.2f}',
+        xy=(pico['Mes'], pico['gross income']),
+        xytext=(5, -15), # Deslocamento do texto
+        textcoords='offset points',
+        arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=.2", color='red'),
+        fontsize=10,
+        color='red'
+    )
+
+    # 6. Ajustar layout para evitar cortes
+    plt.tight_layout()
+
+    return fig
+
+
+def grafico_2(variacao_por_hora):
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # 1. Plotar o gráfico de linha
+    ax.plot(
+        variacao_por_hora['Hour'],
+        variacao_por_hora['Desvio_Padrao_Total'],
+        marker='o',             # Adiciona círculos nos pontos de dados
+        color='darkorange',     # Cor da linha
+        linestyle='-',          # Tipo de linha (sólida)
+        linewidth=2
+    )
+
+    # 2. Configurações do Título e Eixos
+    ax.set_title('Variação (Desvio Padrão) das Vendas por Hora do Dia', fontsize=16, weight='bold')
+    ax.set_xlabel('Hora do Dia (HH)', fontsize=12)
+    ax.set_ylabel('Desvio Padrão do Total de Vendas ($)', fontsize=12)
+
+    # 3. Ajustar os ticks do Eixo X para mostrar apenas as horas inteiras
+    ax.set_xticks(variacao_por_hora['Hour'])
+
+    # 4. Adicionar uma linha de grade no Eixo Y para facilitar a leitura dos valores
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+    # 5. Adicionar anotações de texto no ponto mais alto (Opcional: Destaque a hora mais volátil)
+    pico = variacao_por_hora.loc[variacao_por_hora['Desvio_Padrao_Total'].idxmax()]
+    ax.annotate(
+        f'Máxima Volatilidade: {pico["Hour"]}h',
+        xy=(pico['Hour'], pico['Desvio_Padrao_Total']),
+        xytext=(-30, 15), # Deslocamento do texto
+        textcoords='offset points',
+        arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=.2", color='red'),
+        fontsize=10,
+        color='red'
+    )
+
+    # 6. Ajustar layout para evitar cortes
+    plt.tight_layout()
+
+    return fig
+
+
+def grafico_3(resultado):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(resultado['Dia_Semana'], resultado['Invoice ID'], color='lightgreen')
+    ax.set_title('Número de Transações por Dia da Semana')
+    ax.set_xlabel('Dia da Semana')
+    ax.set_ylabel('Número de Transações')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    valor_minimo = resultado['Invoice ID'].min()
+    ax.set_ylim(bottom=(valor_minimo-10))
+    return fig
+
+
+def grafico_medias_moveis(medias, medida, granularidade):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    cores = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    for numero, filial in enumerate(medias[MEDIAS_MOVEIS[0]].columns.drop(TODAS)):
+        for dias, estilo in zip(MEDIAS_MOVEIS, ['-', '--']):
+            ax.plot(medias[dias].index, medias[dias][filial], linestyle=estilo,
+                    color=cores[numero % len(cores)], label=f'{filial} ({dias} dias)')
+    unidade = 'dia' if granularidade == 'D' else 'hora'
+    ax.set_title(f'Médias Móveis de {medida} por Filial', fontsize=16, weight='bold')
+    ax.set_xlabel('Data', fontsize=12)
+    ax.set_ylabel(f'{medida} por {unidade} ($)', fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.legend(ncol=len(MEDIAS_MOVEIS), fontsize=9)
+    fig.autofmt_xdate()
+    plt.tight_layout()
+    return fig
+
+
+def mostrar_janelas(df1, chave_dados):
+    """Métricas de um período escolhido e médias móveis por filial, a partir do índice temporal."""
+    st.markdown('##### Janelas de tempo: escolha um período e acompanhe as médias móveis de cada filial')
+    col1, col2 = st.columns(2)
+    granularidade = GRANULARIDADES[col1.radio(
+        'Granularidade', list(GRANULARIDADES), horizontal=True, key='temporal_granularidade',
+    )]
+    medida = col2.selectbox('Medida', ['Total', 'gross income'], key='temporal_medida')
+    indice = obter_indice_temporal(df1, chave_dados, granularidade)
+    if not indice.intervalos:
+        st.caption('Não há vendas com data válida nesta seleção.')
+        return
+
+    primeira, ultima = indice.periodo()
+    inicio, fim = primeira, ultima
+    if primeira < ultima:
+        inicio, fim = st.slider(
+            'Período', min_value=primeira, max_value=ultima, value=(primeira, ultima),
+            format='DD/MM/YYYY', key='temporal_periodo',
+        )
+
+    with medidor_atual().secao(f'{PAGINA}/janelas', 'agregacao'):
+        resumo = pd.DataFrame({
+            'Vendas': indice.janela(inicio, fim, medida, 'count').astype('int64'),
+            f'{medida} (soma)': indice.janela(inicio, fim, medida, 'sum'),
+            f'{medida} (média por venda)': indice.janela(inicio, fim, medida, 'mean'),
+            f'{medida} (desvio padrão)': indice.janela(inicio, fim, medida, 'std'),
+        }).rename_axis('Filial').reset_index()
+        medias = {dias: indice.media_movel(medida, dias, inicio, fim) for dias in MEDIAS_MOVEIS}
+
+    st.dataframe(resumo, hide_index=True, use_container_width=True)
+    mostrar_figura(
+        chave_dados, PAGINA, f'medias_moveis/{medida}/{granularidade}/{inicio}/{fim}',
+        partial(grafico_medias_moveis, medias, medida, granularidade),
+    )
+    st.caption('Linhas cheias: média móvel de 7 dias; tracejadas: de 30 dias. '
+               'Cada média usa os dias anteriores ao período quando eles existem.')
+
+
+def conclusao_1(resultado):
+    linhas = ordenar(resultado, 'gross income').dropna(subset=['gross income']).reset_index(drop=True)
+    texto = (f'O mês com maior média de vendas brutas foi {linhas.loc[0, "Mes"]}, '
+             f'com R\\$ {linhas.loc[0, "gross income"]:,.2f} por venda')
+    if len(linhas) > 1:
+        texto += f'; a menor foi a de {linhas["Mes"].iloc[-1]}, com R\\$ {linhas["gross income"].iloc[-1]:,.2f}'
+    return texto + '.' + ressalva(resultado, 'Mes', 'gross income')
+
+
+def conclusao_2(resultado):
+    coluna = 'Desvio_Padrao_Total'
+    linhas = ordenar(resultado, coluna).dropna(subset=[coluna]).reset_index(drop=True)
+    if linhas.empty:
+        return 'Nenhuma hora da seleção atual tem vendas suficientes para calcular o desvio padrão.'
+    texto = (f'O valor das vendas varia mais às {linhas.loc[0, "Hour"]}h, '
+             f'com desvio padrão de R\\$ {linhas.loc[0, coluna]:,.2f}')
+    if len(linhas) > 1:
+        texto += f', e menos às {linhas["Hour"].iloc[-1]}h, com R\\$ {linhas[coluna].iloc[-1]:,.2f}'
+    return texto + '.' + ressalva(resultado, 'Hour', coluna)
+
+
+def conclusao_3(resultado):
+    linha = maior(resultado, 'Invoice ID')
+    return (f'O dia da semana com maior moda é {linha["Dia_Semana"]}, com {quantidade(linha, "Invoice ID")} registros.'
+            + ressalva(resultado, 'Dia_Semana', 'Invoice ID'))
+
+
+def graficos(df1, resultados):
+    """Funções sem argumentos que desenham o gráfico de cada pergunta."""
+    return {
+        1: partial(grafico_1, resultados[1]),
+        2: partial(grafico_2, resultados[2]),
+        3: partial(grafico_3, resultados[3]),
+    }
+
+
+def mostrar(df1, fonte, chave_dados):
+    resultados = calcular(fonte, medidor_atual())
+    desenhos = graficos(df1, resultados)
+
+    st.title('📅 Métricas sobre variações de dados em função do tempo')
+    st.markdown('''##### Para uma melhor noção a respeito dos dados, confira o DataSet completo abaixo:''')
+    mostrar_tabela(df1, 'temporal', chave_dados)
+    st.markdown('##### Vamos Responder a Perguntas de Negócios relacionados ao fator temporal:')
+    st.markdown('''
+1. Qual foi a média de vendas brutas (Gross Income) registrada a cada mês do ano?
+2. Qual é a variação (Desvio Padrão - Standard Deviation) no valor total das vendas (Total) em cada hora do dia?
+3. Qual é o dia da semana (Day of the Week) que registra o maior número de transações (Moda/Mais Frequente)?
+''')
+    
+    st.markdown("---")
+    st.markdown('1. Qual foi a média de vendas brutas (Gross Income) registrada a cada mês do ano?')
+    resultado = resultados[1]
+    mostrar_figura(chave_dados, PAGINA, 1, desenhos[1])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_1)
+    mostrar_intervalo(resultado)
+    st.markdown('---')  
+
+
+    st.markdown("Qual é a variação (Desvio Padrão - Standard Deviation) no valor total das vendas (Total) em cada hora do dia?")
+    variacao_por_hora = resultados[2]
+    mostrar_figura(chave_dados, PAGINA, 2, desenhos[2])
+    st.write(variacao_por_hora)
+    mostrar_conclusao(variacao_por_hora, conclusao_2)
+    mostrar_intervalo(variacao_por_hora)
+    st.markdown("---")
+
+
+    st.markdown('3. Qual é o dia da semana (Day of the Week) que registra o maior número de transações (Moda/Mais Frequente)?')
+    resultado = resultados[3]
+    mostrar_figura(chave_dados, PAGINA, 3, desenhos[3])
+    st.write(resultado)
+    mostrar_conclusao(resultado, conclusao_3)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    mostrar_janelas(df1, chave_dados)
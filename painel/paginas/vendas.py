@@ -0,0 +1,199 @@
+"""Página Vendas: receita, ticket médio e volume por filial, produto, dia e mês."""
+
+from functools import partial
+
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from painel.consultas import Consulta, calcular_perguntas
+from painel.conclusoes import maior, quantidade, ressalva
+from painel.recursos import medidor_atual, mostrar_conclusao, mostrar_figura, mostrar_intervalo
+from painel.tabela import mostrar_tabela
+
+PAGINA = 'Vendas'
+
+PERGUNTAS = {
+    1: Consulta('Branch', 'gross income', 'sum'),
+    2: Consulta('Branch', 'Total', 'mean', ordenar_por='Total'),
+    3: Consulta('Product line', 'Quantity', 'sum', ordenar_por='Quantity'),
+    4: Consulta('Dia_Semana', 'Invoice ID', 'linhas', ordenar_por='Invoice ID'),
+    5: Consulta('Mes', 'Total', 'sum', ordenar_por='Total'),
+}
+
+
+def calcular(fonte, medidor=None):
+    """Tabela de resposta de cada pergunta da página, indexada pelo número."""
+    return calcular_perguntas(PAGINA, PERGUNTAS, fonte, medidor)
+
+
+def grafico_1(resultado):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(resultado['Branch'], resultado['gross income'], color='mediumseagreen')
+    ax.set_title('Receita Total (Gross Income) por Filial', fontsize=16)
+    ax.set_xlabel('Receita Total (R$)', fontsize=12)
+    ax.set_ylabel('Filial (Branch)', fontsize=12)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    min_valor = resultado['gross income'].min()
+    novo_limite_min = min_valor * 0.95 
+    ax.set_xlim(novo_limite_min)
+    return fig
+
+
+def grafico_2(resultado):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(resultado['Branch'], resultado['Total'], color='orange')
+    ax.set_title('Média de Vendas por Filial')
+    ax.set_xlabel('Filial')
+    ax.set_ylabel('Média de Vendas (R$)')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    min_total = resultado['Total'].min()
+    ax.set_ylim(bottom=min_total - 10)
+    return fig
+
+
+def grafico_3(resultado):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(resultado['Product line'], resultado['Quantity'], color='green')
+    ax.set_title('Produtos Mais Vendidos')
+    ax.set_xlabel('Linha de Produto')
+    ax.set_ylabel('Quantidade Vendida')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.xticks(rotation=45, ha='right')
+    min_total = resultado['Quantity'].min()
+    ax.set_ylim(bottom=min_total - 50)
+    fig.tight_layout()
+    return fig
+
+
+def grafico_4(resultado):
+    fig, ax= plt.subplots(figsize=(8, 4))
+    ax.bar(resultado['Dia_Semana'], resultado['Invoice ID'], color='purple')
+    ax.set_title('Volume de Vendas por Dia da Semana')
+    ax.set_xlabel('Dia')
+    ax.set_ylabel('Total de Vendas')
+    plt.xticks(rotation=45, ha='right')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    menor_valor = resultado['Invoice ID'].min()
+    ax.set_ylim(bottom=(menor_valor-10))
+    fig.tight_layout()
+    return fig
+
+
+def grafico_5(resultado):
+    # Mes é categórica ordenada: ordenar por ela volta à ordem do calendário
+    mensal = resultado.sort_values('Mes')
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(mensal['Mes'], mensal['Total'], marker='o', color='red')
+    ax.set_title('Receita Total por Mês')
+    ax.set_xlabel('Mês')
+    ax.set_ylabel('Receita Total (R$)')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    # Adiciona todos os meses no eixo X
+    ax.set_xticks(mensal['Mes'])
+    fig.tight_layout()
+    return fig
+
+
+def conclusao_1(resultado):
+    linha = maior(resultado, 'gross income')
+    return (f"O maior faturamento foi da Branch {linha['Branch']} com R$ {linha['gross income']:,.2f}."
+            + ressalva(resultado, 'Branch', 'gross income'))
+
+
+def conclusao_2(resultado):
+    linha = maior(resultado, 'Total')
+    return ('A Branch com maior média de faturamento foi a Branch {}, com R${:.2f} de média.'.format(linha['Branch'], linha['Total'])
+            + ressalva(resultado, 'Branch', 'Total'))
+
+
+def conclusao_3(resultado):
+    linha = maior(resultado, 'Quantity')
+    return ('O produto com maior número de vendas foi o produto {}, com {} vendas.'.format(linha['Product line'], quantidade(linha, 'Quantity'))
+            + ressalva(resultado, 'Product line', 'Quantity'))
+
+
+def conclusao_4(resultado):
+    linha = maior(resultado, 'Invoice ID')
+    return ('O dia da semana que mais realizou vendas foi o dia {}, realizando {} vendas.'.format(linha['Dia_Semana'], quantidade(linha, 'Invoice ID'))
+            + ressalva(resultado, 'Dia_Semana', 'Invoice ID'))
+
+
+def conclusao_5(resultado):
+    linha = maior(resultado, 'Total')
+    return ('O mês com maior faturamento foi o mês de {}, com R${:,.2f} de faturamento.'.format(linha['Mes'], linha['Total'])
+            + ressalva(resultado, 'Mes', 'Total'))
+
+
+def graficos(df1, resultados):
+    """Funções sem argumentos que desenham o gráfico de cada pergunta."""
+    return {
+        1: partial(grafico_1, resultados[1]),
+        2: partial(grafico_2, resultados[2]),
+        3: partial(grafico_3, resultados[3]),
+        4: partial(grafico_4, resultados[4]),
+        5: partial(grafico_5, resultados[5]),
+    }
+
+
+def mostrar(df1, fonte, chave_dados):
+    resultados = calcular(fonte, medidor_atual())
+    desenhos = graficos(df1, resultados)
+
+    st.title('📈 Métricas de Vendas')
+    st.markdown('''##### Para uma melhor noção a respeito dos dados, confira o DataSet completo abaixo:''')
+    mostrar_tabela(df1, 'vendas', chave_dados)
+    st.markdown('##### Vamos Responder a Perguntas de Negócios relacionados a Vendas:')
+    st.markdown('''
+1. Qual é o total de receita (gross income) gerado por cada filial (Branch)?
+2. Qual filial teve a maior média de vendas?
+3. Qual é o produto mais vendido (por Product line)?
+4. Qual é o dia da semana com maior volume de vendas?
+5. Qual é o mês com maior receita total?
+''')
+    
+    st.markdown('##### Respostas:')
+
+    # 1. Receita total por filial
+    st.markdown('1. Qual é o total de receita (gross income) gerado por cada filial (Branch)?')
+    resultado = resultados[1]
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_figura(chave_dados, PAGINA, 1, desenhos[1])
+    mostrar_conclusao(resultado, conclusao_1)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    # 2. Filial com maior média de vendas
+    st.markdown('2. Qual filial teve a maior média de vendas?')
+    resultado = resultados[2]
+    mostrar_figura(chave_dados, PAGINA, 2, desenhos[2])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_2)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+    
+    # 3. Produto mais vendido (por Product line)
+    st.markdown('3. Qual é o produto mais vendido (por Product line)?')
+    resultado = resultados[3]
+    mostrar_figura(chave_dados, PAGINA, 3, desenhos[3])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_3)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+    
+    # 4. Dia da semana com maior volume de vendas
+    st.markdown('4. Qual é o dia da semana com maior volume de vendas?')
+    resultado = resultados[4]
+    mostrar_figura(chave_dados, PAGINA, 4, desenhos[4])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_4)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
+
+    # 5. Mês com maior receita total
+    st.markdown('5. Qual é o mês com maior receita total?')
+    resultado = resultados[5]
+    mostrar_figura(chave_dados, PAGINA, 5, desenhos[5])
+    st.dataframe(resultado, use_container_width=True)
+    mostrar_conclusao(resultado, conclusao_5)
+    mostrar_intervalo(resultado)
+    st.markdown('---')
@@ -0,0 +1,152 @@
+"""Agregação paralela por partições para históricos grandes.
+
+O cubo de agregação (painel.cubo) é montado por um único processo pandas.
+Aqui o histórico é primeiro gravado em disco particionado por mês do ano e
+por filial (diretórios no estilo hive, `particao_mes=1/particao_filial=A/`),
+lendo a origem em blocos (painel.ingestao). Depois cada partição é lida,
+tratada e reduzida a um cubo parcial em um processo separado: cada processo
+lê só os arquivos da sua partição e devolve só o cubo parcial.
+
+Os parciais são combináveis sem perda: contagens e somas se somam e os M2
+(variância de Welford) são juntados pela fórmula de Chan em
+`combinar_cubos`. Como mês e filial são dimensões do cubo, as partições
+não compartilham células e a combinação se reduz a empilhar os parciais.
+O top-k de linhas de produto também sai exato, pois cada parcial leva o
+total de todas as linhas de produto, e não só o seu top-k.
+
+A gravação particionada é feita uma vez por versão do arquivo; os recálculos
+seguintes só leem as partições.
+
+    python -m painel.paralelo vendas.parquet --pasta particoes --processos 1 8 32
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from painel.cubo import combinar_cubos, consultar, construir_cubo
+from painel.dados import preparar
+from painel.ingestao import TAMANHO_BLOCO, ler_em_blocos
+
+# Colunas extras que só existem nos nomes dos diretórios
+PARTICOES = {
+    'particao_mes': lambda bloco: bloco['Date'].dt.month.astype('Int8'),
+    'particao_filial': lambda bloco: bloco['Branch'],
+}
+
+
+def gravar_particoes(origem, pasta, tamanho_bloco=TAMANHO_BLOCO):
+    """Regrava `origem` (xlsx, csv ou parquet) particionado por mês e filial.
+
+    Retorna o número de linhas gravadas. A `pasta` é recriada do zero.
+    """
+    import shutil
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    pasta = Path(pasta)
+    if pasta.exists():
+        shutil.rmtree(pasta)
+
+    linhas = 0
+    for numero, bloco in enumerate(ler_em_blocos(origem, tamanho_bloco)):
+        # O xlsx lido em blocos traz datas como objetos Python misturados;
+        # converter aqui é o mesmo que preparar() faria depois
+        bloco['Date'] = pd.to_datetime(bloco['Date'], errors='coerce')
+        colunas = {nome: calcular(bloco) for nome, calcular in PARTICOES.items()}
+        tabela = pa.Table.from_pandas(bloco.assign(**colunas), preserve_index=False)
+        ds.write_dataset(
+            tabela, pasta, format='parquet',
+            partitioning=list(PARTICOES), partitioning_flavor='hive',
+            basename_template=f'bloco{numero:05d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        linhas += len(bloco)
+    return linhas
+
+
+def listar_particoes(pasta):
+    """Diretórios folha (uma partição cada) da gravação particionada."""
+    return sorted({str(arquivo.parent) for arquivo in Path(pasta).rglob('*.parquet')})
+
+
+def agregar_particao(diretorio):
+    """Lê uma partição, trata e devolve `(cubo_parcial, linhas)`.
+
+    Roda dentro dos processos do pool, então recebe só o diretório e
+    devolve só o cubo.
+    """
+    df = pd.read_parquet(diretorio)
+    if df.empty:
+        return None, 0
+    return construir_cubo(preparar(df)), len(df)
+
+
+def agregar_em_paralelo(pasta, processos=None):
+    """Cubo de todas as partições de `pasta`, agregadas em `processos` processos.
+
+    Retorna `(cubo, linhas_lidas)`, o mesmo que painel.ingestao.ingerir.
+    Com `processos=1` tudo roda no processo atual, sem pool.
+    """
+    diretorios = listar_particoes(pasta)
+    processos = min(processos or os.cpu_count() or 1, len(diretorios))
+    if processos <= 1:
+        parciais = [agregar_particao(diretorio) for diretorio in diretorios]
+    else:
+        # spawn em vez de fork: o Streamlit mantém threads vivas e um fork
+        # no meio delas pode herdar travas presas
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processos, mp_context=contexto) as pool:
+            parciais = list(pool.map(agregar_particao, diretorios))
+
+    cubo = combinar_cubos(*(parcial for parcial, _ in parciais), disjuntos=True)
+    return cubo, sum(linhas for _, linhas in parciais)
+
+
+def mais_vendidos(cubo, k=3, dimensao='Product line', medida='Quantity'):
+    """Top-k de `dimensao` pela soma de `medida`, a partir do cubo combinado."""
+    totais = consultar(cubo, dimensao, medida, 'sum')
+    return totais.nlargest(k, medida).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Agrega um arquivo de vendas em paralelo, por partições.')
+    parser.add_argument('arquivo', help='arquivo .xlsx, .csv ou .parquet')
+    parser.add_argument('--pasta', required=True, help='onde ficam as partições gravadas')
+    parser.add_argument('--regravar', action='store_true', help='grava as partições mesmo que a pasta já exista')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco na gravação')
+    parser.add_argument('--processos', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help='vários valores medem a escalabilidade, ex.: 1 2 4 8 16 32')
+    parser.add_argument('--top', type=int, default=3, help='quantas linhas de produto mostrar')
+    parser.add_argument('--saida', help='grava o cubo resultante neste arquivo Parquet')
+    args = parser.parse_args(argv)
+
+    if args.regravar or not Path(args.pasta).exists():
+        inicio = time.perf_counter()
+        linhas = gravar_particoes(args.arquivo, args.pasta, args.bloco)
+        print(f'{linhas} linhas gravadas em {len(listar_particoes(args.pasta))} partições '
+              f'em {time.perf_counter() - inicio:.2f} s')
+
+    base = None
+    for processos in args.processos:
+        inicio = time.perf_counter()
+        cubo, linhas = agregar_em_paralelo(args.pasta, processos)
+        segundos = time.perf_counter() - inicio
+        base = base or segundos
+        print(f'{processos:>3} processos: {segundos:8.2f} s  (aceleração {base / segundos:4.1f}x)')
+
+    print(f'{linhas} linhas lidas, {0 if cubo is None else len(cubo)} células no cubo')
+    if cubo is not None:
+        print(mais_vendidos(cubo, args.top).to_string(index=False))
+        if args.saida:
+            cubo.to_parquet(args.saida, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Recursos em cache compartilhados entre as páginas e as sessões do Streamlit.
+
+Tudo aqui usa `st.cache_resource`, então cada objeto é criado uma vez por
+processo (e por versão do arquivo de dados) e reaproveitado em todos os
+reruns. O matplotlib só é importado quando a primeira figura é desenhada.
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from painel.amostragem import MARGEM, Estimativa
+from painel.cubo import construir_cubo
+from painel.densidade import amostra_por_grupo, resumo_violino
+from painel.metricas import Historico, Medidor
+
+
+# Um atualizador por processo e por arquivo: ele guarda a versão atual dos
+# dados (DataFrame, cubo e índice dos filtros) para todas as sessões e monta
+# as versões seguintes em segundo plano quando o arquivo muda
+# (painel.atualizacao). O DataFrame é somente leitura e aponta para o .arrow
+# mapeado (painel.dados), então a memória dele é dividida com os outros
+# processos que abrem a mesma versão. Com PAINEL_ESTADO=<arquivo SQLite> o
+# atualizador também vigia o estado incremental (painel.incremental) e cada
+# anexação vira uma versão nova, com as perguntas respondidas pelo cubo dele.
+@st.cache_resource(show_spinner='Carregando dados...')
+def obter_atualizador(caminho, estado=None):
+    from painel.atualizacao import Atualizador
+
+    return Atualizador(caminho, estado)
+
+
+def abrir_atualizador(caminho):
+    return obter_atualizador(caminho, os.environ.get('PAINEL_ESTADO') or None)
+
+
+# Motor DuckDB sobre o Parquet tratado de uma versão (PAINEL_MOTOR=duckdb).
+@st.cache_resource(max_entries=2, show_spinner='Abrindo o DuckDB...')
+def obter_motor_duckdb(parquet, chave):
+    from painel.motores import MotorDuckDB
+
+    return MotorDuckDB(parquet)
+
+
+def abrir_motor_duckdb(parquet, chave):
+    """Motor DuckDB da versão, ou None (com um aviso na página) se o duckdb não está instalado."""
+    try:
+        return obter_motor_duckdb(parquet, chave)
+    except ImportError:
+        st.warning('PAINEL_MOTOR=duckdb, mas o duckdb não está instalado (`pip install duckdb`); '
+                   'as perguntas rodam sobre o cubo em memória.')
+        return None
+
+
+# Pacote estático de painel.relatorio (PAINEL_PACOTE=<pasta>). A chave é o
+# mtime do manifesto, então um pacote regerado é relido sem reiniciar o app.
+@st.cache_resource
+def obter_pacote(pasta, chave):
+    from painel.relatorio import Pacote
+
+    return Pacote(pasta)
+
+
+def abrir_pacote():
+    pasta = os.environ.get('PAINEL_PACOTE')
+    if not pasta:
+        return None
+    return obter_pacote(pasta, os.stat(os.path.join(pasta, 'manifesto.json')).st_mtime_ns)
+
+
+def pacote_atual():
+    """Pacote em uso neste rerun; com filtros ativos as páginas não usam o pacote."""
+    return st.session_state.get('_pacote')
+
+
+# Uma visão por combinação de filtros e versão dos dados: só as linhas
+# selecionadas são copiadas e o cubo da visão é montado só com elas
+@st.cache_resource(max_entries=16, show_spinner='Aplicando filtros...')
+def obter_visao(_versao, chave, filtros):
+    posicoes = _versao.indice.selecionar(filtros)
+    visao = _versao.df1.iloc[posicoes]
+    return visao, construir_cubo(visao)
+
+
+# Amostra estratificada do modo aproximado, uma por versão dos dados (ou por
+# visão filtrada, já que a chave inclui os filtros)
+@st.cache_resource(max_entries=8, show_spinner='Montando a amostra estratificada...')
+def obter_motor_amostra(_df, chave):
+    from painel.amostragem import MotorAmostra
+
+    return MotorAmostra(_df)
+
+
+def mostrar_conclusao(resultado, texto):
+    """Mostra a conclusão `texto(resultado)`; sem linhas no resultado não há o que concluir."""
+    if isinstance(resultado, pd.DataFrame) and resultado.empty:
+        st.caption('Nenhuma venda da seleção atual responde a esta pergunta.')
+        return
+    st.info(texto(resultado))
+
+
+def mostrar_intervalo(resultado):
+    """No modo aproximado, mostra o intervalo de 95% de cada valor da resposta."""
+    if isinstance(resultado, Estimativa):
+        st.caption(f'Estimativa por amostragem: {resultado:,.4f} ± {resultado.margem:,.4f} (IC 95%)')
+        return
+    if not isinstance(resultado, pd.DataFrame) or MARGEM not in resultado.columns:
+        return
+    posicao = resultado.columns.get_loc(MARGEM)
+    valor, dims = resultado.columns[posicao - 1], list(resultado.columns[:posicao - 1])
+    itens = []
+    for _, linha in resultado.iterrows():
+        margem = 'sem intervalo' if pd.isna(linha[MARGEM]) else f'± {linha[MARGEM]:,.2f}'
+        itens.append(f'{" / ".join(str(linha[d]) for d in dims)}: {linha[valor]:,.2f} {margem}')
+    st.caption('Estimativas por amostragem (IC 95%): ' + '; '.join(itens))
+
+
+# Índice de somas acumuladas da página Temporal, por visão dos dados e
+# granularidade; cada janela e cada média móvel sai dele sem varrer as linhas
+@st.cache_resource(max_entries=8, show_spinner='Indexando as datas...')
+def obter_indice_temporal(_df, chave, granularidade):
+    from painel.janelas import IndiceTemporal
+
+    return IndiceTemporal(_df, granularidade=granularidade)
+
+
+# Correlações e intervalos da página Satisfação, uma vez por visão dos dados
+@st.cache_resource(max_entries=8, show_spinner='Calculando correlações...')
+def obter_correlacoes(_df, chave):
+    from painel.correlacao import Correlacoes
+
+    return Correlacoes(_df)
+
+
+# Resumo do violino de Satisfação, por visão dos dados (a chave inclui os filtros)
+@st.cache_resource(max_entries=16)
+def obter_resumo_violino(_df, chave, grupo, valor):
+    return resumo_violino(_df, grupo, valor), amostra_por_grupo(_df[[grupo, valor]], grupo)
+
+
+# Cache de imagens compartilhado entre as sessões. Cada gráfico é desenhado
+# dentro de uma função, que só é chamada quando a imagem ainda não está no cache.
+@st.cache_resource
+def obter_cache_figuras():
+    from painel.graficos import CacheFiguras
+
+    return CacheFiguras()
+
+
+# Histórico das medições de todas as sessões, exportado pelo painel de desempenho.
+@st.cache_resource
+def obter_historico():
+    return Historico()
+
+
+def medidor_atual():
+    """Medidor do rerun atual; fora do app (benchmark, testes) mede em um descartável."""
+    return st.session_state.get('_medidor') or Medidor()
+
+
+def mostrar_figura(chave_dados, pagina, pergunta, desenhar):
+    pacote = pacote_atual()
+    with medidor_atual().secao(f'{pagina}/{pergunta}', 'grafico') as registro:
+        imagem = pacote and pacote.imagem(pagina, pergunta)
+        if imagem is None:
+            imagem = obter_cache_figuras().obter(pagina, pergunta, chave_dados, desenhar)
+        st.image(imagem, use_container_width=True)
+        registro['payload_bytes'] = len(imagem)
+
+
+def mostrar_plotly(pagina, pergunta, desenhar):
+    # Serializar a figura só para medir custa tempo, então o payload só é
+    # calculado com o painel de desempenho aberto.
+    medidor = medidor_atual()
+    pacote = pacote_atual()
+    with medidor.secao(f'{pagina}/{pergunta}', 'grafico') as registro:
+        fig = pacote and pacote.figura_plotly(pagina, pergunta)
+        if fig is None:
+            fig = desenhar()
+        st.plotly_chart(fig, use_container_width=True)
+        if medidor.detalhado:
+            registro['payload_bytes'] = len(fig.to_json())
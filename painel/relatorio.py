@@ -0,0 +1,273 @@
+"""Relatório estático: todas as respostas pré-calculadas, sem servidor Streamlit.
+
+A maioria das visitas só lê as mesmas respostas fixas. Este módulo roda a
+lógica das páginas fora do Streamlit e grava um pacote por arquivo de
+vendas:
+
+* `consultas/*.parquet`: a tabela de cada consulta (painel.consultas), com
+  os agregados gerais guardados direto no manifesto;
+* `figuras/*.png` e `figuras/*.json`: cada gráfico renderizado (matplotlib
+  em PNG, plotly em JSON), desenhados em paralelo por um pool de processos;
+* `correlacoes.parquet`: a tabela de correlações da página Satisfação, com
+  as matrizes de cada grupo no manifesto;
+* `index.html`: uma página estática com todos os gráficos e tabelas;
+* `manifesto.json`: o índice de tudo, com a chave da versão dos dados.
+
+O app serve o pacote com PAINEL_PACOTE=<pasta>: o `Pacote` tem a mesma
+interface dos motores de painel.motores, então as páginas leem as tabelas
+prontas e as figuras saem do disco, sem agregar nem desenhar nada.
+
+    python -m painel.relatorio loja1.xlsx loja2.xlsx --saida relatorios --processos 8
+"""
+
+import argparse
+import hashlib
+import html
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from painel.cubo import _normalizar, construir_cubo
+from painel.dados import _temporario, carregar_compartilhado, chave_arquivo
+from painel.paginas import PAGINAS_PERGUNTAS
+
+VERSAO_PACOTE = 2
+
+
+def chave_consulta(dimensoes, medida, estatistica):
+    """Nome estável do arquivo de uma consulta dentro do pacote."""
+    bruto = json.dumps([_normalizar(dimensoes), medida, estatistica], ensure_ascii=False)
+    return hashlib.sha256(bruto.encode('utf-8')).hexdigest()[:16]
+
+
+def _nome_figura(pagina, numero):
+    return f'{PAGINAS_PERGUNTAS[pagina].rsplit(".", 1)[1]}_{numero}'
+
+
+# Estado de cada processo do pool: o DataFrame e os resultados de cada página
+# são carregados uma vez por processo, não uma vez por gráfico. O DataFrame é
+# o .arrow mapeado, então os processos dividem a mesma memória física.
+_ESTADO = {}
+
+
+def _iniciar_processo(origem, resultados):
+    _ESTADO['df1'] = carregar_compartilhado(origem)
+    _ESTADO['resultados'] = resultados
+
+
+def _desenhar(pagina, numero):
+    from painel.graficos import renderizar_desenho
+
+    modulo = importlib.import_module(PAGINAS_PERGUNTAS[pagina])
+    desenhos = modulo.graficos(_ESTADO['df1'], _ESTADO['resultados'][pagina])
+    return renderizar_desenho(desenhos[numero])
+
+
+def _html(manifesto, pasta, resultados):
+    partes = [
+        '<!DOCTYPE html><html lang="pt-br"><head><meta charset="utf-8">',
+        f'<title>Supermarket Sales — {html.escape(manifesto["origem"])}</title>',
+        '<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>',
+        '<style>body{background:#0e1117;color:#fafafa;font-family:sans-serif;max-width:1100px;margin:auto}'
+        'img{max-width:100%}table{border-collapse:collapse}td,th{border:1px solid #444;padding:2px 8px}</style>',
+        '</head><body>',
+        f'<h1>Supermarket Sales — {html.escape(manifesto["origem"])}</h1>',
+        f'<p>Gerado em {html.escape(manifesto["gerado_em"])}</p>',
+    ]
+    for pagina, perguntas in manifesto['paginas'].items():
+        partes.append(f'<h2>{html.escape(pagina)}</h2>')
+        for numero, itens in perguntas.items():
+            partes.append(f'<h3>Pergunta {numero}</h3>')
+            figura = itens.get('figura')
+            if figura and figura.endswith('.png'):
+                partes.append(f'<img src="{figura}" alt="{html.escape(pagina)} {numero}">')
+            elif figura:
+                div = f'fig-{Path(figura).stem}'
+                conteudo = (Path(pasta) / figura).read_text(encoding='utf-8')
+                partes.append(f'<div id="{div}"></div><script>'
+                              f'(function(f){{Plotly.newPlot("{div}",f.data,f.layout)}})({conteudo});</script>')
+            resultado = resultados[pagina].get(int(numero))
+            if isinstance(resultado, pd.DataFrame):
+                partes.append(resultado.to_html(index=False, border=0))
+            elif resultado is not None:
+                partes.append(f'<p>{resultado}</p>')
+    partes.append('</body></html>')
+    return '\n'.join(partes)
+
+
+def gerar_pacote(origem, pasta, processos=None):
+    """Calcula todas as perguntas e gráficos de `origem` e grava o pacote em `pasta`."""
+    from painel.consultas import executar
+
+    pasta = Path(pasta)
+    (pasta / 'consultas').mkdir(parents=True, exist_ok=True)
+    (pasta / 'figuras').mkdir(parents=True, exist_ok=True)
+
+    df1 = carregar_compartilhado(origem)
+    cubo = construir_cubo(df1)
+
+    manifesto = {
+        'versao': VERSAO_PACOTE,
+        'origem': Path(origem).name,
+        'chave_dados': chave_arquivo(origem),
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'consultas': {},
+        'paginas': {},
+    }
+    resultados = {}
+    tarefas = []
+    for pagina, nome_modulo in PAGINAS_PERGUNTAS.items():
+        modulo = importlib.import_module(nome_modulo)
+        resultados[pagina] = modulo.calcular(cubo)
+        itens = manifesto['paginas'][pagina] = {}
+        for numero, consulta in modulo.PERGUNTAS.items():
+            # Grava o agregado bruto; renomear e ordenar ficam com executar(),
+            # como em qualquer outra fonte
+            chave = chave_consulta(consulta.dimensoes, consulta.medida, consulta.estatistica)
+            bruto = executar(consulta._replace(ordenar_por=None, renomear=None), cubo)
+            if isinstance(bruto, pd.DataFrame):
+                arquivo = f'consultas/{chave}.parquet'
+                bruto.to_parquet(pasta / arquivo, index=False)
+                manifesto['consultas'][chave] = {'arquivo': arquivo}
+            else:
+                manifesto['consultas'][chave] = {'valor': bruto.item() if hasattr(bruto, 'item') else bruto}
+            itens.setdefault(str(numero), {})['consulta'] = chave
+        for numero in modulo.graficos(df1, resultados[pagina]):
+            tarefas.append((pagina, numero))
+
+    # As correlações (com o bootstrap) são a parte mais cara da página
+    # Satisfação e também não mudam entre as visitas
+    from painel.correlacao import Correlacoes
+
+    correlacoes = Correlacoes(df1)
+    correlacoes.tabela.to_parquet(pasta / 'correlacoes.parquet', index=False)
+    manifesto['correlacoes'] = {'arquivo': 'correlacoes.parquet', 'matrizes': correlacoes.para_pacote()}
+
+    # O pool só desenha; cada processo mapeia o .arrow já publicado por
+    # carregar_compartilhado acima e recebe os resultados prontos
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    if processos <= 1:
+        _iniciar_processo(origem, resultados)
+        figuras = [_desenhar(pagina, numero) for pagina, numero in tarefas]
+    else:
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processos, mp_context=contexto, initializer=_iniciar_processo,
+                                 initargs=(origem, resultados)) as pool:
+            figuras = list(pool.map(_desenhar, *zip(*tarefas)))
+
+    for (pagina, numero), figura in zip(tarefas, figuras):
+        if isinstance(figura, bytes):
+            arquivo = f'figuras/{_nome_figura(pagina, numero)}.png'
+            (pasta / arquivo).write_bytes(figura)
+        else:
+            arquivo = f'figuras/{_nome_figura(pagina, numero)}.json'
+            (pasta / arquivo).write_text(figura, encoding='utf-8')
+        manifesto['paginas'][pagina].setdefault(str(numero), {})['figura'] = arquivo
+
+    for pagina, itens in manifesto['paginas'].items():
+        manifesto['paginas'][pagina] = dict(sorted(itens.items(), key=lambda item: int(item[0])))
+    (pasta / 'index.html').write_text(_html(manifesto, pasta, resultados), encoding='utf-8')
+    # O manifesto é gravado por último e de forma atômica: um pacote sem
+    # manifesto é um pacote incompleto
+    temporario = _temporario(pasta / 'manifesto.json')
+    try:
+        temporario.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(temporario, pasta / 'manifesto.json')
+    finally:
+        temporario.unlink(missing_ok=True)
+    return manifesto
+
+
+class Pacote:
+    """Pacote gravado por `gerar_pacote`, usado como fonte das páginas.
+
+    Tem a mesma interface dos motores de painel.motores (`agregar`) e
+    também devolve as figuras prontas.
+    """
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        with open(self.pasta / 'manifesto.json', encoding='utf-8') as arquivo:
+            self.manifesto = json.load(arquivo)
+        self._tabelas = {}
+
+    def agregar(self, dimensoes, medida, estatistica='sum', filtros=None):
+        if filtros:
+            raise ValueError('O pacote estático só tem as respostas sem filtro')
+        chave = chave_consulta(dimensoes, medida, estatistica)
+        consulta = self.manifesto['consultas'].get(chave)
+        if consulta is None:
+            raise KeyError(f'Consulta fora do pacote: {dimensoes!r}, {medida!r}, {estatistica!r}')
+        if 'valor' in consulta:
+            return consulta['valor']
+        if chave not in self._tabelas:
+            self._tabelas[chave] = pd.read_parquet(self.pasta / consulta['arquivo'])
+        return self._tabelas[chave].copy()
+
+    def correlacoes(self):
+        """Correlações prontas da página Satisfação, ou None num pacote que não as tem."""
+        itens = self.manifesto.get('correlacoes')
+        if itens is None:
+            return None
+        if 'correlacoes' not in self._tabelas:
+            from painel.correlacao import CorrelacoesProntas
+
+            tabela = pd.read_parquet(self.pasta / itens['arquivo'])
+            self._tabelas['correlacoes'] = CorrelacoesProntas(tabela, itens['matrizes'])
+        return self._tabelas['correlacoes']
+
+    def _figura(self, pagina, numero):
+        arquivo = self.manifesto['paginas'].get(pagina, {}).get(str(numero), {}).get('figura')
+        return None if arquivo is None else self.pasta / arquivo
+
+    def imagem(self, pagina, numero):
+        """Bytes do PNG da pergunta, ou None se o gráfico não é matplotlib."""
+        caminho = self._figura(pagina, numero)
+        if caminho is None or caminho.suffix != '.png':
+            return None
+        return caminho.read_bytes()
+
+    def figura_plotly(self, pagina, numero):
+        """Figura plotly da pergunta, ou None se o gráfico não é plotly."""
+        caminho = self._figura(pagina, numero)
+        if caminho is None or caminho.suffix != '.json':
+            return None
+        import plotly.io as pio
+
+        return pio.from_json(caminho.read_text(encoding='utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera o relatório estático de cada arquivo de vendas.')
+    parser.add_argument('arquivos', nargs='+', help='arquivos .xlsx, .csv ou .parquet (um por loja)')
+    parser.add_argument('--saida', default='relatorios', help='pasta onde cada pacote é criado')
+    parser.add_argument('--processos', type=int, default=None, help='processos para desenhar os gráficos')
+    args = parser.parse_args(argv)
+
+    # Cada pacote vai para uma pasta com o nome do arquivo: dois arquivos com
+    # o mesmo nome (a/loja.xlsx e b/loja.xlsx) gravariam um por cima do outro
+    destinos = {}
+    for origem in args.arquivos:
+        destinos.setdefault(Path(origem).stem, []).append(origem)
+    repetidos = [' e '.join(origens) for origens in destinos.values() if len(origens) > 1]
+    if repetidos:
+        parser.error(f'arquivos com o mesmo nome iriam para a mesma pasta: {"; ".join(repetidos)}')
+
+    for origem in args.arquivos:
+        inicio = time.perf_counter()
+        destino = Path(args.saida) / Path(origem).stem
+        manifesto = gerar_pacote(origem, destino, args.processos)
+        figuras = sum(1 for itens in manifesto['paginas'].values() for item in itens.values() if 'figura' in item)
+        print(f'{origem}: {len(manifesto["consultas"])} consultas e {figuras} gráficos em {destino} '
+              f'({time.perf_counter() - inicio:.1f} s)')
+
+
+if __name__ == '__main__':
+    main()
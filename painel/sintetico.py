@@ -0,0 +1,157 @@
+"""Gerador de dados sintéticos no mesmo esquema do supermarket_sales.xlsx.
+
+Serve para medir como o dashboard escala: gera de mil a centenas de milhões
+de linhas, em blocos, com as mesmas colunas e as mesmas relações entre elas
+(cogs = preço x quantidade, imposto de 5%, Total = cogs + imposto, cada
+filial em uma cidade). A cardinalidade das dimensões é configurável.
+
+    python -m painel.sintetico vendas_1M.parquet --linhas 1000000
+    python -m painel.sintetico vendas_10k.csv --linhas 10000 --filiais 12
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FILIAIS = ['A', 'B', 'C']
+CIDADES = ['Yangon', 'Mandalay', 'Naypyitaw']
+LINHAS_PRODUTO = [
+    'Electronic_accessories', 'Fashion_accessories', 'Food_and_beverages',
+    'Health_and_beauty', 'Home_and_lifestyle', 'Sports_and_travel',
+]
+PAGAMENTOS = ['Ewallet', 'Cash', 'Credit card']
+COLUNAS = [
+    'Invoice ID', 'Branch', 'City', 'Customer type', 'Gender', 'Product line',
+    'Unit price', 'Quantity', 'Tax 5%', 'Total', 'Date', 'Time', 'Payment',
+    'cogs', 'gross margin percentage', 'gross income', 'Rating',
+]
+TAMANHO_BLOCO = 1_000_000
+
+# Multiplicador coprimo com 10^9: espalha os números sequenciais das notas
+# sem repetir nenhum Invoice ID enquanto houver menos de 10^9 linhas
+_MULTIPLICADOR_NOTA = 387_420_489
+
+
+def _texto_notas(sequencia):
+    """Formata números de 9 dígitos como 'ddd-dd-dddd' sem laço em Python."""
+    casas = 10 ** np.arange(8, -1, -1, dtype='int64')
+    digitos = (sequencia[:, None] // casas) % 10 + ord('0')
+    caracteres = np.full((len(sequencia), 11), ord('-'), dtype='uint8')
+    caracteres[:, [0, 1, 2, 4, 5, 7, 8, 9, 10]] = digitos
+    return caracteres.view('S11').ravel().astype(str)
+
+
+# Horários possíveis (10:00 a 20:59, de minuto em minuto) já formatados
+_HORARIOS = np.array([f'{h:02d}:{m:02d}:00' for h in range(10, 21) for m in range(60)])
+
+
+def _nomes(base, quantidade, prefixo):
+    if quantidade <= len(base):
+        return base[:quantidade]
+    return base + [f'{prefixo}_{i}' for i in range(len(base), quantidade)]
+
+
+def gerar(linhas, filiais=3, linhas_produto=6, pagamentos=3,
+          inicio='2019-01-01', dias=365, semente=0, deslocamento=0):
+    """Gera um DataFrame bruto com `linhas` vendas sintéticas.
+
+    `deslocamento` é o número da primeira nota; blocos gerados com
+    deslocamentos diferentes nunca repetem Invoice ID.
+    """
+    rng = np.random.default_rng([semente, deslocamento])
+    nomes_filiais = _nomes(FILIAIS, filiais, 'Filial')
+    nomes_cidades = _nomes(CIDADES, filiais, 'Cidade')
+    nomes_produtos = _nomes(LINHAS_PRODUTO, linhas_produto, 'Produto')
+    nomes_pagamentos = _nomes(PAGAMENTOS, pagamentos, 'Pagamento')
+
+    sequencia = (np.arange(deslocamento, deslocamento + linhas, dtype='int64')
+                 * _MULTIPLICADOR_NOTA) % 1_000_000_000
+
+    filial = rng.integers(0, filiais, linhas)
+    preco = np.round(rng.uniform(10, 100, linhas), 2)
+    quantidade = rng.integers(1, 11, linhas)
+    cogs = np.round(preco * quantidade, 2)
+    imposto = np.round(cogs * 0.05, 4)
+
+    datas = np.datetime64(inicio, 'D') + rng.integers(0, dias, linhas).astype('timedelta64[D]')
+
+    return pd.DataFrame({
+        'Invoice ID': _texto_notas(sequencia),
+        'Branch': np.asarray(nomes_filiais)[filial],
+        'City': np.asarray(nomes_cidades)[filial],
+        'Customer type': np.where(rng.random(linhas) < 0.5, 'Member', 'Normal'),
+        'Gender': np.where(rng.random(linhas) < 0.5, 'Female', 'Male'),
+        'Product line': np.asarray(nomes_produtos)[rng.integers(0, linhas_produto, linhas)],
+        'Unit price': preco,
+        'Quantity': quantidade,
+        'Tax 5%': imposto,
+        'Total': np.round(cogs + imposto, 4),
+        'Date': datas.astype('datetime64[ns]'),
+        'Time': _HORARIOS[rng.integers(0, len(_HORARIOS), linhas)],
+        'Payment': np.asarray(nomes_pagamentos)[rng.integers(0, pagamentos, linhas)],
+        'cogs': cogs,
+        'gross margin percentage': np.full(linhas, 100 / 21),
+        'gross income': imposto,
+        'Rating': np.round(rng.uniform(4, 10, linhas), 1),
+    }, columns=COLUNAS)
+
+
+def gerar_blocos(linhas, tamanho_bloco=TAMANHO_BLOCO, **opcoes):
+    """Gera os dados em blocos de até `tamanho_bloco` linhas."""
+    for inicio in range(0, linhas, tamanho_bloco):
+        yield gerar(min(tamanho_bloco, linhas - inicio), deslocamento=inicio, **opcoes)
+
+
+def gravar(caminho, linhas, tamanho_bloco=TAMANHO_BLOCO, **opcoes):
+    """Grava os dados sintéticos em .parquet, .csv ou .xlsx, bloco a bloco."""
+    caminho = Path(caminho)
+    sufixo = caminho.suffix.lower()
+    if sufixo == '.xlsx':
+        # O Excel não tem escrita incremental e aceita no máximo ~1M de linhas
+        gerar(linhas, **opcoes).to_excel(caminho, index=False)
+        return
+    if sufixo == '.csv':
+        for numero, bloco in enumerate(gerar_blocos(linhas, tamanho_bloco, **opcoes)):
+            bloco.to_csv(caminho, mode='w' if numero == 0 else 'a', header=numero == 0, index=False)
+        return
+    if sufixo == '.parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        escritor = None
+        try:
+            for bloco in gerar_blocos(linhas, tamanho_bloco, **opcoes):
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(caminho, tabela.schema)
+                escritor.write_table(tabela)
+        finally:
+            if escritor is not None:
+                escritor.close()
+        return
+    raise ValueError(f'Formato de arquivo não suportado: {caminho}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera vendas sintéticas no esquema do supermarket_sales.')
+    parser.add_argument('saida', help='arquivo .parquet, .csv ou .xlsx')
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas por bloco')
+    parser.add_argument('--filiais', type=int, default=3)
+    parser.add_argument('--produtos', type=int, default=6)
+    parser.add_argument('--pagamentos', type=int, default=3)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    gravar(
+        args.saida, args.linhas, args.bloco,
+        filiais=args.filiais, linhas_produto=args.produtos, pagamentos=args.pagamentos,
+        dias=args.dias, semente=args.semente,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Tabela paginada no servidor para o DataSet completo.
+
+`st.dataframe(df1)` serializa todas as linhas para Arrow e envia tudo ao
+navegador a cada rerun. Este componente mantém a ordenação e o filtro no
+servidor e envia só a fatia da página visível. Os índices de ordenação e as
+posições filtradas ficam em cache, então trocar de página custa apenas o
+tamanho da página.
+"""
+
+import numpy as np
+import streamlit as st
+
+from painel.recursos import medidor_atual
+
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+SEM_COLUNA = '(nenhuma)'
+
+
+@st.cache_resource(max_entries=32)
+def indice_ordenacao(_df, chave_dados, coluna, crescente):
+    """Posições das linhas na ordem de `coluna` (ordenação estável)."""
+    if coluna is None:
+        return np.arange(len(_df))
+    valores = _df[coluna].reset_index(drop=True)
+    return valores.sort_values(ascending=crescente, kind='stable', na_position='last').index.to_numpy()
+
+
+@st.cache_resource(max_entries=32)
+def posicoes_visiveis(_df, chave_dados, coluna_filtro, texto_filtro, coluna_ordem, crescente):
+    """Posições ordenadas das linhas que passam pelo filtro de texto."""
+    ordem = indice_ordenacao(_df, chave_dados, coluna_ordem, crescente)
+    if coluna_filtro is None or not texto_filtro:
+        return ordem
+    mascara = (
+        _df[coluna_filtro].astype(str)
+        .str.contains(texto_filtro, case=False, regex=False)
+        .to_numpy()
+    )
+    return ordem[mascara[ordem]]
+
+
+def fatia_pagina(df, posicoes, pagina, tamanho):
+    """Retorna só as linhas da página pedida (páginas começam em 1)."""
+    inicio = (pagina - 1) * tamanho
+    return df.iloc[posicoes[inicio:inicio + tamanho]]
+
+
+def mostrar_tabela(df, chave, chave_dados):
+    """Desenha a tabela paginada com ordenação e filtro feitos no servidor.
+
+    `chave` precisa ser única por tabela na página, pois vira prefixo das
+    chaves dos widgets.
+    """
+    colunas = [SEM_COLUNA] + list(df.columns)
+
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 2])
+    coluna_ordem = col1.selectbox('Ordenar por', colunas, key=f'{chave}_ordem')
+    crescente = col2.radio('Ordem', ['Crescente', 'Decrescente'], key=f'{chave}_direcao') == 'Crescente'
+    coluna_filtro = col3.selectbox('Filtrar coluna', colunas, key=f'{chave}_coluna_filtro')
+    texto_filtro = col4.text_input('Contém', key=f'{chave}_texto_filtro')
+
+    coluna_ordem = None if coluna_ordem == SEM_COLUNA else coluna_ordem
+    coluna_filtro = None if coluna_filtro == SEM_COLUNA else coluna_filtro
+    posicoes = posicoes_visiveis(df, chave_dados, coluna_filtro, texto_filtro.strip(), coluna_ordem, crescente)
+
+    col1, col2 = st.columns([1, 3])
+    tamanho = col1.selectbox('Linhas por página', TAMANHOS_PAGINA, key=f'{chave}_tamanho')
+    total_paginas = max(1, -(-len(posicoes) // tamanho))
+    # Um filtro novo pode reduzir o número de páginas abaixo da página atual.
+    # O valor vem só do session_state: passar também `value` faz o Streamlit
+    # avisar a cada rerun em que a página é ajustada aqui.
+    if st.session_state.get(f'{chave}_pagina', 1) > total_paginas:
+        st.session_state[f'{chave}_pagina'] = total_paginas
+    pagina = col2.number_input(
+        f'Página (de {total_paginas})', min_value=1, max_value=total_paginas,
+        step=1, key=f'{chave}_pagina',
+    )
+
+    medidor = medidor_atual()
+    with medidor.secao(f'tabela/{chave}', 'tabela') as registro:
+        fatia = fatia_pagina(df, posicoes, pagina, tamanho)
+        st.dataframe(fatia, use_container_width=True)
+        if medidor.detalhado:
+            registro['payload_bytes'] = int(fatia.memory_usage(index=True, deep=True).sum())
+    inicio = (pagina - 1) * tamanho
+    fim = min(inicio + tamanho, len(posicoes))
+    st.caption(f'Mostrando linhas {inicio + 1 if len(posicoes) else 0}–{fim} de {len(posicoes)}')
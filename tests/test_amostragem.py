@@ -0,0 +1,68 @@
+"""Modo aproximado: com todos os estratos inteiros na amostra o resultado é exato."""
+
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.amostragem import MARGEM, MotorAmostra
+from painel.consultas import executar
+from painel.dados import preparar
+from painel.motores import MotorPandas
+from painel.paginas import PAGINAS_PERGUNTAS
+from painel.sintetico import gerar
+
+CONSULTAS = {
+    f'{pagina}/{numero}': consulta
+    for pagina, modulo in PAGINAS_PERGUNTAS.items()
+    for numero, consulta in importlib.import_module(modulo).PERGUNTAS.items()
+}
+
+
+@pytest.fixture(scope='module')
+def df1():
+    return preparar(gerar(3000, semente=9))
+
+
+@pytest.fixture(scope='module')
+def motor(df1):
+    # 3 filiais x 6 linhas x 12 meses: nenhum estrato chega perto de 3000 linhas
+    return MotorAmostra(df1, por_estrato=len(df1))
+
+
+def _conferir(esperado, obtido, estatistica):
+    if not isinstance(esperado, pd.DataFrame):
+        assert obtido == pytest.approx(esperado, rel=1e-9)
+        if estatistica != 'std':
+            assert obtido.margem == 0
+        return
+    margem = obtido.pop(MARGEM)
+    if estatistica == 'std':
+        assert margem.isna().all()
+    else:
+        assert (margem == 0).all()
+    pd.testing.assert_frame_equal(esperado, obtido, check_dtype=False, check_categorical=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize('nome', list(CONSULTAS))
+def test_estratos_inteiros_dao_o_resultado_exato(df1, motor, nome):
+    consulta = CONSULTAS[nome]
+    _conferir(executar(consulta, MotorPandas(df1)), executar(consulta, motor), consulta.estatistica)
+
+
+@pytest.mark.parametrize('estatistica', ['sum', 'mean', 'count', 'linhas'])
+def test_exato_com_filtros(df1, motor, estatistica):
+    filtros = {'Branch': ['A', 'C'], 'Payment': ['Cash']}
+    esperado = MotorPandas(df1).agregar('Product line', 'Total', estatistica, filtros)
+    obtido = motor.agregar('Product line', 'Total', estatistica, filtros)
+    _conferir(esperado, obtido, estatistica)
+
+
+def test_amostra_parcial_tem_margem(df1):
+    motor = MotorAmostra(df1, por_estrato=5)
+    assert len(motor.amostra) < len(df1)
+    estimado = motor.agregar(None, 'Total', 'mean')
+    assert estimado.margem > 0
+    assert abs(estimado - df1['Total'].mean()) < 3 * estimado.margem
+    assert np.isfinite(motor.agregar('Branch', 'Total', 'sum')[MARGEM]).all()
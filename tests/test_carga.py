@@ -0,0 +1,14 @@
+"""Rodada curta do teste de carga contra um servidor de verdade."""
+
+from painel.carga import PAGINAS, Servidor, medir_nivel
+
+
+def test_quatro_sessoes_simultaneas():
+    with Servidor() as servidor:
+        resumo = medir_nivel(servidor, sessoes=4, voltas=1)
+
+    assert resumo['reruns'] == 4 * len(PAGINAS)
+    assert set(resumo['paginas']) == set(PAGINAS)
+    for valores in resumo['paginas'].values():
+        assert valores['reruns'] == 4
+        assert valores['cpu_rerun'] is not None
@@ -0,0 +1,66 @@
+"""Correlações da página Satisfação contra o `DataFrame.corr` do pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.correlacao import COLUNAS, Correlacoes, Covariancias, spearman
+from painel.dados import preparar
+from painel.sintetico import gerar
+
+
+@pytest.fixture(scope='module')
+def df1():
+    df1 = preparar(gerar(3000, semente=4))
+    df1.loc[::37, 'Rating'] = np.nan
+    df1.loc[::61, 'Unit price'] = np.nan
+    return df1
+
+
+def _completas(df1, colunas=COLUNAS, dimensoes=()):
+    return df1[list(dimensoes) + list(colunas)].dropna()
+
+
+def test_pearson_geral_igual_ao_corr(df1):
+    acumulador = Covariancias().atualizar(df1)
+    esperado = _completas(df1)[COLUNAS].corr()
+    pd.testing.assert_frame_equal(acumulador.matriz(), esperado, rtol=1e-9)
+
+
+def test_pearson_por_grupo_e_em_blocos(df1):
+    dimensoes = ['Branch', 'Product line']
+    # Em blocos e combinando dois acumuladores, como na ingestão em blocos
+    primeiro = Covariancias(dimensoes=dimensoes)
+    for inicio in range(0, 2000, 450):
+        primeiro.atualizar(df1.iloc[inicio:min(inicio + 450, 2000)])
+    segundo = Covariancias(dimensoes=dimensoes).atualizar(df1.iloc[2000:])
+    acumulador = primeiro.combinar(segundo)
+
+    completas = _completas(df1, dimensoes=dimensoes)
+    for chave, grupo in completas.groupby(dimensoes, observed=True):
+        pd.testing.assert_frame_equal(acumulador.matriz(chave), grupo[COLUNAS].corr(), rtol=1e-9)
+    for filial, grupo in completas.groupby('Branch', observed=True):
+        pd.testing.assert_frame_equal(acumulador.reduzir(['Branch']).matriz((filial,)), grupo[COLUNAS].corr(),
+                                      rtol=1e-9)
+
+
+@pytest.mark.parametrize('dimensoes', [(), ('Branch',), ('Product line',)])
+def test_spearman_igual_ao_corr(df1, dimensoes):
+    obtido = spearman(df1, 'Total', 'Rating', dimensoes)
+    pares = df1[list(dimensoes) + ['Total', 'Rating']].dropna()
+    grupos = pares.groupby(list(dimensoes), observed=True) if dimensoes else [((), pares)]
+    for chave, grupo in grupos:
+        chave = chave if isinstance(chave, tuple) else (chave,)
+        esperado = grupo[['Total', 'Rating']].corr('spearman').iloc[0, 1]
+        assert obtido[chave] == pytest.approx(esperado, rel=1e-9)
+
+
+def test_tabela_usa_as_mesmas_linhas(df1):
+    correlacoes = Correlacoes(df1, replicas=200)
+    completas = _completas(df1, dimensoes=['Branch', 'Product line'])
+    geral = correlacoes.geral()
+    assert geral['Vendas'] == len(completas)
+    assert geral['Pearson'] == pytest.approx(completas['Total'].corr(completas['Rating']), rel=1e-9)
+    assert geral['Spearman'] == pytest.approx(
+        completas[['Total', 'Rating']].corr('spearman').iloc[0, 1], rel=1e-9)
+    assert geral['Pearson IC 95% (inf.)'] <= geral['Pearson'] <= geral['Pearson IC 95% (sup.)']
@@ -0,0 +1,63 @@
+"""Cubo de agregação e combinação de cubos parciais contra o groupby do pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.cubo import combinar_cubos, construir_cubo, consultar
+from painel.dados import preparar
+from painel.sintetico import gerar
+
+ESTATISTICAS = ['sum', 'mean', 'std', 'count']
+AGRUPAMENTOS = [['Branch'], ['Product line', 'Gender'], ['Mes'], ['Dia_Semana', 'Hour']]
+
+
+@pytest.fixture(scope='module')
+def df1():
+    return preparar(gerar(4000, semente=7))
+
+
+def _referencia(df1, dims, medida):
+    valores = df1[medida].astype('float64')
+    return valores.groupby([df1[d] for d in dims], observed=True).agg(ESTATISTICAS)
+
+
+def _conferir(cubo, df1, dims, medida):
+    esperado = _referencia(df1, dims, medida)
+    for estatistica in ESTATISTICAS:
+        obtido = consultar(cubo, dims, medida, estatistica).set_index(dims)[medida]
+        np.testing.assert_allclose(obtido.to_numpy(dtype='float64'), esperado[estatistica].to_numpy(), rtol=1e-9)
+        assert list(obtido.index) == list(esperado.index)
+
+
+@pytest.mark.parametrize('dims', AGRUPAMENTOS)
+@pytest.mark.parametrize('medida', ['Total', 'Quantity', 'Rating'])
+def test_consultar_igual_ao_groupby(df1, dims, medida):
+    _conferir(construir_cubo(df1), df1, dims, medida)
+
+
+def test_consultar_agregado_geral(df1):
+    cubo = construir_cubo(df1)
+    assert consultar(cubo, None, 'Total', 'sum') == pytest.approx(df1['Total'].sum(), rel=1e-12)
+    assert consultar(cubo, None, 'Total', 'std') == pytest.approx(df1['Total'].std(), rel=1e-9)
+
+
+@pytest.mark.parametrize('dims', AGRUPAMENTOS)
+def test_combinar_blocos_sobrepostos(df1, dims):
+    # Blocos de linhas repetem células: os M2 precisam da combinação de Chan
+    blocos = [df1.iloc[inicio:inicio + 700] for inicio in range(0, len(df1), 700)]
+    cubo = combinar_cubos(*(construir_cubo(bloco) for bloco in blocos))
+    _conferir(cubo, df1, dims, 'Total')
+
+
+@pytest.mark.parametrize('dims', AGRUPAMENTOS)
+def test_combinar_particoes_disjuntas(df1, dims):
+    particoes = [parte for _, parte in df1.groupby('Branch', observed=True)]
+    cubo = combinar_cubos(*(construir_cubo(parte) for parte in particoes), disjuntos=True)
+    _conferir(cubo, df1, dims, 'Total')
+
+
+def test_combinar_ignora_vazios(df1):
+    cubo = construir_cubo(df1)
+    pd.testing.assert_frame_equal(combinar_cubos(None, cubo, cubo.iloc[:0]), cubo)
+    assert combinar_cubos(None) is None
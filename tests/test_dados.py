@@ -0,0 +1,34 @@
+"""Esquema compacto: inteiros só descem de tipo quando os valores cabem."""
+
+import pandas as pd
+import pytest
+
+from painel.dados import _inteiro_que_cabe, aplicar_esquema
+
+
+@pytest.mark.parametrize('valores, tipo, esperado', [
+    ([-128, 127], 'int8', 'int8'),
+    ([0, 128], 'int8', 'int16'),
+    ([-129, 0], 'int8', 'int16'),
+    ([-32768, 32767], 'int8', 'int16'),
+    ([0, 32768], 'int8', 'int32'),
+    ([-32769, 0], 'int16', 'int32'),
+    ([0, 2**31], 'int8', 'int64'),
+    ([1, 2, 3], 'int16', 'int16'),
+])
+def test_inteiro_que_cabe(valores, tipo, esperado):
+    assert _inteiro_que_cabe(pd.Series(valores), tipo) == esperado
+
+
+def test_inteiro_anulavel_continua_anulavel():
+    serie = pd.Series([1, None, 300], dtype='Int64')
+    assert _inteiro_que_cabe(serie, 'Int8') == 'Int16'
+    assert _inteiro_que_cabe(pd.Series([None, None], dtype='Int64'), 'Int8') == 'Int8'
+
+
+def test_aplicar_esquema_nao_trunca():
+    df = pd.DataFrame({'Quantity': [1, 200, 40000], 'Hour': pd.array([10, None, 23], dtype='Int64')})
+    tratado = aplicar_esquema(df)
+    assert str(tratado['Quantity'].dtype) == 'int32'
+    assert str(tratado['Hour'].dtype) == 'Int8'
+    assert tratado['Quantity'].tolist() == [1, 200, 40000]
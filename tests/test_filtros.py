@@ -0,0 +1,62 @@
+"""Índice dos filtros globais contra máscaras booleanas sobre o DataFrame."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.dados import preparar
+from painel.filtros import Filtros, IndiceFiltros
+from painel.sintetico import gerar
+
+
+@pytest.fixture(scope='module')
+def df1():
+    bruto = gerar(3001, semente=5)
+    # Algumas datas inválidas: ficam fora de qualquer período, mas valem sem período
+    bruto.loc[::97, 'Date'] = pd.NaT
+    return preparar(bruto)
+
+
+@pytest.fixture(scope='module')
+def indice(df1):
+    return IndiceFiltros(df1)
+
+
+def _mascara(df1, filtros):
+    mascara = np.ones(len(df1), dtype=bool)
+    datas = df1['Date']
+    if filtros.inicio is not None:
+        mascara &= (datas >= pd.Timestamp(filtros.inicio)).to_numpy()
+    if filtros.fim is not None:
+        mascara &= (datas < pd.Timestamp(filtros.fim) + pd.Timedelta(days=1)).to_numpy()
+    for dimensao, valores in filtros.dimensoes:
+        if valores:
+            mascara &= df1[dimensao].isin(valores).to_numpy()
+    return np.flatnonzero(mascara)
+
+
+@pytest.mark.parametrize('filtros', [
+    Filtros(dimensoes=(('Branch', ('A',)),)),
+    Filtros(dimensoes=(('Branch', ('A', 'C')), ('Payment', ('Cash',)))),
+    Filtros(dimensoes=(('City', ('Yangon',)), ('Customer type', ('Member', 'Normal')))),
+    Filtros(inicio=datetime.date(2019, 3, 1), fim=datetime.date(2019, 3, 31)),
+    Filtros(inicio=datetime.date(2019, 6, 15)),
+    Filtros(fim=datetime.date(2019, 2, 1), dimensoes=(('Payment', ('Ewallet', 'Credit card')),)),
+    # Valor que não existe e combinação sem nenhuma linha
+    Filtros(dimensoes=(('Branch', ('Z',)),)),
+    Filtros(dimensoes=(('Branch', ('A',)), ('City', ('Mandalay',)))),
+])
+def test_selecionar_igual_a_mascara(df1, indice, filtros):
+    np.testing.assert_array_equal(indice.selecionar(filtros), _mascara(df1, filtros))
+
+
+def test_sem_filtro_devolve_none(indice):
+    assert indice.selecionar(Filtros()) is None
+    assert indice.selecionar(Filtros(dimensoes=(('Branch', ()),))) is None
+
+
+def test_periodo(df1, indice):
+    validas = df1['Date'].dropna()
+    assert indice.periodo() == (validas.min().date(), validas.max().date())
@@ -0,0 +1,58 @@
+"""Estado incremental: lotes com notas repetidas contra o recálculo completo."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.cubo import construir_cubo, consultar
+from painel.dados import preparar
+from painel.incremental import EstadoIncremental, ler_estado
+from painel.sintetico import gerar
+
+
+@pytest.fixture(scope='module')
+def bruto():
+    return gerar(2000, semente=11)
+
+
+def _conferir(cubo, esperado):
+    for dims, estatistica in [('Branch', 'sum'), (['Product line', 'Gender'], 'mean'), ('Hour', 'std'),
+                              ('Mes', 'count')]:
+        pd.testing.assert_frame_equal(
+            consultar(cubo, dims, 'Total', estatistica), consultar(esperado, dims, 'Total', estatistica),
+            check_dtype=False, check_categorical=False, rtol=1e-9,
+        )
+
+
+def test_lotes_sobrepostos_igual_ao_recalculo(bruto, tmp_path):
+    caminho = tmp_path / 'estado.sqlite'
+    with EstadoIncremental(caminho) as estado:
+        assert estado.anexar(bruto.iloc[:1200]) == 1200
+        # Lote que repete 400 notas já vistas e repete notas dentro dele mesmo
+        lote = pd.concat([bruto.iloc[800:2000], bruto.iloc[1500:1600]])
+        assert estado.anexar(lote) == 800
+        assert estado.anexar(bruto.iloc[:50]) == 0
+        assert estado.linhas == len(bruto)
+        _conferir(estado.cubo, construir_cubo(preparar(bruto)))
+
+    cubo, linhas = ler_estado(caminho)
+    assert linhas == len(bruto)
+    _conferir(cubo, construir_cubo(preparar(bruto)))
+
+
+def test_estado_reaberto_continua_de_onde_parou(bruto, tmp_path):
+    caminho = tmp_path / 'estado.sqlite'
+    with EstadoIncremental(caminho) as estado:
+        estado.anexar(bruto.iloc[:1000])
+    with EstadoIncremental(caminho) as estado:
+        assert estado.anexar(bruto) == 1000
+        esperado = construir_cubo(preparar(bruto))
+        _conferir(estado.cubo, esperado)
+        assert np.isclose(consultar(estado.cubo, None, 'Rating', 'std'), bruto['Rating'].std())
+
+
+def test_estado_vazio(tmp_path):
+    caminho = tmp_path / 'estado.sqlite'
+    with EstadoIncremental(caminho) as estado:
+        assert estado.cubo is None and estado.linhas == 0
+    assert ler_estado(caminho) == (None, 0)
@@ -0,0 +1,68 @@
+"""Índice temporal por somas acumuladas contra groupby e rolling do pandas."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from painel.dados import preparar
+from painel.janelas import TODAS, IndiceTemporal
+from painel.sintetico import gerar
+
+
+@pytest.fixture(scope='module')
+def df1():
+    bruto = gerar(4000, dias=120, semente=13)
+    bruto.loc[::53, 'Date'] = pd.NaT
+    bruto.loc[::41, 'Total'] = np.nan
+    return preparar(bruto)
+
+
+def _por_intervalo(df1, medida, frequencia):
+    """Total de `medida` por intervalo contínuo (sem buracos) e filial, mais a coluna TODAS."""
+    validas = df1.dropna(subset=['Date'])
+    instante = validas['Date'].dt.floor('D')
+    if frequencia == 'h':
+        # Date só tem o dia; a hora vem de Time (coluna Hour)
+        instante = instante + pd.to_timedelta(validas['Hour'].astype('int64'), unit='h')
+    tabela = validas.pivot_table(index=instante, columns='Branch', values=medida, aggfunc='sum', observed=True)
+    tabela.columns = list(tabela.columns)
+    tabela[TODAS] = validas.groupby(instante)[medida].sum()
+    if frequencia == 'h':
+        inicio, fim = instante.min().floor('D'), instante.max().floor('D') + pd.Timedelta(hours=23)
+    else:
+        inicio, fim = instante.min(), instante.max()
+    return tabela.reindex(pd.date_range(inicio, fim, freq=frequencia)).fillna(0.0)
+
+
+@pytest.mark.parametrize('granularidade, frequencia', [('D', 'D'), ('h', 'h')])
+@pytest.mark.parametrize('dias', [7, 30])
+@pytest.mark.parametrize('centrada', [False, True])
+def test_media_movel_igual_ao_rolling(df1, granularidade, frequencia, dias, centrada):
+    indice = IndiceTemporal(df1, granularidade=granularidade)
+    largura = dias * indice.por_dia
+    esperado = _por_intervalo(df1, 'Total', frequencia).rolling(largura, center=centrada).sum() / largura
+    obtido = indice.media_movel('Total', dias, centrada=centrada)
+    assert list(obtido.index) == list(esperado.index)
+    pd.testing.assert_frame_equal(obtido, esperado[obtido.columns], check_freq=False, check_names=False, check_index_type=False, rtol=1e-9)
+
+
+def test_media_movel_recortada_usa_o_historico(df1):
+    indice = IndiceTemporal(df1)
+    inicio, fim = datetime.date(2019, 2, 10), datetime.date(2019, 3, 10)
+    completa = indice.media_movel('gross income', 7)
+    recortada = indice.media_movel('gross income', 7, inicio, fim)
+    pd.testing.assert_frame_equal(recortada, completa.loc[str(inicio):str(fim)], check_freq=False)
+
+
+@pytest.mark.parametrize('estatistica', ['sum', 'mean', 'std', 'count'])
+def test_janela_igual_ao_groupby(df1, estatistica):
+    indice = IndiceTemporal(df1)
+    inicio, fim = datetime.date(2019, 1, 20), datetime.date(2019, 3, 5)
+    datas = df1['Date']
+    dentro = df1[(datas >= pd.Timestamp(inicio)) & (datas < pd.Timestamp(fim) + pd.Timedelta(days=1))]
+    esperado = dentro.groupby('Branch', observed=True)['Total'].agg(estatistica)
+    esperado[TODAS] = dentro['Total'].agg(estatistica)
+    obtido = indice.janela(inicio, fim, 'Total', estatistica)
+    np.testing.assert_allclose(obtido[esperado.index].to_numpy('float64'), esperado.to_numpy('float64'), rtol=1e-9)